@@ -193,11 +193,9 @@ class OutpostUI:
             context = self.pending_question.get("context", {})
             self.clear_pending_question()
             self.clear_command_prompt()
-            updated_task_package = callback(command, context)
 
-            if updated_task_package is not None:
-                from turns import resume_turn_processing
-                updated_task_package = resume_turn_processing(updated_task_package)
+            from turns import answer_pending_question
+            answer_pending_question(command, callback, context)
             return
 
         if self.command_callback:
@@ -206,56 +204,6 @@ class OutpostUI:
 
 ### Helper functions for populating the GUI ###
 
-def get_top_bar_data(task_package):
-    counters = task_package.get("counters", {})
-    resources = task_package.get("resources", [])
-
-    turn = counters.get("turns", 0)
-    day = turn // 10
-
-    power = 0
-    food = 0
-    seeds = 0
-    crystals = 0
-
-    for r in resources:
-        if r.get("name") == "PowerSupply":
-            power = r.get("amount", 0)
-            crystal_store = r.get("CrystalStore", {})
-            crystals = (
-                crystal_store.get("red", 0)
-                + crystal_store.get("indigo", 0)
-                + crystal_store.get("gold", 0)
-            )
-
-        elif r.get("name") == "FoodStore":
-            food = (
-                r.get("rationPack", 0)
-                + r.get("apple", 0)
-                + r.get("cabbage", 0)
-                + r.get("potato", 0)
-                + r.get("soup", 0)
-                + r.get("smoothie", 0)
-                + r.get("stirFry", 0)
-            )
-
-        elif r.get("name") == "SeedStash":
-            seeds = (
-                r.get("apple", 0)
-                + r.get("cabbage", 0)
-                + r.get("potato", 0)
-            )
-
-    return {
-        "day": day,
-        "turn": turn,
-        "power": power,
-        "food": food,
-        "seeds": seeds,
-        "crystals": crystals,
-    }
-
-
 # Legacy function - keep for now but consider deleting. Has been replaced within status.py.
 def old_get_state_panel_text(task_package):
     humans = task_package.get("humans", {})
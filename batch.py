@@ -0,0 +1,284 @@
+# batch.py - play many games at once, for game-balance statistics
+
+# Each game is played headless (see engine) by a policy: a function that is given the game state
+# and the pending question (None if there isn't one), and returns what to type next. Games are
+# spread over a process pool, and what happened in each one is summed up into distributions, so
+# a change to GATING_RULES, the rarity tables or INITIAL_CHARGE can be judged over hundreds of
+# games instead of by playing them.
+#
+#   python batch.py 500 --max-turns 400 --json results.json
+#   python batch.py 200 --policy my_policies:turtle
+
+import argparse
+import importlib
+import json
+import os
+from collections import Counter
+from multiprocessing import Pool
+
+import lore_modules  # noqa: F401 (before anything imports lore.*)
+import engine
+from command_utils import find_resource
+from constants import (BATCH_MAX_TURNS, CHAIN_RESOURCES_ORDER, IDLE_CHARGE_USAGE, LOW_CHARGE_FLAG, MAJOR_RESOURCES_ORDER,
+                       SEED_PACKETS_USED, TASK_CHARGING, TASK_EATING, TASK_LENGTH, TASK_REAPING)
+
+DEFAULT_POLICY = "batch:explore_policy"
+
+
+def idle_worker(state, task):
+    # Someone with nothing to do who can see task through: a droid with the charge for it (they don't
+    # need feeding), or else a human. None if there's nobody.
+    turns_needed = TASK_LENGTH[f"{task}_droid"][1] + LOW_CHARGE_FLAG
+    for name, droid in state["droids"].items():
+        if droid["task"] == "" and droid["charge"] > turns_needed * IDLE_CHARGE_USAGE:
+            return name
+    for name, human in state["humans"].items():
+        if human["task"] == "" and human["state"] != "Deceased":
+            return name
+    return None
+
+
+def food_left(resources):
+    # Everything in the FoodStore, in servings and ration packs (feeding with none starts a task that can't finish)
+    food_store = find_resource(resources, "FoodStore")
+    return sum(food_store.get(food, 0) for food in ("rationPack", "apple", "cabbage", "potato")) if food_store else 0
+
+
+def seeds_to_plant(resources):
+    # The crops there are enough seeds left for a bed of, most plentiful first
+    stash = find_resource(resources, "SeedStash")
+    if not stash:
+        return []
+    crops = [crop for crop in SEED_PACKETS_USED if stash.get(crop, 0) >= SEED_PACKETS_USED[crop]]
+    return sorted(crops, key=lambda crop: stash[crop] // SEED_PACKETS_USED[crop], reverse=True)
+
+
+def free_beds(resources):
+    # The HydroponicsRoom's beds that nobody is growing anything in, or is about to
+    hydro = find_resource(resources, "HydroponicsRoom")
+    return [bed for bed in hydro.get("beds", []) if not bed["occupied"] and not bed["reserved"]] if hydro else []
+
+
+def explore_policy(state, question):
+    # Keep everyone exploring, but feed the hungry and charge low droids first (once there is food, or
+    # somewhere to charge them). Once the HydroponicsRoom and SeedStash are found, someone idle reaps
+    # any crops that are ready and plants the free beds. Says yes to every question.
+    resources = state["resources"]
+    if question:
+        if "(y/n)" in question:
+            return "y"
+        if "How many beds" in question:
+            return "1"
+        if "Which crop" in question:
+            crops = seeds_to_plant(resources)
+            return crops[0] if crops else "0"
+        if "<name>" in question:
+            return next(name for name, human in state["humans"].items() if human["state"] != "Deceased")
+        return "0"
+
+    humans = state["humans"].values()
+    droids = state["droids"].values()
+    if food_left(resources) and any(
+            human["state"] in ("Hungry", "Starving", "Near Death") and human["task"] != TASK_EATING for human in humans):
+        return "feed hungry"
+    if find_resource(resources, "PowerSupply") and any(
+            droid["charge"] <= LOW_CHARGE_FLAG * IDLE_CHARGE_USAGE and droid["task"] != TASK_CHARGING for droid in droids):
+        return "charge low"
+
+    if find_resource(resources, "FoodStore") and find_resource(resources, "SeedStash"):
+        reaper = idle_worker(state, "reap")
+        if reaper and any(crop.get("mature") for crop in state["crops"].values()) and not any(
+                character["task"] == TASK_REAPING for character in list(humans) + list(droids)):
+            return f"reap {reaper}"
+        planter = idle_worker(state, "plant")
+        if planter and free_beds(resources) and seeds_to_plant(resources):
+            return f"plant {planter}"
+
+    if any(character["task"] == "" for character in list(humans) + list(droids)):
+        return "explore idle"
+    return "wait"
+
+
+def load_policy(name):
+    # "module:function" -> the policy function
+    module_name, _, function_name = name.partition(":")
+    return getattr(importlib.import_module(module_name), function_name)
+
+
+def observe(result, state):
+    # Note down anything that has happened for the first time
+    turns = state["counters"]["turns"]
+    resources = state["resources"]
+
+    for name in MAJOR_RESOURCES_ORDER + CHAIN_RESOURCES_ORDER:
+        if name not in result["found_day"] and find_resource(resources, name):
+            result["found_day"][name] = turns // 10
+
+    # Humans only die of hunger
+    if result["first_starved_turn"] is None and any(human["state"] == "Deceased" for human in state["humans"].values()):
+        result["first_starved_turn"] = turns
+
+    for name, droid in state["droids"].items():
+        if droid["charge"] <= 0 and name not in result["droids_out_of_charge"]:
+            result["droids_out_of_charge"].append(name)
+
+    power_supply = find_resource(resources, "PowerSupply")
+    if result["power_out_turn"] is None and power_supply and power_supply.get("found") and power_supply.get("amount", 0) <= 0:
+        result["power_out_turn"] = turns
+
+    if result["shield_turn"] is None and state["shieldstate"]["shield_active"]:
+        result["shield_turn"] = turns
+
+
+def play_game(seed, policy_name=DEFAULT_POLICY, max_turns=BATCH_MAX_TURNS):
+    # Play one game to its end (or max_turns) and return what happened in it, as plain data
+    policy = load_policy(policy_name)
+    result = {
+        "seed": seed,
+        "turns": 0,
+        "endgame_reason": None,
+        "error": None,
+        "found_day": {},
+        "starved": 0,
+        "first_starved_turn": None,
+        "droids_out_of_charge": [],
+        "power_out_turn": None,
+        "shield_turn": None,
+    }
+
+    engine.new_game(seed=seed)
+    stalled = False
+    try:
+        while not engine.is_finished():
+            state = engine.get_state()
+            turns = state["counters"]["turns"]
+            if turns >= max_turns:
+                break
+            observe(result, state)
+
+            question = engine.pending_question()
+            if question:
+                engine.answer(policy(state, question))
+            elif stalled:
+                # The policy's last command didn't use up a turn (nobody to feed, say), so move things on
+                engine.step_turn()
+            else:
+                engine.apply_command(policy(state, None))
+
+            stalled = not question and not stalled and engine.pending_question() is None and engine.get_state()["counters"]["turns"] == turns
+    except Exception as e:
+        result["error"] = f"{type(e).__name__}: {e}"
+
+    state = engine.get_state()
+    observe(result, state)
+    result["turns"] = state["counters"]["turns"]
+    result["starved"] = sum(1 for human in state["humans"].values() if human["state"] == "Deceased")
+    if state["gamestate"]["game_over"]:
+        result["endgame_reason"] = state["gamestate"]["endgame_reason"]
+    return result
+
+
+def play_game_job(job):
+    return play_game(*job)
+
+
+def run_batch(games, seed=1, policy_name=DEFAULT_POLICY, max_turns=BATCH_MAX_TURNS, workers=None):
+    # Play games (seeded seed, seed + 1...) across a process pool. Returns the results, in seed order.
+    jobs = [(seed + i, policy_name, max_turns) for i in range(games)]
+    with Pool(workers) as pool:
+        results = list(pool.imap_unordered(play_game_job, jobs))
+    return sorted(results, key=lambda result: result["seed"])
+
+
+def describe(values):
+    # Distribution of a list of numbers: count, mean and percentiles
+    if not values:
+        return {"games": 0}
+
+    values = sorted(values)
+    def percentile(p):
+        return values[min(len(values) - 1, int(p / 100 * len(values)))]
+
+    return {
+        "games": len(values),
+        "mean": round(sum(values) / len(values), 2),
+        "min": values[0],
+        "p10": percentile(10),
+        "p50": percentile(50),
+        "p90": percentile(90),
+        "max": values[-1],
+    }
+
+
+def summarise(results):
+    # Outcomes and distributions over a batch of results
+    def outcome(result):
+        # A game that crashed is an error, even if it had already ended
+        if result["error"]:
+            return "error"
+        return result["endgame_reason"] or "unfinished"
+
+    return {
+        "games": len(results),
+        "outcomes": dict(Counter(outcome(result) for result in results).most_common()),
+        "errors": dict(Counter(result["error"] for result in results if result["error"]).most_common()),
+        "turns": describe([result["turns"] for result in results]),
+        "found_day": {name: describe([result["found_day"][name] for result in results if name in result["found_day"]])
+                      for name in MAJOR_RESOURCES_ORDER + CHAIN_RESOURCES_ORDER},
+        "starved": describe([result["starved"] for result in results]),
+        "first_starved_turn": describe([result["first_starved_turn"] for result in results if result["first_starved_turn"] is not None]),
+        "droids_out_of_charge": describe([len(result["droids_out_of_charge"]) for result in results]),
+        "power_out_turn": describe([result["power_out_turn"] for result in results if result["power_out_turn"] is not None]),
+        "shield_turn": describe([result["shield_turn"] for result in results if result["shield_turn"] is not None]),
+    }
+
+
+def print_summary(summary):
+    games = summary["games"]
+    print(f"{games} games")
+    print("\nOutcomes")
+    for reason, count in summary["outcomes"].items():
+        print(f"  {reason:<28}{count:>6}  {100 * count / games:5.1f}%")
+    for error, count in summary["errors"].items():
+        print(f"    {count:>4} x {error}")
+
+    def row(label, stats):
+        if not stats["games"]:
+            print(f"  {label:<28}{'never':>6}")
+            return
+        print(f"  {label:<28}{stats['games']:>6}{stats['mean']:>8}{stats['min']:>6}{stats['p10']:>6}{stats['p50']:>6}{stats['p90']:>6}{stats['max']:>6}")
+
+    print(f"\n  {'':<28}{'games':>6}{'mean':>8}{'min':>6}{'p10':>6}{'p50':>6}{'p90':>6}{'max':>6}")
+    row("turns played", summary["turns"])
+    row("humans starved", summary["starved"])
+    row("turn of first starvation", summary["first_starved_turn"])
+    row("droids ran out of charge", summary["droids_out_of_charge"])
+    row("turn power ran out", summary["power_out_turn"])
+    row("turn shield came on", summary["shield_turn"])
+    print("\nDay found")
+    for name, stats in summary["found_day"].items():
+        row(name, stats)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Play many Aynsefian Outpost games and summarise how they went")
+    parser.add_argument("games", type=int, help="number of games to play")
+    parser.add_argument("--seed", type=int, default=1, help="seed of the first game (the rest follow on from it)")
+    parser.add_argument("--policy", default=DEFAULT_POLICY, help=f"module:function that decides what to type (default: {DEFAULT_POLICY})")
+    parser.add_argument("--max-turns", type=int, default=BATCH_MAX_TURNS, help=f"stop a game after this many turns (default: {BATCH_MAX_TURNS})")
+    parser.add_argument("--workers", type=int, default=None, help="number of worker processes (default: one per CPU)")
+    parser.add_argument("--json", help="also write every game's results and the summary to this file")
+    args = parser.parse_args()
+
+    results = run_batch(args.games, args.seed, args.policy, args.max_turns, args.workers)
+    summary = summarise(results)
+    print_summary(summary)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"summary": summary, "games": results}, f, indent=4)
+        print(f"\nResults written to {os.path.abspath(args.json)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -8,6 +8,7 @@ from lore.lore_ingame import get_message
 from lore.lore_story import get_story_message
 import lore.user_interface as ui_runtime
 from lore.user_interface import get_input, msg_story, msg_info, msg_error, log_and_display, get_confirm, get_integer_input
+from tracking import ResourceList, TaskTable
 
 
 # The all important function for getting things done
@@ -58,7 +59,7 @@ def create_task(name, task_type, duration, task_package):
         "type": task_type,
         "name": name,
         "human": is_human,
-        "duration": duration
+        "ends": task_package["counters"]["turns"] + duration
     }
 
     # Store extra items in the task
@@ -157,7 +158,13 @@ def remove_task_by_id(task_id, task_package):
     name = task["name"]
     del tasks[task_id]
 
-    humans, droids = clear_task_for_character(name, "", humans, droids)
+    # Something may have been started for them as this task ended (an auto-feed or auto-charge after
+    # an explore), in which case that is what they are doing now
+    _, next_task = get_task_by_worker(tasks, name)
+    if next_task:
+        humans, droids = set_task_status_for_character(name, next_task["type"], next_task.get("item_name", ""), humans, droids, turns_elapsed)
+    else:
+        humans, droids = clear_task_for_character(name, "", humans, droids)
 
     return task_package
 
@@ -191,11 +198,32 @@ def clear_task_for_character(name, item, humans, droids):
     return humans, droids
 
 
+def find_tasks(tasks, field, value):
+    # Returns [(task_id, task_data)] for the tasks whose field ("name", "type" or "item_name") is value.
+    # The task_package's tasks are indexed by those fields; any other dict is searched.
+    if isinstance(tasks, TaskTable):
+        return [(tid, tasks[tid]) for tid in tasks.task_ids_by(field, value)]
+    return [(tid, task) for tid, task in tasks.items() if task.get(field) == value]
+
+
+def due_tasks(tasks, turn):
+    # Returns the ids of the tasks that finish this turn (those with a turn or less remaining).
+    # The task_package's tasks are scheduled; any other dict is searched.
+    if isinstance(tasks, TaskTable):
+        return tasks.due_task_ids(turn)
+    return [tid for tid, task in tasks.items() if task_turns_remaining(task, turn) <= 1]
+
+
+def task_turns_remaining(task, turn):
+    # The number of turns left on a task, counting this one
+    return task["ends"] - turn
+
+
 def get_task_by_worker(tasks, worker_name):
     # Returns (task_id, task_data) for the active task assigned to worker_name, or (None, None) if not found.
-    for tid, task in tasks.items():
-        if task.get("name") == worker_name:
-            return tid, task
+    found = find_tasks(tasks, "name", worker_name)
+    if found:
+        return found[0]
     return None, None
 
 
@@ -340,12 +368,25 @@ def is_droid_being_charged_or_towed(droid_name, task_package):
     return False
 
 
+def find_resource(resources, name, found=False):
+    # Returns the resource called name, or None. With found=True, only if it has been found.
+    # The task_package's resources are indexed by name; any other list is searched.
+    if isinstance(resources, ResourceList):
+        resource = resources.find(name)
+    else:
+        resource = next((r for r in resources if r.get("name") == name), None)
+
+    if found and resource is not None and not resource.get("found"):
+        return None
+    return resource
+
+
 def get_refuel_power_supply_and_vials(name, task_package):
     resources = task_package["resources"]
     humans = task_package["humans"]
     droids = task_package["droids"]
 
-    power_supply = next((r for r in resources if r.get("name") == "PowerSupply"), None)
+    power_supply = find_resource(resources, "PowerSupply")
 
     if not power_supply:
         return_msg = get_message("refuel", "no_power_supply")
@@ -1,12 +1,12 @@
 # commands.py
 
-import random
 
 from command_utils import (create_task, is_droid_being_charged_or_towed, get_refuel_power_supply_and_vials, remove_vials_from_store,
-                           calculate_refuel_power, get_refuel_days, get_pronouns, clear_task_for_character)
+                           calculate_refuel_power, get_refuel_days, get_pronouns, clear_task_for_character, find_resource)
 from constants import (TASK_CHARGING, TASK_EXPLORING, TASK_PLANTING, TASK_REAPING, TASK_EXAMINING, TASK_MINING, TASK_ASSIGNED, TASK_EATING,
                        TASK_REFUELING, TASK_TOWING_DROID, CHARGE_DURATION, TASK_LENGTH, ASSIGNABLE_ITEMS, LOW_CHARGE_FLAG, IDLE_CHARGE_USAGE,
                        POWER_PER_RED, POWER_PER_INDIGO, POWER_PER_GOLD, NUM_DROIDS, FULL_CHARGE, TOW_TASK_LENGTH, COMMAND_MAP)
+from game_random import game_rng
 from lore.lore_ingame import get_message
 import lore.user_interface as ui_runtime
 from lore.user_interface import (get_input, msg_plant, msg_explore, msg_power, msg_crystal, msg_resource, msg_mine, msg_info, msg_shield, 
@@ -17,9 +17,9 @@ from status import display_character_summary, list_crystals
 from utils import get_best_match, can_character_act, set_shield_state, reset_config, save_config, parse_integer_answer
 
 
-def set_task_length(task_type):
+def set_task_length(task_type, task_package):
     low, high = TASK_LENGTH[task_type]
-    return random.randint(low, high)
+    return game_rng(task_package).randint(low, high)
 
 
 def parse_command_targets(qualifier, task_type, task_package):
@@ -180,7 +180,7 @@ def initiate_feed_task(qualifier, task_package):
     if isinstance(feed_targets, str):
         feed_targets = feed_targets.split()
 
-    duration = set_task_length("feed_human")
+    duration = set_task_length("feed_human", task_package)
 
     # Step 3: Handle special keywords
     if feed_targets == ["all"]:
@@ -250,7 +250,7 @@ def initiate_charge_task(qualifier, task_package):
     task_type = TASK_CHARGING
     valid_command = False
 
-    power_resource = next((r for r in resources if r.get("name") == "PowerSupply"), None)
+    power_resource = find_resource(resources, "PowerSupply")
 
     if not power_resource or not power_resource.get("found", False):
         msg_power(get_message("charge", "nowhere_to_charge"), turns_elapsed, tone="warn")
@@ -442,9 +442,9 @@ def initiate_explore_task(qualifier, task_package):
             continue
 
         if is_human:
-            duration = set_task_length("explore_human")
+            duration = set_task_length("explore_human", task_package)
         else:
-            duration = set_task_length("explore_droid")
+            duration = set_task_length("explore_droid", task_package)
 
         # Create the task
         return_msg, task_package = create_task(name, task_type, duration, task_package)
@@ -471,8 +471,9 @@ def initiate_plant_task(qualifier, task_package):
         queued_task = True
         valid_command = True
 
-    # Update task_package
+    # Update task_package, and carry on with its (tracked) copy of the instructions
     task_package["task_data"] = task_data
+    crop_instructions = task_package["task_data"]
 
     return finish_initiate_plant_task(name=name, crop_instructions=crop_instructions, task_package=task_package, queued_task=queued_task )
 
@@ -529,11 +530,7 @@ def initiate_examine_task(qualifier, task_package):
             return valid_command, task_package
 
     # Find the target resource
-    item = next(
-        (resource for resource in resources
-         if resource.get("name") == item_name),
-        None
-    )
+    item = find_resource(resources, item_name)
 
     if not item:
         msg_resource(get_message("examine", "not_found", item=item_name), turns_elapsed)
@@ -564,9 +561,9 @@ def initiate_examine_task(qualifier, task_package):
 
     # Set examination duration. Droids are quicker.
     if is_human:
-        duration = (item.get("examine_turns", 0) + set_task_length("examine_human"))
+        duration = (item.get("examine_turns", 0) + set_task_length("examine_human", task_package))
     else:
-        duration = (item.get("examine_turns", 0) + set_task_length("examine_droid"))
+        duration = (item.get("examine_turns", 0) + set_task_length("examine_droid", task_package))
     valid_command = True
 
     # Create the examination task
@@ -613,9 +610,9 @@ def initiate_reap_task(raw_target, task_package):
     valid_command = True
 
     # Now create the reap task
-    duration = set_task_length("reap_human")
+    duration = set_task_length("reap_human", task_package)
     if not is_human:
-        duration = set_task_length("reap_droid")
+        duration = set_task_length("reap_droid", task_package)
         
     # Create the task
     return_msg, task_package = create_task(name, task_type, duration, task_package)
@@ -648,13 +645,12 @@ def initiate_mine_task(qualifier, task_package):
             continue  # Skip invalid or busy characters
 
         # Initialise PowerSupply CrystalStore if not already done
-        for r in resources:
-            if r.get("name") == "PowerSupply":
-                if "CrystalStore" not in r or not r["CrystalStore"]:
-                    r["CrystalStore"] = {"red": 0, "indigo": 0, "gold": 0, 
-                                         "total_found": {"red": 0, "indigo": 0, "gold": 0}, 
-                                         "processed": {"red": 0, "indigo": 0, "gold": 0}}
-                break
+        r = find_resource(resources, "PowerSupply")
+        if r is not None:
+            if "CrystalStore" not in r or not r["CrystalStore"]:
+                r["CrystalStore"] = {"red": 0, "indigo": 0, "gold": 0, 
+                                     "total_found": {"red": 0, "indigo": 0, "gold": 0}, 
+                                     "processed": {"red": 0, "indigo": 0, "gold": 0}}
 
         # If they are not idle, add this action to their queue
         if not is_idle(name, humans, droids):
@@ -665,7 +661,7 @@ def initiate_mine_task(qualifier, task_package):
         valid_command = True
 
         # Assign mining task
-        duration = set_task_length("mine_human") if is_human else set_task_length("mine_droid")
+        duration = set_task_length("mine_human", task_package) if is_human else set_task_length("mine_droid", task_package)
 
         # Create the task
         return_msg, task_package = create_task(name, task_type, duration, task_package)
@@ -696,7 +692,7 @@ def initiate_refuel_task(raw_target, task_package):
     if not okay_to_act:
         return valid_command, task_package
 
-    power_supply = next((r for r in resources if r.get("name") == "PowerSupply"), None)
+    power_supply = find_resource(resources, "PowerSupply")
 
     if not power_supply or not power_supply.get("found", False):
         msg_power(get_message("refuel", "no_power_supply"), turns_elapsed, tone="warn" )
@@ -1018,7 +1014,7 @@ def finish_initiate_refuel_task(context):
         return valid_command, task_package
 
     key = "refuel_human" if is_human else "refuel_droid"
-    duration = set_task_length(key)
+    duration = set_task_length(key, task_package)
 
     return_msg, task_package = create_task(name, task_type, duration, task_package)
     msg_power(return_msg, turns_elapsed)
@@ -1184,7 +1180,7 @@ def initiate_assign_process_task(name, task_package):
     valid_command = False
 
     # Find the PowerSupply and ensure it has CrystalStore
-    power_supply = next((r for r in resources if r.get("name") == "PowerSupply"), None)
+    power_supply = find_resource(resources, "PowerSupply")
 
     if not power_supply or "CrystalStore" not in power_supply:
         msg_crystal(get_message("assign", "process_no_crystals", name=name, item=item_name), turns_elapsed, tone="error")
@@ -1197,7 +1193,7 @@ def initiate_assign_process_task(name, task_package):
         return valid_command, task_package
 
     # Find the CrystalProcessor
-    processor = next((r for r in resources if r.get("name") == item_name and r.get("found", False)), None)
+    processor = find_resource(resources, item_name, found=True)
 
     if not processor:
         msg_crystal(get_message("assign", "no_processor", item=item_name), turns_elapsed, tone="error")
@@ -1247,10 +1243,7 @@ def resume_assign_process_red(answer, context):
 def ask_assign_process_indigo(context):
     task_package = context["task_package"]
     turns_elapsed= task_package["counters"]["turns"]
-    crystal_store = next(
-        r for r in task_package["resources"]
-        if r.get("name") == "PowerSupply"
-    )["CrystalStore"]
+    crystal_store = find_resource(task_package["resources"], "PowerSupply")["CrystalStore"]
 
     indigo_avail = crystal_store["indigo"]
 
@@ -1284,10 +1277,7 @@ def resume_assign_process_indigo(answer, context):
 def ask_assign_process_gold(context):
     task_package = context["task_package"]
     turns_elapsed = task_package["counters"]["turns"]
-    crystal_store = next(
-        r for r in task_package["resources"]
-        if r.get("name") == "PowerSupply"
-    )["CrystalStore"]
+    crystal_store = find_resource(task_package["resources"], "PowerSupply")["CrystalStore"]
 
     gold_avail = crystal_store["gold"]
 
@@ -1354,7 +1344,7 @@ def finish_assign_process_task(context):
 
     # Determine duration and create task
     is_human = name in humans
-    duration = set_task_length("assign_human_process") if is_human else set_task_length("assign_droid_process")
+    duration = set_task_length("assign_human_process", task_package) if is_human else set_task_length("assign_droid_process", task_package)
 
     task_data = {
         "process_red": red,
@@ -1391,7 +1381,7 @@ def initiate_assign_shieldmanual_task(name, task_package):
     valid_command = False
 
     # ---- Find ShieldManual ----
-    manual = next((r for r in resources if r.get("name") == item_name), None)
+    manual = find_resource(resources, item_name)
     if not manual or not manual.get("found", False):
         msg_shield(get_message("assign", "no_manual", item=item_name), turns_elapsed)
         return valid_command, task_package
@@ -1408,9 +1398,9 @@ def initiate_assign_shieldmanual_task(name, task_package):
     is_human = name in humans
 
     if is_human:
-        duration = set_task_length("assign_human_manual")
+        duration = set_task_length("assign_human_manual", task_package)
     else:
-        duration = set_task_length("assign_droid_manual")
+        duration = set_task_length("assign_droid_manual", task_package)
 
     # Create the task
     return_msg, task_package = create_task(name, task_type, duration, task_package)
@@ -1439,7 +1429,7 @@ def check_shield_assign(name, task_package):
         msg_shield(get_message("shield", "assigned_to", target=name), turns_elapsed)
 
         # Check that it was the droid with the Anicent Code that we assigned
-        ancient_code = next((r for r in resources if r["name"] == "AncientDroidCode"), None)
+        ancient_code = find_resource(resources, "AncientDroidCode")
         if ancient_code:
             if ancient_code["droidName"] == name:
                 valid_command = True
@@ -1478,7 +1468,7 @@ def enter_oldterminal_commands(name, current_assignee, task_package):
         valid_command = True    # We dock a turn anyway - this is a learning process
         return valid_command, task_package
 
-    crystal_combo = next((r for r in resources if r["name"] == "CrystalCombination"), None)
+    crystal_combo = find_resource(resources, "CrystalCombination")
 
     if not crystal_combo:
         msg_shield(get_message("shield", "need_combo", name=name), turns_elapsed, tone="warn")
@@ -1523,13 +1513,13 @@ def resume_enter_old_terminal_commands(answer, context):
     # Inline function - can't import from tasks.py - creates conflicts
     def do_we_have_enough(resources):
         available_crystals = {"red": 0, "indigo": 0, "gold": 0}
-        for res in resources:
-            if res.get("name") == "PowerSupply" and res.get("found"):
-                crystal_store = res.get("CrystalStore")
-                if crystal_store:
-                    available_crystals["red"] = crystal_store["red"]
-                    available_crystals["indigo"] = crystal_store["indigo"]
-                    available_crystals["gold"] = crystal_store["gold"]
+        res = find_resource(resources, "PowerSupply", found=True)
+        if res is not None:
+            crystal_store = res.get("CrystalStore")
+            if crystal_store:
+                available_crystals["red"] = crystal_store["red"]
+                available_crystals["indigo"] = crystal_store["indigo"]
+                available_crystals["gold"] = crystal_store["gold"]
         return available_crystals
     
     if answer and answer and answer.lower() not in ("y", "yes"):
@@ -1552,7 +1542,7 @@ def resume_enter_old_terminal_commands(answer, context):
         shieldstate = set_shield_state("D", droids, resources, shieldstate)
 
         # Remove the crystals from the crystal store
-        power_supply = next((r for r in resources if r["name"] == "PowerSupply"), None)
+        power_supply = find_resource(resources, "PowerSupply")
         crystal_store = power_supply["CrystalStore"]
         crystal_store["red"] -= crystal_combo["red"]
         crystal_store["indigo"] -= crystal_combo["indigo"]
@@ -1659,7 +1649,7 @@ def resume_examine_task(answer, context):
         return task_package
 
     # Find the target item
-    item = next((r for r in resources if r["name"] == item_name), None)
+    item = find_resource(resources, item_name)
     if not item:
         msg_resource(get_message("examine", "not_found", item=item_name), turns_elapsed)
         return task_package
@@ -1691,9 +1681,9 @@ def resume_examine_task(answer, context):
 
     # Set the examine time, which is *quicker* for droids
     if is_human:
-        duration = item.get("examine_turns", 0) + set_task_length("examine_human")
+        duration = item.get("examine_turns", 0) + set_task_length("examine_human", task_package)
     else:
-        duration = item.get("examine_turns", 0) + set_task_length("examine_droid")
+        duration = item.get("examine_turns", 0) + set_task_length("examine_droid", task_package)
 
     # Create the task
     return_msg, task_package = create_task(name, task_type, duration, task_package)
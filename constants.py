@@ -1,9 +1,38 @@
 #constants.py
 
+import os
+
 # File names
-CONFIG_FILE = "outpost_config.json"
+CONFIG_FILE = "outpost_config.json"                # Saves in other formats swap the extension (see SAVE_FORMAT)
+JOURNAL_FILE = "outpost_journal.jsonl"
+SAVES_DIR = "saves"                         # Named save slots live in folders under here
+SAVE_INDEX_FILE = "saves/index.json"        # Summary of every slot, for listing without opening each save
+DEFAULT_SLOT = "default"                    # This slot uses CONFIG_FILE and JOURNAL_FILE in the game folder
 LOG_FILE = "outpost_log.txt"
-LOG_FILE_OLD = "outpost_log.old"
+LORE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "lore")     # Message and story text (messages.json, story.json)
+LORE_CACHE_DIR = os.path.join(LORE_DIR, "__lorecache__")                        # Compiled copies of the lore files, rebuilt when they change
+TRANSCRIPT_FILE = "outpost_transcript.jsonl" # Every command and answer typed, for replaying a game (off unless asked for)
+EVENT_LOG_FILE = "outpost_events.jsonl"     # Machine-readable copy of every logged message, one JSON object per line (off unless asked for)
+LOG_FLUSH_BYTES = 16384                     # Buffered log lines are written out once they reach this size (and at the end of each turn)
+
+# Log settings
+LOG_ROTATE_BYTES = 1000000      # Start a new log once the current one passes this size (0 = never)
+LOG_ROTATE_TURNS = 0            # Also start a new log every this many turns (0 = never)
+LOG_GENERATIONS = 5             # Old logs kept, as outpost_log.txt.1 (newest), .2...
+LOG_COMPRESS = True             # gzip old logs (outpost_log.txt.1.gz...)
+LOG_MAX_TOTAL_BYTES = 5000000   # Oldest logs are deleted once the current log and the old ones together pass this size
+
+# Save settings
+SAVE_SCHEMA_VERSION = 5         # Bump this (and add a migration in migrations.py) when the shape of the save changes
+SAVE_KEYS = ["crops", "droids", "gamestate", "humans", "item", "resources", "shieldstate", "tasks", "task_data", "counters", "rng"]
+SNAPSHOT_INTERVAL = 10          # Turns between full snapshots; checkpoints in between only journal the changes
+SAVE_BACKUPS = 2                # Previous snapshots kept alongside the save, as outpost_config.json.1, .2...
+SAVE_IN_BACKGROUND = False      # Write saves on a background thread, off the turn pipeline
+SAVE_FORMAT = "json"            # "json", "msgpack" (if installed, .msgpack) or "compact" (marshal, .marshal - smallest, but
+                                # only readable by the Python version that wrote it). The newest save in any format is loaded.
+
+# Batch runs (batch.py)
+BATCH_MAX_TURNS = 500           # Games still going after this many turns are stopped and counted as unfinished
 
 # At the moment the user can only print the initial orders
 AVAILABLE_FILES = {
@@ -161,6 +190,8 @@ INITIAL_GAMESTATE = {
     "list": True,
     "mine": False,
     "next": True,
+    "wait": True,
+    "forecast": True,
     "plant": False,
     "quit": True,
     "read": True,
@@ -174,6 +205,11 @@ INITIAL_GAMESTATE = {
     "endgame_reason": "null",
 }
 
+# Other names players can use for a command
+COMMAND_ALIASES = {
+    "skip": "wait",
+}
+
 # Crop Growth Turns (+/- 10%)
 GROWTH_TURNS = {
     "apple": 20,
@@ -293,6 +329,16 @@ POST_CRITICAL_ITEM_RARITY = {
     "novelty": 0.30,     # 30% chance novelty, else junk
 }
 
+CHAIN_FIND_CHANCE = 0.25        # Once every major essential is found, the chance per explore of the next chain item
+JUNK_FIND_CHANCE = 0.05         # Chance of junk on an ordinary explore that found nothing else
+GATE_STREAKS = (3, 6, 9)        # Explores in a row without a critical find that make a "gate streak"
+FORCE_CRITICAL_STREAK = 12      # Explores in a row without a critical find before the next one is forced
+
+# Exploration simulator (exploration.py)
+EXPLORE_SIM_RUNS = 2000         # Runs of explores simulated for a distribution
+EXPLORE_SIM_MAX_EXPLORES = 400  # Explores per run before giving up on what hasn't been found
+FORECAST_RUNS = 500             # Runs simulated for the 'forecast' command
+
 # These are ones humans or droids can be assigned to
 ASSIGNABLE_ITEMS = {
     "CrystalProcessor": {
@@ -1,13 +1,11 @@
 # endgame.py
 
-import random
-import sys
+from command_utils import find_resource
 from constants import ENDGAME_REASONS
-from lore.lore_ingame import get_message, print_commands
+from game_random import game_rng
 from lore.lore_story import get_story_message
-import lore.user_interface as ui_runtime
-from lore.user_interface import get_input, msg_story
-from utils import initialise_outpost, check_shield_state
+from lore.user_interface import msg_story
+from utils import check_shield_state
 
 
 def check_endgame(task_package):
@@ -20,8 +18,8 @@ def check_endgame(task_package):
     turns_elapsed = task_package["counters"]["turns"]
 
     # 1. Game already ended
-    if gamestate.get("game_over"):
-        reason_key = gamestate.get("endgame_reason", "")
+    if gamestate["game_over"]:
+        reason_key = gamestate["endgame_reason"]
         msg = get_story_message("endgame", reason_key)
         return True, msg, task_package
 
@@ -35,7 +33,7 @@ def check_endgame(task_package):
         return True, msg, task_package
 
     # 3. No power left
-    powersupply = next((r for r in resources if r.get("name") == "PowerSupply"), None)
+    powersupply = find_resource(resources, "PowerSupply")
     if powersupply and powersupply.get("found") and powersupply.get("amount", 0) <= 0:
         reason_key = "no_power"
         gamestate["game_over"] = True
@@ -47,8 +45,8 @@ def check_endgame(task_package):
     task_package = check_shield_state(task_package)
 
     # 5. MGC arrival check
-    chance = random.randint(1, 100)
-    threshold = int(((turns_elapsed - 100) / 50) * 100)
+    chance = game_rng(task_package).randint(1, 100)
+    threshold = mgc_threshold(turns_elapsed)
 
     if threshold >= chance:
         return mgc_is_here_check_the_shield(task_package)
@@ -56,6 +54,11 @@ def check_endgame(task_package):
     return False, "", task_package
 
 
+def mgc_threshold(turns_elapsed):
+    # The MGC arrives when a roll of 1-100 is no more than this: never before day 10, certain by day 15
+    return int(((turns_elapsed - 100) / 50) * 100)
+
+
 def mgc_is_here_check_the_shield(task_package):
     # Handles MGC arrival and determines win/loss.
     # Returns (game_over, message, task_package)
@@ -75,44 +78,9 @@ def mgc_is_here_check_the_shield(task_package):
     return True, msg, task_package
 
 
-def handle_game_over_loop(task_package):
-    # Handles user input after game over.
-    # Returns updated task_package or exits.
+def announce_game_over(end_msg, task_package):
+    # Tells the player how the game ended. The game stays over until they choose 'reset' or 'quit' -
+    # until then process_turn only accepts the commands that don't play a turn.
     turns_elapsed = task_package["counters"]["turns"]
-
-    while True:
-        reason_code = task_package["gamestate"].get("endgame_reason")
-        if ui_runtime.UI_MODE == "gui" and ui_runtime.ACTIVE_UI is not None:
-            ui_runtime.ACTIVE_UI.set_pending_question(
-                callback=resume_game_over_loop,
-                context={
-                    "task_package": task_package,
-                    "reason_code": reason_code
-                }
-            )
-        answer = get_input("input", "endgame_choice", task_package["counters"]["turns"])
-
-        if answer and answer == ui_runtime.GUI_PENDING:
-            return None
-
-
-def resume_game_over_loop(answer, context):
-    task_package = context["task_package"]
-    reason_code = context["reason_code"]
-    turns_elapsed = task_package["counters"]["turns"]
-
-    if answer and answer.lower() in ("reset", "r"):
-        task_package = initialise_outpost(first_time=False)
-        if task_package:
-            print_commands(turns_elapsed)
-        return task_package
-
-    if answer and answer.lower() in ("quit", "exit", "q"):
-        if reason_code == "you_win?":
-            msg_story(get_story_message("quit", "you_win?"), task_package["counters"]["turns"])
-        else:
-            msg_story(get_story_message("quit", "fail"), task_package["counters"]["turns"])
-        sys.exit(0)
-
-    msg_story(get_story_message("endgame", "restart"), task_package["counters"]["turns"])
-    return task_package
\ No newline at end of file
+    msg_story(end_msg, turns_elapsed)
+    msg_story(get_story_message("endgame", "restart"), turns_elapsed)
@@ -0,0 +1,208 @@
+# engine.py - play the game without the GUI
+
+# The turn pipeline asks its questions through lore.user_interface: with a UI active, a question
+# sets a pending callback on it and returns GUI_PENDING, and the answer is handed to that callback
+# later. HeadlessUI stands in for OutpostUI in that flow and keeps everything in memory, so a game
+# can be driven from scripts, bots and batch jobs with no display and no blocking input().
+# Unless asked for, nothing is saved and nothing is logged to disk.
+#
+#   new_game(seed=1)                -> opening output (the game starts by asking a question)
+#   pending_question()              -> the prompt waiting for an answer, or None
+#   answer("n"), apply_command("explore all"), step_turn()  -> the output each produced
+#   get_state()                     -> the whole game as plain dicts and lists
+#
+# The same seed and the same commands always play out the same game (see game_random), so a
+# transcript recorded with record= (or main.py --record) can be played back with replay().
+
+import lore_modules  # noqa: F401 (before anything imports lore.*)
+import lore.user_interface as ui_runtime
+from lore.user_interface import set_log_to_file
+from constants import SAVE_KEYS
+from game_random import sync_game_random
+from migrations import migrate_state
+from persistence import checkpoint, discard_live_package, get_live_package, set_save_to_disk, use_slot
+from tracking import to_plain
+from transcript import read_transcript, start_transcript, stop_transcript
+from turns import answer_pending_question, process_user_input
+from utils import build_task_package, initialise_outpost, load_config, save_config
+
+
+class HeadlessUI:
+    # The parts of OutpostUI that the game talks to, without any windows
+    draws_screen = False    # So update_screen() doesn't build panels nobody will see
+
+    def __init__(self):
+        self.lines = []
+        self.prompt = ""
+        self.pending_question = None
+
+    def set_top_stats(self, **stats):
+        pass
+
+    def set_state_text(self, text):
+        pass
+
+    def append_log(self, text):
+        self.lines.append(text)
+
+    def set_command_prompt(self, text):
+        self.prompt = text
+
+    def clear_command_prompt(self):
+        self.prompt = ""
+
+    def set_pending_question(self, callback, context=None):
+        self.pending_question = {
+            "callback": callback,
+            "context": context or {}
+        }
+
+    def clear_pending_question(self):
+        self.pending_question = None
+
+
+# The UI the engine installed, and whether the game has been quit
+_engine = {"ui": None, "quit": False}
+
+
+def install_ui():
+    # Every game starts with a fresh UI, and without the last game's transcript
+    stop_transcript()
+    ui = HeadlessUI()
+    ui_runtime.UI_MODE = "gui"
+    ui_runtime.ACTIVE_UI = ui
+    _engine["ui"] = ui
+    _engine["quit"] = False
+    return ui
+
+
+def new_game(seed=None, slot=None, save=False, log=False, record=None):
+    # Start a brand-new game and return its opening output.
+    # save writes the game to the save slot as it's played (replacing what was there), log writes
+    # the log file, and record writes a transcript of everything typed to that file.
+    checkpoint()
+    use_slot(slot)
+    discard_live_package()
+    set_save_to_disk(save)
+    set_log_to_file(log)
+
+    install_ui()
+    initialise_outpost(first_time=True, seed=seed)
+    if record:
+        start_transcript(record, get_live_package(), new_game=True)
+    return take_output()
+
+
+def load_game(slot=None, log=False, record=None):
+    # Carry on with a saved game (or start one, if the slot is empty) and return the output so far.
+    # Loaded games are saved as they're played.
+    checkpoint()
+    set_save_to_disk(True)
+    set_log_to_file(log)
+    ui = install_ui()
+    load_config(slot)
+    if record:
+        start_transcript(record, get_live_package(), new_game=ui.pending_question is not None)
+    return take_output()
+
+
+def resume_game(state, version):
+    # Carry on from a game's state (as saved with schema version), in memory only
+    checkpoint()
+    discard_live_package()
+    set_save_to_disk(False)
+    set_log_to_file(False)
+
+    install_ui()
+    data, _ = migrate_state(state, version)
+    task_package = build_task_package(**{key: data[key] for key in SAVE_KEYS})
+    save_config(task_package)
+    return take_output()
+
+
+def replay(path):
+    # Play a transcript back as fast as possible, with nothing saved or logged. Returns all the output.
+    # Stops with a ValueError if the game doesn't follow the transcript (an input lands on another turn).
+    header, inputs = read_transcript(path)
+    if header.get("new_game"):
+        output = new_game(seed=header["seed"])
+    else:
+        output = resume_game(header["state"], header["schema_version"])
+
+    for entry in inputs:
+        turn = get_live_package()["counters"]["turns"]
+        if entry["turn"] != turn:
+            text = entry.get("command", entry.get("answer"))
+            raise ValueError(f"Replay of {path} is on turn {turn}, but '{text}' was typed on turn {entry['turn']}")
+
+        if "command" in entry:
+            output += apply_command(entry["command"])
+        else:
+            output += answer(entry["answer"])
+
+    return output
+
+
+def run(action, *args):
+    # Run part of the turn pipeline, catching 'quit' rather than letting it end the process
+    try:
+        action(*args)
+    except SystemExit:
+        _engine["quit"] = True
+    return take_output()
+
+
+def apply_command(command):
+    # Play a command, as if it had been typed in. Returns the output it produced.
+    ui = _engine["ui"]
+    if ui.pending_question is not None:
+        raise ValueError(f"A question is waiting for an answer: {ui.prompt}")
+
+    return run(process_user_input, command)
+
+
+def answer(text):
+    # Answer the pending question. Returns the output it produced.
+    ui = _engine["ui"]
+    if ui.pending_question is None:
+        raise ValueError("There is no question waiting for an answer")
+
+    callback = ui.pending_question["callback"]
+    context = ui.pending_question["context"]
+    ui.clear_pending_question()
+    ui.clear_command_prompt()
+    return run(answer_pending_question, text, callback, context)
+
+
+def step_turn():
+    # Let one turn pass
+    return apply_command("next")
+
+
+def pending_question():
+    # The prompt for the question waiting to be answered, or None
+    ui = _engine["ui"]
+    if ui.pending_question is None:
+        return None
+    return ui.prompt
+
+
+def take_output():
+    # The lines shown since the last call
+    ui = _engine["ui"]
+    lines = ui.lines
+    ui.lines = []
+    return lines
+
+
+def is_finished():
+    # True once the game has ended or been quit
+    task_package = get_live_package()
+    return _engine["quit"] or (task_package is not None and task_package["gamestate"]["game_over"])
+
+
+def get_state():
+    # A plain copy of the whole game, safe to keep or change
+    task_package = get_live_package()
+    sync_game_random(task_package)
+    return to_plain(task_package)
@@ -0,0 +1,282 @@
+# exploration.py - the exploration rules as tables, and a simulator for balancing them
+
+# attempt_exploration (resources.py) decides what each explore turns up. The rules it follows are
+# compiled here once: the critical items in the order they are found (FoodStore and PowerSupply,
+# then MAJOR_RESOURCES_ORDER, then CHAIN_RESOURCES_ORDER), the chance of finding each one, and the
+# GATING_RULES that force them. Which of them a game still has to find is worked out from its
+# found_items bits (see items.ITEM_BITS), and cached per value, so a roll doesn't search resources.
+#
+# simulate_explores() plays the same rules over many independent runs of explores, to give the
+# distribution of when each critical item turns up - for a new game, or from part-way through one.
+# With numpy installed the runs are stepped together as arrays; without it, one at a time.
+#
+# The simulator only follows exploring: explores are spread evenly over the turns (turns_per_explore),
+# and nothing else in the game (examining, eating, charging) gets in the way.
+
+import random
+from functools import lru_cache
+
+from constants import (CHAIN_FIND_CHANCE, CHAIN_RESOURCES_ORDER, EXPLORE_SIM_MAX_EXPLORES, EXPLORE_SIM_RUNS, FORECAST_RUNS,
+                       GATE_ITEM_RARITY, GATE_STREAKS, GATING_RULES, JUNK_FIND_CHANCE, MAJOR_RESOURCES_ORDER, NORMAL_ITEM_RARITY,
+                       NUM_DROIDS, NUM_HUMANS, POST_CRITICAL_ITEM_RARITY, TASK_LENGTH)
+from items import ITEM_BITS, ITEM_DB, ITEM_NAMES_BY_CATEGORY
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+SCRIPTED_FINDS = ("FoodStore", "PowerSupply")      # Found by the first two explores, whatever the rolls
+CRITICAL_ORDER = SCRIPTED_FINDS + tuple(MAJOR_RESOURCES_ORDER) + tuple(CHAIN_RESOURCES_ORDER)
+
+# found_items bits of the critical items, and of each category of rare item
+CRITICAL_MASK = sum(ITEM_BITS[name] for name in CRITICAL_ORDER)
+CATEGORY_MASKS = {category: sum(ITEM_BITS[name] for name in names) for category, names in ITEM_NAMES_BY_CATEGORY.items()}
+
+
+@lru_cache(maxsize=1024)
+def critical_stage(critical_bits):
+    # What is still to find, given the found_items bits of the critical items:
+    #   scripted       FoodStore or PowerSupply if one is still to find, else None
+    #   gates          the GATING_RULES (name, min_day, min_explores) for items still to find, in order
+    #   major, prob    the next major essential and its prob (a roll above prob finds it), or None
+    #   chain          the next chain item (only rolled for once every major is found), or None
+    #   post_critical  True once every major and chain item has been found
+    def unfound(names):
+        return [name for name in names if not critical_bits & ITEM_BITS[name]]
+
+    scripted = unfound(SCRIPTED_FINDS)
+    majors = unfound(MAJOR_RESOURCES_ORDER)
+    chains = unfound(CHAIN_RESOURCES_ORDER)
+    return {
+        "scripted": scripted[0] if scripted else None,
+        "gates": tuple(rule for rule in GATING_RULES if not critical_bits & ITEM_BITS[rule[0]]),
+        "major": majors[0] if majors else None,
+        "prob": ITEM_DB[majors[0]].get("prob", 1.0) if majors else None,
+        "chain": chains[0] if chains else None,
+        "post_critical": not majors and not chains,
+    }
+
+
+def exploration_stage(found_items):
+    # critical_stage() for a game's found_items (rare items found don't change it)
+    return critical_stage(found_items & CRITICAL_MASK)
+
+
+# The simulator keeps its own bits: bit n is CRITICAL_ORDER's nth item. Majors and chain items are
+# each a run of bits in order, so the lowest bit not yet set is always the next one to find.
+SIM_BITS = {name: 1 << index for index, name in enumerate(CRITICAL_ORDER)}
+SIM_ALL = (1 << len(CRITICAL_ORDER)) - 1
+SIM_MAJOR_MASK = sum(SIM_BITS[name] for name in MAJOR_RESOURCES_ORDER)
+SIM_CHAIN_MASK = sum(SIM_BITS[name] for name in CHAIN_RESOURCES_ORDER)
+SIM_SCRIPTED = tuple(SIM_BITS[name] for name in SCRIPTED_FINDS)
+SIM_GATES = tuple((SIM_BITS[name], min_day, min_explores) for name, min_day, min_explores in GATING_RULES)
+SIM_MAJOR_PROBS = {SIM_BITS[name]: ITEM_DB[name].get("prob", 1.0) for name in MAJOR_RESOURCES_ORDER}
+
+
+def default_turns_per_explore():
+    # With everyone exploring all the time: each explorer manages one explore per average explore length
+    explores_per_turn = 0
+    for task_type, count in (("explore_human", NUM_HUMANS), ("explore_droid", NUM_DROIDS)):
+        low, high = TASK_LENGTH[task_type]
+        explores_per_turn += count / ((low + high) / 2)
+    return 1 / explores_per_turn
+
+
+def exploration_start(task_package=None):
+    # Where exploring is up to in a game, as the simulator needs it (a new game if there isn't one)
+    if task_package is None:
+        return {"found": 0, "explore": 0, "found_nil": 0, "turns": 0,
+                "left": {category: len(names) for category, names in ITEM_NAMES_BY_CATEGORY.items()}}
+
+    counters = task_package["counters"]
+    found_items = counters["found_items"]
+    return {
+        "found": sum(bit for name, bit in SIM_BITS.items() if found_items & ITEM_BITS[name]),
+        "explore": counters["explore"],
+        "found_nil": counters["found_nil"],
+        "turns": counters["turns"],
+        "left": {category: len(names) - (found_items & CATEGORY_MASKS[category]).bit_count()
+                 for category, names in ITEM_NAMES_BY_CATEGORY.items()},
+    }
+
+
+def simulate_run(rng, start, max_explores, turns_per_explore):
+    # One run of explores. Returns {critical item: the explore (counting from start) it was found on}.
+    found = start["found"]
+    found_nil = start["found_nil"]
+    left = dict(start["left"])
+    found_on = {}
+
+    for step in range(1, max_explores + 1):
+        if found == SIM_ALL:
+            break
+        explore = start["explore"] + step
+        day = int(start["turns"] + step * turns_per_explore) // 10
+
+        find = next((bit for bit in SIM_SCRIPTED if not found & bit), 0)
+        if not find:
+            find = next((bit for bit, min_day, min_explores in SIM_GATES
+                         if day > min_day and explore > min_explores and not found & bit), 0)
+        if find:
+            found_nil = 0
+        else:
+            # As in attempt_exploration, rolling a major or chain item doesn't reset the streak
+            majors = ~found & SIM_MAJOR_MASK
+            chains = ~found & SIM_CHAIN_MASK
+            if majors:
+                major = majors & -majors
+                if rng.random() > SIM_MAJOR_PROBS[major]:
+                    find = major
+            elif chains and rng.random() < CHAIN_FIND_CHANCE:
+                find = chains & -chains
+
+        if find:
+            found |= find
+            found_on[find] = step
+            continue
+
+        # Nothing critical: a rare item may still reset the streak. (A streak of 12 would force the
+        # next critical item, but only one that is discovered and not marked found - never the case.)
+        found_nil += 1
+        is_gate_streak = found_nil in GATE_STREAKS
+        rarity = POST_CRITICAL_ITEM_RARITY if found == SIM_ALL else GATE_ITEM_RARITY if is_gate_streak else NORMAL_ITEM_RARITY
+
+        if left["replacement"] and rng.random() < rarity.get("replacement", 0.0):
+            left["replacement"] -= 1
+            found_nil = 0
+        elif left["novelty"] and rng.random() < rarity.get("novelty", 0.0):
+            left["novelty"] -= 1
+            found_nil = 0
+        elif is_gate_streak:
+            if left["junk"]:
+                left["junk"] -= 1
+                found_nil = 0
+        elif left["junk"] and rng.random() < JUNK_FIND_CHANCE:
+            left["junk"] -= 1
+
+    return {name: found_on.get(bit) for name, bit in SIM_BITS.items() if not start["found"] & bit}
+
+
+def simulate_runs_numpy(runs, start, max_explores, turns_per_explore, seed):
+    # simulate_run() for every run at once: each explore is one set of array operations over all the runs
+    generator = numpy.random.default_rng(seed)
+    found = numpy.full(runs, start["found"], dtype=numpy.int64)
+    found_nil = numpy.full(runs, start["found_nil"], dtype=numpy.int64)
+    left = {category: numpy.full(runs, count, dtype=numpy.int64) for category, count in start["left"].items()}
+    found_on = numpy.zeros((runs, len(CRITICAL_ORDER)), dtype=numpy.int64)
+    gate_streaks = numpy.array(GATE_STREAKS)
+    rarity_tables = (NORMAL_ITEM_RARITY, GATE_ITEM_RARITY, POST_CRITICAL_ITEM_RARITY)
+
+    for step in range(1, max_explores + 1):
+        if (found == SIM_ALL).all():
+            break
+        explore = start["explore"] + step
+        day = int(start["turns"] + step * turns_per_explore) // 10
+
+        find = numpy.zeros(runs, dtype=numpy.int64)
+        for bit in SIM_SCRIPTED:
+            forced = (find == 0) & (found & bit == 0)
+            find[forced] = bit
+        for bit, min_day, min_explores in SIM_GATES:
+            if day > min_day and explore > min_explores:
+                forced = (find == 0) & (found & bit == 0)
+                find[forced] = bit
+        found_nil[find != 0] = 0
+
+        majors = ~found & SIM_MAJOR_MASK
+        chains = ~found & SIM_CHAIN_MASK
+        next_major = majors & -majors
+        rolls = generator.random(runs)
+        for bit, prob in SIM_MAJOR_PROBS.items():
+            rolled = (find == 0) & (next_major == bit) & (rolls > prob)
+            find[rolled] = bit
+        rolled = (find == 0) & (majors == 0) & (chains != 0) & (generator.random(runs) < CHAIN_FIND_CHANCE)
+        find[rolled] = (chains & -chains)[rolled]
+
+        newly = find != 0
+        found |= find
+        for index in range(len(CRITICAL_ORDER)):
+            found_on[newly & (find == 1 << index), index] = step
+
+        # The rest found nothing critical
+        rest = ~newly
+        found_nil[rest] += 1
+        is_gate_streak = rest & numpy.isin(found_nil, gate_streaks)
+        table = numpy.where(found == SIM_ALL, 2, numpy.where(is_gate_streak, 1, 0))
+        replacement_chance = numpy.array([rarity.get("replacement", 0.0) for rarity in rarity_tables])[table]
+        novelty_chance = numpy.array([rarity.get("novelty", 0.0) for rarity in rarity_tables])[table]
+
+        replacement = rest & (left["replacement"] > 0) & (generator.random(runs) < replacement_chance)
+        rest &= ~replacement
+        novelty = rest & (left["novelty"] > 0) & (generator.random(runs) < novelty_chance)
+        rest &= ~novelty
+        gate_junk = rest & is_gate_streak & (left["junk"] > 0)
+        junk = rest & ~is_gate_streak & (left["junk"] > 0) & (generator.random(runs) < JUNK_FIND_CHANCE)
+
+        left["replacement"][replacement] -= 1
+        left["novelty"][novelty] -= 1
+        left["junk"][gate_junk | junk] -= 1
+        found_nil[replacement | novelty | gate_junk] = 0
+
+    return {name: [step or None for step in found_on[:, index].tolist()]
+            for index, name in enumerate(CRITICAL_ORDER) if not start["found"] & SIM_BITS[name]}
+
+
+def simulate_explores(runs=EXPLORE_SIM_RUNS, start=None, max_explores=EXPLORE_SIM_MAX_EXPLORES, turns_per_explore=None,
+                      seed=None, use_numpy=None):
+    # Play runs of up to max_explores explores from start (see exploration_start; a new game if None).
+    # Returns {critical item still to find: [the explore it was found on in each run, or None if it wasn't]}.
+    # Explores are counted from start; the turn each happened on is start["turns"] + explore * turns_per_explore.
+    if start is None:
+        start = exploration_start()
+    if turns_per_explore is None:
+        turns_per_explore = default_turns_per_explore()
+    if use_numpy is None:
+        use_numpy = numpy is not None
+
+    if use_numpy:
+        return simulate_runs_numpy(runs, start, max_explores, turns_per_explore, seed)
+
+    rng = random.Random(seed)
+    results = [simulate_run(rng, start, max_explores, turns_per_explore) for _ in range(runs)]
+    return {name: [result[name] for result in results] for name in CRITICAL_ORDER if not start["found"] & SIM_BITS[name]}
+
+
+def forecast_discoveries(task_package):
+    # For each critical item the game still has to find: {"chance", "explores", "turns"} - the share of
+    # simulated futures it was found in, and on average how many more explores and turns it took.
+    # Explores are assumed to keep coming at the rate the game has managed so far.
+    counters = task_package["counters"]
+    if counters["explore"]:
+        turns_per_explore = max(counters["turns"], 1) / counters["explore"]
+    else:
+        turns_per_explore = default_turns_per_explore()
+
+    start = exploration_start(task_package)
+    left = tuple(start["left"][category] for category in ITEM_NAMES_BY_CATEGORY)
+    key = (start["found"], start["explore"], start["found_nil"], start["turns"], left, round(turns_per_explore, 3))
+    return forecast_from_state(key)
+
+
+@lru_cache(maxsize=64)
+def forecast_from_state(key):
+    # The forecast for one exploration state (see forecast_discoveries). Cached, so asking again costs
+    # nothing until the state changes, and seeded from the state, so the same state always gives the
+    # same answer (and the game's own rng is never touched).
+    found, explore, found_nil, turns, left, turns_per_explore = key
+    start = {"found": found, "explore": explore, "found_nil": found_nil, "turns": turns,
+             "left": dict(zip(ITEM_NAMES_BY_CATEGORY, left))}
+    results = simulate_explores(FORECAST_RUNS, start=start, turns_per_explore=turns_per_explore, seed=hash(key) % 2**64)
+
+    forecast = {}
+    for name, found_on in results.items():
+        explores = [step for step in found_on if step is not None]
+        mean = sum(explores) / len(explores) if explores else None
+        forecast[name] = {
+            "chance": len(explores) / len(found_on),
+            "explores": mean,
+            "turns": mean * turns_per_explore if explores else None,
+        }
+    return forecast
+
@@ -0,0 +1,75 @@
+# game_random.py - the random number generators for the game being played
+
+# Every roll that changes the game - exploration, task lengths, yields, names - comes from the
+# game's own GameRandom, held on its task_package (see game_rng) and seeded from the game's seed,
+# instead of the shared random module. A game started from a given seed plays out the same way
+# for the same commands, and nothing else in the process - another game, or anything else using
+# random - can disturb it.
+#
+# Which message variant is shown doesn't change the game, so those come from text_rng instead,
+# and showing more or fewer messages never moves the game's rolls.
+#
+# The save keeps the generator in the "rng" section: the game's seed, and how many 32-bit words
+# have been drawn since. A loaded game is seeded and run forward by that many words, so it rolls
+# exactly what the running game would have - however often, or seldom, it was saved.
+
+import random
+
+
+class GameRandom(random.Random):
+    # A random.Random that counts the 32-bit words it has drawn from the Mersenne Twister. Every
+    # other method draws through random() (two words) or getrandbits(), so the count is exact.
+
+    def seed(self, a=None, version=2):
+        super().seed(a, version)
+        self.draws = 0
+
+    def random(self):
+        self.draws += 2
+        return super().random()
+
+    def getrandbits(self, k):
+        self.draws += (k + 31) // 32
+        return super().getrandbits(k)
+
+    def getstate(self):
+        return super().getstate(), self.draws
+
+    def setstate(self, state):
+        twister_state, self.draws = state
+        super().setstate(twister_state)
+
+
+# Message variants, seeded with each game as it starts or is loaded
+text_rng = random.Random()
+
+
+def new_game_random(seed=None):
+    # The rng section for a new game (with a fresh seed if none is given)
+    if seed is None:
+        seed = random.getrandbits(64)
+    return {"seed": seed, "draws": 0}
+
+
+def make_game_random(rng_section):
+    # A generator at the point recorded in a game's rng section
+    rng = GameRandom(rng_section["seed"])
+    if rng_section["draws"]:
+        rng.getrandbits(32 * rng_section["draws"])
+    text_rng.seed(rng_section["seed"])
+    return rng
+
+
+def game_rng(task_package):
+    return task_package.rng
+
+
+def sync_game_random(task_package):
+    # Record how far the game's generator has got in its rng section, ready to be saved.
+    # Returns whether it had moved on.
+    draws = game_rng(task_package).draws
+    if task_package["rng"]["draws"] == draws:
+        return False
+
+    task_package["rng"]["draws"] = draws
+    return True
@@ -1,6 +1,7 @@
 # items.py - all the game items, categorised
 
-import copy
+from types import MappingProxyType
+
 from constants import RATION_PACKS, INITIAL_CHARGE
 
 # NOTE: If an item is marked as "replacable": True, it CAN be replaced IF that item listed as its replacement is FOUND first
@@ -1070,23 +1071,53 @@ ALL_ITEMS.extend(REPLACEMENT)
 ALL_ITEMS.extend(NOVELTY)
 ALL_ITEMS.extend(JUNK)
 
-# Map from name -> template dict
-ITEM_DB = {item["name"]: item for item in ALL_ITEMS}
+# Map from name -> template. Read-only, as every game's discovered items read from them.
+ITEM_DB = {item["name"]: MappingProxyType(item) for item in ALL_ITEMS}
 
+# The templates are shared by every game, so they are never marked as found. Each game keeps the
+# items it has found in counters["found_items"], as the bits of one int: bit n is ITEM_BIT_ORDER's nth item.
+# found_items is saved, so this order is part of the save format: never reorder or remove a name,
+# and put new items on the end (wherever they go in the lists above).
+ITEM_BIT_ORDER = (
+    "FoodStore", "PowerSupply", "SeedStash", "WaterSource", "HydroponicsRoom", "CrystalField", "MealMaker",
+    "CrystalProcessor", "ShieldManual", "OldTerminal", "CloakingShield", "CrystalCombination", "DecodeKey",
+    "AncientDroidCode", "FertileSoil", "SolarPanelArray", "CrystalMortarAndPestle", "SelfPoweringStoveAndPot",
+    "ShieldOperatingCodes", "BlackTablet", "DroidPlugInModule", "CypherCardInsert", "HandWrittenNote", "AstrologyWheel",
+    "MultiFunctionTool", "DiscoInfernoBall", "RadarOfDestiny", "BoxOfDynamite", "InformerPilatesBench", "HouseBrick",
+    "HalfMeltedTrumpet", "BagOfSand", "RadicalPolicyDocument", "AdjustableSpannerInTheWorks", "IsoBarStool", "CopperHammer",
+    "GlowingPumpkin", "TimeToGiveUpMachine", "BentSpoon", "CrackedSnowGlobe", "BrokenHourGlass", "FadedNoteBook",
+    "EmptyTeaTin", "WarmRock", "CoilOfWire", "PokerFace", "PartialBowlOfNuts", "CampingShower", "CarJack",
+    "BeerCoaster1975", "NuclearBobbleHead", "MineCraftKeepSake", "CricketBall", "Shades", "PotOfRainbow", "CrankHandle",
+    "ProphetOfProfitTome", "PlasticToyTank", "MothManKeepsake", "DiceOfYesAndNo", "CircuitBreaker", "MacksFastFoodVoucher",
+    "FirstAidBox", "RustyMetalWheel", "BoxOfBiscuits", "BrokenMP3Player", "JigsawOfTheCosmos",
+    "DiscardedAndBrokenToiletSeat", "ScentedCandleBlack", "NoHitchHikingSign", "YouSpinMeRightRoundBabyRightRound",
+    "VinylRecordPlayer", "ReplacementNeedle", "GlassBeerStein", "16DifferentPipeCleaners", "StackOfOldWood",
+    "OpenMikeNightInvitation", "WaterGun", "UltimateFrisbee", "BorrowedSugar", "AGoodExcuse", "8PrisonBars", "8Ball",
+    "PlasticVikingHelmet", "WheelOfMisfortuneBoardGame", "OldMattress", "WrestlingHeadband", "IntimatesTrimmer",
+    "RustyMetalDrum", "ThreePacksOfSocks", "LightningRod", "AncientGnosticTextInAClayJar",
+)
+ITEM_BITS = {name: 1 << index for index, name in enumerate(ITEM_BIT_ORDER)}
 
-def get_item_template(name: str):
-    # Return a DEEP COPY of the template for an item with this name, or None if not found.
-    # We deep-copy so that mutations to discovered items don't affect the DB.
-    
-    template = ITEM_DB.get(name)
-    if template is None:
-        return None
+if ITEM_DB.keys() - ITEM_BITS.keys():
+    raise ValueError(f"Items missing from ITEM_BIT_ORDER: {sorted(ITEM_DB.keys() - ITEM_BITS.keys())}")
+
+# Names of the items exploring can turn up at random, per category, in the order they're listed above
+ITEM_NAMES_BY_CATEGORY = {
+    "replacement": tuple(item["name"] for item in REPLACEMENT),
+    "novelty": tuple(item["name"] for item in NOVELTY),
+    "junk": tuple(item["name"] for item in JUNK),
+}
 
-    clone = copy.deepcopy(template)
 
-    # Normalise some fields so discovered instances are always consistent:
-    #clone["found"] = True          # any entry in resources is, by definition, found
-    if "examined" not in clone:
-        clone["examined"] = False
+def found_items_from(resources):
+    # The found_items bits for a list of discovered resources (for games saved before there were any)
+    found_items = 0
+    for resource in resources:
+        found_items |= ITEM_BITS.get(resource.get("name"), 0)
+    return found_items
 
-    return clone
\ No newline at end of file
+
+def get_item_template(name: str):
+    # Return the (read-only) template for an item with this name, or None if not found.
+    # Discovered items aren't copies of it: see tracking.TrackedItem.
+    return ITEM_DB.get(name)
\ No newline at end of file
@@ -0,0 +1,95 @@
+# lore_data.py - loads the message and story text from the lore data files
+
+# The text lives in JSON files in the lore folder ({category: {code: message}}), so it can be
+# edited without touching the code. The first time a file is used it is compiled (see
+# compile_category) and cached as marshal data in LORE_CACHE_DIR, keyed on the file's mtime and
+# size, so later runs skip the JSON parse. Each category is kept as its own block in the cache
+# and only unpacked when a message from it is first asked for.
+
+import json
+import marshal
+import os
+from string import Formatter
+from types import MappingProxyType
+
+from constants import LORE_DIR, LORE_CACHE_DIR
+
+LORE_CACHE_VERSION = 1      # Bump if the compiled form changes, so old caches are rebuilt
+
+_catalogs = {}
+
+
+def compile_template(template):
+    # (text, has_fields): text without any {fields} is formatted here, once, instead of on every call
+    has_fields = any(field is not None for _, field, _, _ in Formatter().parse(template))
+    if has_fields:
+        return template, True
+    return template.format(), False
+
+
+def compile_category(codes):
+    # {code: (variants, is_choice)}, where is_choice means pick one of the variants at random
+    compiled = {}
+    for code, message in codes.items():
+        is_choice = isinstance(message, list)
+        templates = message if is_choice else [message]
+        compiled[code] = (tuple(compile_template(template) for template in templates), is_choice)
+    return compiled
+
+
+def compile_lore_file(path):
+    # {category: marshalled compiled category}
+    with open(path, encoding="utf-8") as f:
+        messages = json.load(f)
+    return {category: marshal.dumps(compile_category(codes)) for category, codes in messages.items()}
+
+
+def load_lore_file(name):
+    # The marshalled categories of lore/<name>.json, from the cache if it is up to date
+    path = os.path.join(LORE_DIR, f"{name}.json")
+    cache_path = os.path.join(LORE_CACHE_DIR, f"{name}.marshal")
+    stat = os.stat(path)
+    key = (LORE_CACHE_VERSION, stat.st_mtime_ns, stat.st_size)
+
+    try:
+        with open(cache_path, "rb") as f:
+            cached_key, blocks = marshal.load(f)
+        if cached_key == key:
+            return blocks
+    except (OSError, EOFError, ValueError, TypeError):
+        pass
+
+    blocks = compile_lore_file(path)
+
+    # A cache that can't be written just means compiling again next time
+    try:
+        os.makedirs(LORE_CACHE_DIR, exist_ok=True)
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            marshal.dump((key, blocks), f)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        pass
+
+    return blocks
+
+
+def get_lore_entry(name, category, code):
+    # The compiled (variants, is_choice) for a message, or None if there isn't one
+    catalog = _catalogs.get(name)
+    if catalog is None:
+        catalog = _catalogs[name] = {"blocks": load_lore_file(name), "categories": {}}
+
+    codes = catalog["categories"].get(category)
+    if codes is None:
+        block = catalog["blocks"].get(category)
+        if block is None:
+            return None
+        codes = catalog["categories"][category] = MappingProxyType(marshal.loads(block))
+
+    return codes.get(code)
+
+
+def reload_lore():
+    # Forget everything loaded, so edited files are picked up on the next lookup
+    _catalogs.clear()
@@ -0,0 +1,12 @@
+# lore_modules.py - which modules the game's lore.<name> imports load
+
+# The game imports the UI and lore modules as lore.<name>, but lore/ still holds older copies of them.
+# Importing this points those names at the modules at the top of the game folder, which are the ones
+# kept up to date. Every entry point (main, engine, batch, outpost_tools) imports it before anything else.
+
+import importlib
+import sys
+
+# In import order: each of these imports the ones before it
+for name in ("user_interface", "lore_ingame", "lore_story"):
+    sys.modules.setdefault("lore." + name, importlib.import_module(name))
@@ -1,23 +1,30 @@
 # main.py
 
-from endgame import check_endgame, handle_game_over_loop
-from lore.lore_ingame import print_commands, get_message
+import argparse
+
+import lore_modules  # noqa: F401 (before anything imports lore.*)
+from endgame import announce_game_over, check_endgame
+from lore.lore_ingame import print_commands
 from lore.lore_story import get_story_message, msg_story
-from lore.user_interface import msg_warn
+from constants import EVENT_LOG_FILE, TRANSCRIPT_FILE
+from lore.user_interface import enable_event_log
 from OutpostUI import OutpostUI
+from transcript import start_transcript
 from turns import process_user_input
 from utils import load_config, update_screen
 
 import tkinter as tk
 
-def main():
+def main(slot=None, events=None, record=None):
+    if events:
+        enable_event_log(events)
+
     root = tk.Tk()
     ui = OutpostUI(root)
 
     import lore.user_interface as ui_runtime
     ui_runtime.UI_MODE = "gui"
     ui_runtime.ACTIVE_UI = ui
-    awaiting_input = False
 
     def command_callback(command):
         ui.append_log(f">> {command}")
@@ -25,7 +32,7 @@ def main():
 
     ui.set_command_callback(command_callback)
 
-    task_package = load_config()
+    task_package = load_config(slot)
     if task_package:
         turns_elapsed = task_package["counters"]["turns"]
 
@@ -36,10 +43,7 @@ def main():
         game_over, end_msg, task_package = check_endgame(task_package)
 
         if game_over:
-            awaiting_input, task_package = handle_game_over_loop(end_msg)
-            if not awaiting_input:
-                if not task_package:
-                    msg_warn(get_message("error", "no_config"), 0)
+            announce_game_over(end_msg, task_package)
         else:
             print_commands(turns_elapsed)
 
@@ -47,7 +51,16 @@ def main():
     task_package = load_config()
     update_screen(task_package)
 
+    # A question waiting at this point can only be the opening one of a brand-new game
+    if record:
+        start_transcript(record, task_package, new_game=ui.pending_question is not None)
+
     root.mainloop()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Aynsefian Outpost")
+    parser.add_argument("--slot", help="save slot to play (default: the main save)")
+    parser.add_argument("--events", nargs="?", const=EVENT_LOG_FILE, help=f"also write a JSONL event log (default file: {EVENT_LOG_FILE})")
+    parser.add_argument("--record", nargs="?", const=TRANSCRIPT_FILE, help=f"record every command and answer, to replay later (default file: {TRANSCRIPT_FILE})")
+    args = parser.parse_args()
+    main(args.slot, args.events, args.record)
\ No newline at end of file
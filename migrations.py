@@ -0,0 +1,133 @@
+# migrations.py - bring old saves up to the current SAVE_SCHEMA_VERSION
+
+# Every snapshot is stamped with the schema version it was written with. Saves from before
+# versioning are version 1. When a save is loaded, each migration from its version up to the
+# current one runs once, and the upgraded save is written straight back - so the rest of the
+# game can rely on the current shape instead of probing for old ones every turn.
+#
+# To change the shape of the save: bump SAVE_SCHEMA_VERSION and add a migrate_vN function
+# (taking version N to N+1) to MIGRATIONS. New commands don't need one: a command missing from
+# a save's gamestate starts as it would in a new game (see is_command_enabled).
+
+from constants import INITIAL_GAMESTATE, SAVE_SCHEMA_VERSION
+from game_random import new_game_random
+from items import found_items_from
+
+
+def empty_queue_slot():
+    return {"task": "", "item": ""}
+
+
+def migrate_v1(data):
+    # Version 1 -> 2: fill in everything older saves may be missing, and settle the
+    # shapes that used to vary (crop bed_id, PowerSupply crystal and vial stores).
+
+    # Whole sections
+    for section, default in (("crops", {}), ("droids", {}), ("humans", {}), ("resources", []),
+                             ("tasks", {}), ("task_data", {}), ("item", "")):
+        data.setdefault(section, default)
+
+    # Commands added since the save was made start as they would in a new game
+    gamestate = data.setdefault("gamestate", {})
+    for key, value in INITIAL_GAMESTATE.items():
+        gamestate.setdefault(key, value)
+
+    counters = data.setdefault("counters", {})
+    for key in ("turns", "task", "crop", "explore", "found_nil"):
+        counters.setdefault(key, 0)
+
+    shieldstate = data.setdefault("shieldstate", {})
+    for key in ("shield_found", "manual_decoded", "ancient_droid_valid", "crystal_combo_valid", "shield_connected", "shield_active"):
+        shieldstate.setdefault(key, False)
+
+    # Characters
+    character_defaults = {"task": "", "generated": False, "item": "", "examine_needed": ""}
+    for human in data["humans"].values():
+        for key, value in dict(character_defaults, hunger=0, state="Okay").items():
+            human.setdefault(key, value)
+    for droid in data["droids"].values():
+        for key, value in dict(character_defaults, charge=0, AncientCode=False, first_charge=True).items():
+            droid.setdefault(key, value)
+    for character in list(data["humans"].values()) + list(data["droids"].values()):
+        queue = character.setdefault("queue", {})
+        for slot in ("1", "2", "3"):
+            queue.setdefault(slot, empty_queue_slot())
+            queue[slot].setdefault("task", "")
+            queue[slot].setdefault("item", "")
+
+    # Resources
+    beds = {}
+    for resource in data["resources"]:
+        resource.setdefault("examined", False)
+
+        if resource.get("name") == "HydroponicsRoom":
+            beds = {bed["id"]: bed for bed in resource.get("beds", [])}
+
+        if resource.get("name") == "PowerSupply":
+            crystal_store = resource.get("CrystalStore")
+            if crystal_store:
+                for counts in (crystal_store, crystal_store.setdefault("total_found", {}), crystal_store.setdefault("processed", {})):
+                    for colour in ("red", "indigo", "gold"):
+                        counts.setdefault(colour, 0)
+            vial_store = resource.get("VialStore")
+            if vial_store:
+                for colour in ("red", "indigo", "gold"):
+                    vial_store.setdefault(colour, 0)
+
+    # Crops: bed_id was once just the bed number
+    for crop in data["crops"].values():
+        bed_id = crop.get("bed_id")
+        if isinstance(bed_id, int):
+            crop["bed_id"] = dict(beds.get(bed_id, {"id": bed_id}))
+        for key, value in (("crop_type", "unknown"), ("worker", "Unknown"), ("turns_remaining", 0), ("mature", False)):
+            crop.setdefault(key, value)
+
+    return data
+
+
+def migrate_v2(data):
+    # Version 2 -> 3: tasks hold the turn they end on instead of a countdown of turns left
+    turns = data["counters"]["turns"]
+    for task in data["tasks"].values():
+        if "duration" in task:
+            task["ends"] = turns + task.pop("duration")
+
+    return data
+
+
+def migrate_v3(data):
+    # Version 3 -> 4: each game has its own seeded rng. Older games carry on with a new seed.
+    data.setdefault("rng", new_game_random())
+
+    return data
+
+
+def migrate_v4(data):
+    # Version 4 -> 5: found items are recorded per game (counters["found_items"]) instead of on the
+    # shared item templates, where they were never saved. Everything already discovered counts as found.
+    counters = data["counters"]
+    counters["found_items"] = counters.get("found_items", 0) | found_items_from(data["resources"])
+
+    return data
+
+
+MIGRATIONS = {
+    1: migrate_v1,
+    2: migrate_v2,
+    3: migrate_v3,
+    4: migrate_v4,
+}
+
+
+def migrate_state(data, version):
+    # Upgrade data (a whole save) from version to SAVE_SCHEMA_VERSION.
+    # Returns (data, whether anything had to be migrated).
+    if version > SAVE_SCHEMA_VERSION:
+        raise ValueError(f"This save is from a newer version of the game (schema {version}, this game reads up to {SAVE_SCHEMA_VERSION})")
+
+    migrated = version < SAVE_SCHEMA_VERSION
+    while version < SAVE_SCHEMA_VERSION:
+        data = MIGRATIONS[version](data)
+        version += 1
+
+    return data, migrated
@@ -0,0 +1,127 @@
+# outpost_tools.py - command-line tools for looking after Outpost saves
+
+import argparse
+import os
+import time
+from datetime import datetime
+from multiprocessing import Pool
+
+import lore_modules  # noqa: F401 (before anything imports lore.*)
+from batch import describe
+from constants import CONFIG_FILE, EXPLORE_SIM_MAX_EXPLORES, EXPLORE_SIM_RUNS, SAVES_DIR
+from engine import get_state, replay
+from exploration import default_turns_per_explore, numpy, simulate_explores
+from persistence import find_snapshot, list_slots, rebuild_index, upgrade_save
+
+
+def cmd_slots(args):
+    # List the save slots from the index, without opening any of the saves
+    if args.rebuild:
+        rebuild_index()
+    slots = list_slots()
+    if not slots:
+        print("No saved games.")
+        return
+
+    print(f"{'slot':<20}{'day':>5}{'turn':>6}  {'shield':<9}{'humans':>7}  {'state':<12}last played")
+    for slot, summary in slots:
+        shield = "active" if summary["shield_active"] else "inactive"
+        state = summary["endgame_reason"] if summary["game_over"] else "in progress"
+        played = datetime.fromtimestamp(summary["modified"]).strftime("%Y-%m-%d %H:%M")
+        print(f"{slot:<20}{summary['day']:>5}{summary['turn']:>6}  {shield:<9}{summary['humans_alive']:>7}  {state:<12}{played}")
+
+
+def cmd_upgrade(args):
+    # Upgrade every save in a folder of slots (and the main save) to the current schema, in parallel
+    saves_dir = args.saves_dir
+    config_files = []
+    if saves_dir == SAVES_DIR and find_snapshot(CONFIG_FILE):
+        config_files.append(CONFIG_FILE)
+    if os.path.isdir(saves_dir):
+        for entry in sorted(os.listdir(saves_dir)):
+            # Slots are folders; the index sits alongside them
+            if not os.path.isdir(os.path.join(saves_dir, entry)):
+                continue
+            config_file = os.path.join(saves_dir, entry, CONFIG_FILE)
+            if find_snapshot(config_file):
+                config_files.append(config_file)
+
+    if not config_files:
+        print(f"No saves found in {saves_dir}.")
+        return
+
+    with Pool(args.workers) as pool:
+        results = pool.map(upgrade_save, config_files)
+
+    for config_file, result in zip(config_files, results):
+        print(f"{result:<10}{config_file}")
+    print(f"{results.count('upgraded')} of {len(config_files)} saves upgraded.")
+
+    if saves_dir == SAVES_DIR:
+        rebuild_index()
+
+
+def cmd_replay(args):
+    # Play a recorded transcript back in memory, timing it
+    started = time.perf_counter()
+    replay(args.transcript)
+    elapsed = time.perf_counter() - started
+
+    state = get_state()
+    turns = state["counters"]["turns"]
+    outcome = state["gamestate"]["endgame_reason"] if state["gamestate"]["game_over"] else "in progress"
+    print(f"Replayed to day {turns // 10}, turn {turns} ({outcome}) in {elapsed:.3f}s")
+
+
+def cmd_explore_odds(args):
+    # When each critical item turns up in a new game, from the exploration rules alone (see exploration.py)
+    turns_per_explore = args.turns_per_explore or default_turns_per_explore()
+    started = time.perf_counter()
+    results = simulate_explores(args.runs, max_explores=args.max_explores, turns_per_explore=turns_per_explore,
+                                seed=args.seed, use_numpy=False if args.no_numpy else None)
+    elapsed = time.perf_counter() - started
+
+    engine_name = "numpy" if numpy is not None and not args.no_numpy else "python"
+    print(f"{args.runs} runs of up to {args.max_explores} explores, {turns_per_explore:.2f} turns per explore "
+          f"({engine_name}, {elapsed:.2f}s)")
+    print(f"\n{'':<22}{'found':>7}{'mean':>8}{'p10':>6}{'p50':>6}{'p90':>6}{'day':>7}   (explores)")
+    for name, found_on in results.items():
+        stats = describe([explore for explore in found_on if explore is not None])
+        if not stats["games"]:
+            print(f"{name:<22}{'never':>7}")
+            continue
+        day = stats["mean"] * turns_per_explore / 10
+        print(f"{name:<22}{100 * stats['games'] / args.runs:>6.1f}%{stats['mean']:>8}{stats['p10']:>6}{stats['p50']:>6}{stats['p90']:>6}{day:>7.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Aynsefian Outpost save tools")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    slots_parser = commands.add_parser("slots", help="list save slots")
+    slots_parser.add_argument("--rebuild", action="store_true", help="rebuild the index by opening every save")
+    slots_parser.set_defaults(run=cmd_slots)
+
+    upgrade_parser = commands.add_parser("upgrade", help="upgrade old saves to the current save format")
+    upgrade_parser.add_argument("saves_dir", nargs="?", default=SAVES_DIR, help=f"folder of save slots (default: {SAVES_DIR} and the main save)")
+    upgrade_parser.add_argument("--workers", type=int, default=None, help="number of worker processes (default: one per CPU)")
+    upgrade_parser.set_defaults(run=cmd_upgrade)
+
+    replay_parser = commands.add_parser("replay", help="play a recorded transcript back and time it")
+    replay_parser.add_argument("transcript", help="transcript file (from main.py --record)")
+    replay_parser.set_defaults(run=cmd_replay)
+
+    odds_parser = commands.add_parser("explore-odds", help="simulate exploring to see when each critical item is found")
+    odds_parser.add_argument("--runs", type=int, default=EXPLORE_SIM_RUNS, help=f"runs to simulate (default: {EXPLORE_SIM_RUNS})")
+    odds_parser.add_argument("--max-explores", type=int, default=EXPLORE_SIM_MAX_EXPLORES, help=f"explores per run (default: {EXPLORE_SIM_MAX_EXPLORES})")
+    odds_parser.add_argument("--turns-per-explore", type=float, default=None, help="turns between explores (default: everyone exploring)")
+    odds_parser.add_argument("--seed", type=int, default=None, help="seed, for the same results every time")
+    odds_parser.add_argument("--no-numpy", action="store_true", help="use the plain Python simulator even if numpy is installed")
+    odds_parser.set_defaults(run=cmd_explore_odds)
+
+    args = parser.parse_args()
+    args.run(args)
+
+
+if __name__ == "__main__":
+    main()
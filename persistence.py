@@ -0,0 +1,541 @@
+# persistence.py
+
+import atexit
+import json
+import os
+import queue
+import re
+import threading
+import time
+
+from constants import (CONFIG_FILE, JOURNAL_FILE, SAVE_KEYS, SNAPSHOT_INTERVAL, SAVE_BACKUPS, SAVE_IN_BACKGROUND, SAVE_FORMAT,
+    SAVES_DIR, SAVE_INDEX_FILE, DEFAULT_SLOT, SAVE_SCHEMA_VERSION)
+from game_random import sync_game_random
+from migrations import migrate_state
+from serializers import SNAPSHOT_EXTENSIONS, decode_state, encode_state
+from tracking import ALL, TaskPackage, to_plain
+
+# The live game. Once loaded, this is the authoritative copy of the task_package.
+# On disk it is kept as a full snapshot (CONFIG_FILE, with the extension of its SAVE_FORMAT)
+# plus a journal of the changes made since that snapshot (JOURNAL_FILE), one line per checkpoint.
+# The default slot keeps these in the game folder; any other slot keeps them in SAVES_DIR/<slot>/.
+_live = {
+    "slot": DEFAULT_SLOT,
+    "task_package": None,
+    "dirty": False,
+    "shadow": None,             # What the disk currently holds (snapshot + journal)
+    "generation": 0,            # Ties journal lines to the snapshot they apply to
+    "snapshot_turn": 0,
+    "needs_snapshot": False,
+    "on_disk": True,            # Off for games that only live in memory (see set_save_to_disk)
+}
+
+# Disk writes, in order. Run inline, or on a single writer thread if SAVE_IN_BACKGROUND is set.
+_writer = {
+    "queue": None,
+    "thread": None,
+    "error": None,
+}
+
+
+def get_live_package():
+    return _live["task_package"]
+
+
+def set_live_package(task_package):
+    # Adopt the given package as the live game and mark it as needing a checkpoint
+    _live["task_package"] = task_package
+    _live["dirty"] = True
+
+
+def discard_live_package():
+    # Forget the live game, so the next load comes from disk
+    _live["task_package"] = None
+    _live["dirty"] = False
+    _live["shadow"] = None
+
+
+def set_save_to_disk(on_disk):
+    # Games that don't save (headless runs, simulations) skip every read and write of the save files
+    _live["on_disk"] = on_disk
+
+
+def slot_paths(slot):
+    # (snapshot file, journal file) for a save slot
+    if slot == DEFAULT_SLOT:
+        return CONFIG_FILE, JOURNAL_FILE
+
+    if not re.fullmatch(r"[A-Za-z0-9_-]+", slot):
+        raise ValueError(f"Invalid save slot name '{slot}' (use letters, numbers, - and _)")
+
+    folder = os.path.join(SAVES_DIR, slot)
+    return os.path.join(folder, CONFIG_FILE), os.path.join(folder, JOURNAL_FILE)
+
+
+def get_slot():
+    return _live["slot"]
+
+
+def use_slot(slot):
+    # Switch the live game to another save slot, putting the current one safely on disk first.
+    # The next load comes from the new slot.
+    if slot is None or slot == _live["slot"]:
+        return
+
+    slot_paths(slot)    # Check the name before giving up the current game
+    checkpoint(force=True)
+    discard_live_package()
+    _live["slot"] = slot
+    _live["generation"] = 0
+
+
+def backup_file(path, generation):
+    return f"{path}.{generation}"
+
+
+def snapshot_path(config_file, fmt):
+    # Where a slot's snapshot in format fmt lives: config_file with that format's extension
+    return os.path.splitext(config_file)[0] + SNAPSHOT_EXTENSIONS[fmt]
+
+
+def find_snapshot(config_file):
+    # The slot's most recently written snapshot, whatever format it is in (so changing SAVE_FORMAT
+    # carries on from the last save), or None. Backups count, in case a crash left only those.
+    newest = None
+    for fmt in SNAPSHOT_EXTENSIONS:
+        path = snapshot_path(config_file, fmt)
+        for candidate in [path] + [backup_file(path, i) for i in range(1, SAVE_BACKUPS + 1)]:
+            try:
+                modified = os.stat(candidate).st_mtime_ns
+            except FileNotFoundError:
+                continue
+            if newest is None or modified > newest[0]:
+                newest = (modified, path)
+
+    return newest[1] if newest else None
+
+
+def load_snapshot(config_file):
+    # Read the newest snapshot that parses, falling back through the backups.
+    # Returns (data, from_backup), or (None, False) if there isn't one.
+    config_file = find_snapshot(config_file)
+    if config_file is None:
+        return None, False
+
+    for i in range(SAVE_BACKUPS + 1):
+        path = backup_file(config_file, i) if i else config_file
+        try:
+            with open(path, "rb") as f:
+                return decode_state(f.read()), i > 0
+        except (FileNotFoundError, ValueError):
+            continue
+
+    return None, False
+
+
+def read_save_files(config_file, journal_file):
+    # Rebuild a save from disk: the snapshot, then every journal line written since, then any
+    # schema migrations. Returns None if there isn't a usable snapshot, otherwise a dict of
+    # data, generation, snapshot_turn and needs_snapshot (true if the files on disk need rewriting).
+    data, from_backup = load_snapshot(config_file)
+    if data is None:
+        return None
+
+    generation = data.pop("journal_gen", 0)
+    version = data.pop("schema_version", 1)
+    snapshot_turn = data.get("counters", {}).get("turns", 0)
+    needs_snapshot = from_backup
+
+    try:
+        with open(journal_file, "r") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # A torn write at the end of the journal - everything before it is good
+                    needs_snapshot = True
+                    break
+                if entry.get("gen") != generation:
+                    continue
+                for op in entry["ops"]:
+                    apply_op(data, op)
+    except FileNotFoundError:
+        pass
+
+    # Old saves are upgraded here, once, and written back by the caller
+    data, migrated = migrate_state(data, version)
+
+    return {
+        "data": data,
+        "generation": generation,
+        "snapshot_turn": snapshot_turn,
+        "needs_snapshot": needs_snapshot or migrated,
+    }
+
+
+def read_saved_data():
+    # Load the live slot from disk. Returns None if there isn't a usable save.
+    if not _live["on_disk"]:
+        return None
+
+    wait_for_writes()
+    saved = read_save_files(*slot_paths(_live["slot"]))
+    if saved is None:
+        return None
+
+    _live["shadow"] = to_plain(saved["data"])
+    _live["generation"] = saved["generation"]
+    _live["snapshot_turn"] = saved["snapshot_turn"]
+    _live["needs_snapshot"] = saved["needs_snapshot"]
+
+    return saved["data"]
+
+
+def diff_state(old, new, path, ops):
+    # Append to ops the changes needed to turn old into new.
+    # Each op is [kind, path, value]: "set" a key or index, "del" a key, or "trim" a list to a length.
+    if type(old) is not type(new):
+        ops.append(["set", path, new])
+
+    elif isinstance(new, dict):
+        for key, value in new.items():
+            if key in old:
+                diff_state(old[key], value, path + [key], ops)
+            else:
+                ops.append(["set", path + [key], value])
+        for key in old:
+            if key not in new:
+                ops.append(["del", path + [key], None])
+
+    elif isinstance(new, list):
+        common = min(len(old), len(new))
+        for i in range(common):
+            diff_state(old[i], new[i], path + [i], ops)
+        for i in range(common, len(new)):
+            ops.append(["set", path + [i], new[i]])
+        if len(new) < len(old):
+            ops.append(["trim", path, len(new)])
+
+    elif old != new:
+        ops.append(["set", path, new])
+
+    return ops
+
+
+def diff_dirty(old, new, dirty, ops):
+    # As diff_state, but only looking at the sections and entries recorded as dirty
+    for section, keys in dirty.items():
+        if section not in new:
+            if section in old:
+                ops.append(["del", [section], None])
+            continue
+
+        old_section = old.get(section)
+        new_section = new[section]
+        if (keys is ALL or section not in old or type(old_section) is not type(new_section)
+                or not isinstance(new_section, (dict, list))):
+            if section in old:
+                diff_state(old_section, new_section, [section], ops)
+            else:
+                ops.append(["set", [section], new_section])
+            continue
+
+        if isinstance(new_section, list):
+            for index in sorted(keys):
+                if index < len(old_section) and index < len(new_section):
+                    diff_state(old_section[index], new_section[index], [section, index], ops)
+                elif index < len(new_section):
+                    ops.append(["set", [section, index], new_section[index]])
+            if len(new_section) < len(old_section):
+                ops.append(["trim", [section], len(new_section)])
+        else:
+            for key in keys:
+                if key in old_section and key in new_section:
+                    diff_state(old_section[key], new_section[key], [section, key], ops)
+                elif key in new_section:
+                    ops.append(["set", [section, key], new_section[key]])
+                elif key in old_section:
+                    ops.append(["del", [section, key], None])
+
+    return ops
+
+
+def apply_op(data, op):
+    # Apply a single journal op to data (see diff_state)
+    kind, path, value = op
+    target = data
+
+    if kind == "trim":
+        for key in path:
+            target = target[key]
+        del target[value:]
+        return
+
+    for key in path[:-1]:
+        target = target[key]
+    last = path[-1]
+
+    if kind == "del":
+        del target[last]
+    elif isinstance(target, list) and last == len(target):
+        target.append(value)
+    else:
+        target[last] = value
+
+
+def atomic_write(path, raw, backups=0):
+    # Write to a temporary file, make sure it is on disk, then swap it in.
+    # A crash at any point leaves either the old file or the new one, never a torn one.
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(raw)
+        f.flush()
+        os.fsync(f.fileno())
+
+    # Roll the backups along: .1 is the previous snapshot, .2 the one before that...
+    if backups and os.path.exists(path):
+        for i in range(backups, 1, -1):
+            if os.path.exists(backup_file(path, i - 1)):
+                os.replace(backup_file(path, i - 1), backup_file(path, i))
+        os.replace(path, backup_file(path, 1))
+
+    os.replace(tmp_path, path)
+
+
+def encode_snapshot(plain_data, generation):
+    return encode_state(dict(plain_data, journal_gen=generation, schema_version=SAVE_SCHEMA_VERSION), SAVE_FORMAT)
+
+
+def write_snapshot_files(config_file, journal_file, raw):
+    folder = os.path.dirname(config_file)
+    if folder:
+        os.makedirs(folder, exist_ok=True)
+
+    atomic_write(snapshot_path(config_file, SAVE_FORMAT), raw, backups=SAVE_BACKUPS)
+
+    # Lines from the old generation no longer apply, even if this truncation never happens
+    with open(journal_file, "w"):
+        pass
+
+
+def append_journal_line(journal_file, line):
+    with open(journal_file, "a") as f:
+        f.write(line)
+
+
+def read_index():
+    # {slot: summary} for every slot, as of its last snapshot
+    try:
+        with open(SAVE_INDEX_FILE, "r") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def write_index_entry(slot, summary):
+    index = read_index()
+    if summary is None:
+        index.pop(slot, None)
+    else:
+        index[slot] = summary
+
+    os.makedirs(os.path.dirname(SAVE_INDEX_FILE), exist_ok=True)
+    atomic_write(SAVE_INDEX_FILE, json.dumps(index, indent=4).encode("utf-8"))
+
+
+def summarise_state(data, modified):
+    # The few facts a slot picker needs, without opening the save itself
+    counters = data.get("counters", {})
+    gamestate = data.get("gamestate", {})
+    return {
+        "day": counters.get("turns", 0) // 10,
+        "turn": counters.get("turns", 0),
+        "shield_active": data.get("shieldstate", {}).get("shield_active", False),
+        "humans_alive": sum(1 for human in data.get("humans", {}).values() if human.get("state") != "Deceased"),
+        "game_over": gamestate.get("game_over", False),
+        "endgame_reason": gamestate.get("endgame_reason", "null"),
+        "modified": modified,
+    }
+
+
+def run_writer():
+    # Body of the background writer thread
+    while True:
+        job, args = _writer["queue"].get()
+        try:
+            job(*args)
+        except Exception as e:
+            # Keep going, so later writes still land and wait_for_writes returns.
+            # The next checkpoint sees the error and writes a full snapshot to cover what was lost.
+            _writer["error"] = e
+        finally:
+            _writer["queue"].task_done()
+
+
+def take_write_error():
+    # The error from a failed background write, if there's been one since we last asked
+    error, _writer["error"] = _writer["error"], None
+    return error
+
+
+def submit_write(job, *args):
+    # Hand a disk write to the writer thread, or just do it if we're saving in the foreground.
+    # Either way, writes reach the disk in the order they were submitted.
+    error = take_write_error()
+    if error is not None:
+        _live["needs_snapshot"] = True
+        raise error
+
+    if not SAVE_IN_BACKGROUND:
+        job(*args)
+        return
+
+    if _writer["thread"] is None:
+        _writer["queue"] = queue.Queue()
+        _writer["thread"] = threading.Thread(target=run_writer, name="outpost-save", daemon=True)
+        _writer["thread"].start()
+
+    _writer["queue"].put((job, args))
+
+
+def wait_for_writes():
+    # Block until everything submitted so far is on disk
+    if _writer["queue"] is not None:
+        _writer["queue"].join()
+
+
+def write_snapshot(data):
+    # Write the whole game and start a new, empty journal generation.
+    # It is encoded here so the writer never sees the game part-way through a turn.
+    generation = _live["generation"] + 1
+    plain_data = to_plain(data)
+    config_file, journal_file = slot_paths(_live["slot"])
+    submit_write(write_snapshot_files, config_file, journal_file, encode_snapshot(plain_data, generation))
+    submit_write(write_index_entry, _live["slot"], summarise_state(plain_data, time.time()))
+
+    _live["shadow"] = plain_data
+    _live["generation"] = generation
+    _live["snapshot_turn"] = data["counters"]["turns"]
+    _live["needs_snapshot"] = False
+
+
+def append_journal(data, dirty=None):
+    # Write only what has changed since the last checkpoint. If we know which parts of the
+    # package are dirty, only those are compared.
+    if dirty is None:
+        ops = diff_state(_live["shadow"], data, [], [])
+    else:
+        ops = diff_dirty(_live["shadow"], data, dirty, [])
+    if not ops:
+        return
+
+    entry = {"gen": _live["generation"], "turn": data["counters"]["turns"], "ops": ops}
+    _, journal_file = slot_paths(_live["slot"])
+    submit_write(append_journal_line, journal_file, json.dumps(entry, separators=(",", ":")) + "\n")
+
+    for op in ops:
+        apply_op(_live["shadow"], to_plain(op))
+
+
+def checkpoint(force=False):
+    # Put the live game on disk. Routine checkpoints (end of turn, waiting on a question)
+    # append a journal line, with a full snapshot every SNAPSHOT_INTERVAL turns.
+    # Forced checkpoints (quit, reset, new game) always write a full snapshot.
+    task_package = _live["task_package"]
+    if task_package is None:
+        return
+
+    if sync_game_random(task_package):
+        _live["dirty"] = True
+    if not _live["dirty"] and not force:
+        return
+
+    if not _live["on_disk"]:
+        _live["dirty"] = False
+        return
+
+    # A write that failed in the background left the disk behind the shadow, so nothing short of
+    # a full snapshot is sure to put it right. The error is still passed on once that is written.
+    error = take_write_error()
+    if error is not None:
+        _live["needs_snapshot"] = True
+
+    data = {key: task_package[key] for key in SAVE_KEYS if key in task_package}
+    dirty = task_package.take_dirty("save") if isinstance(task_package, TaskPackage) else None
+
+    try:
+        if (force or _live["shadow"] is None or _live["needs_snapshot"]
+                or data["counters"]["turns"] - _live["snapshot_turn"] >= SNAPSHOT_INTERVAL):
+            write_snapshot(data)
+        else:
+            append_journal(data, dirty)
+    except Exception:
+        # The dirty sections have been taken, so the next try has to compare everything
+        _live["needs_snapshot"] = True
+        raise
+
+    _live["dirty"] = False
+    if error is not None:
+        raise error
+
+
+def export_save(path, fmt="json"):
+    # Write the live game somewhere else, by default as readable JSON
+    task_package = _live["task_package"]
+    if task_package is None:
+        return False
+
+    sync_game_random(task_package)
+    data = {key: to_plain(task_package[key]) for key in SAVE_KEYS if key in task_package}
+    wait_for_writes()
+    atomic_write(path, encode_state(data, fmt))
+    return True
+
+
+def list_slots():
+    # Every known slot and its summary, most recently played first. Only the index is read.
+    wait_for_writes()
+    index = read_index()
+    return sorted(index.items(), key=lambda item: item[1].get("modified", 0), reverse=True)
+
+
+def rebuild_index():
+    # Recreate the index by opening every save (e.g. if it's been lost or saves were copied in)
+    wait_for_writes()
+    slots = [DEFAULT_SLOT]
+    if os.path.isdir(SAVES_DIR):
+        slots += sorted(entry for entry in os.listdir(SAVES_DIR) if os.path.isdir(os.path.join(SAVES_DIR, entry)))
+
+    index = {}
+    for slot in slots:
+        config_file, _ = slot_paths(slot)
+        data, _ = load_snapshot(config_file)
+        if data is not None:
+            index[slot] = summarise_state(data, os.path.getmtime(find_snapshot(config_file)))
+
+    os.makedirs(os.path.dirname(SAVE_INDEX_FILE), exist_ok=True)
+    atomic_write(SAVE_INDEX_FILE, json.dumps(index, indent=4).encode("utf-8"))
+    return index
+
+
+def upgrade_save(config_file):
+    # Bring one save up to the current schema on disk, outside of any live game.
+    # Returns "upgraded", "current" or "missing". Safe to run in a worker process.
+    journal_file = os.path.join(os.path.dirname(config_file), JOURNAL_FILE)
+    saved = read_save_files(config_file, journal_file)
+    if saved is None:
+        return "missing"
+    if not saved["needs_snapshot"]:
+        return "current"
+
+    write_snapshot_files(config_file, journal_file, encode_snapshot(saved["data"], saved["generation"] + 1))
+    return "upgraded"
+
+
+def shutdown():
+    # Whatever happens, don't lose the last few turns when the interpreter exits
+    checkpoint(force=True)
+    wait_for_writes()
+
+
+atexit.register(shutdown)
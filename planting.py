@@ -1,8 +1,8 @@
 # planting.py
 
-import random
-from command_utils import create_task, get_pronouns
+from command_utils import create_task, find_resource, get_pronouns
 from constants import SERVING_VALUE, HYDROPONICS_BED_MIN, HYDROPONICS_BED_MAX, SEED_PACKETS_USED, TASK_PLANTING, FOOD_PER_DAY, NUM_HUMANS, TASK_LENGTH
+from game_random import game_rng
 from lore.lore_ingame import get_message
 import lore.user_interface as ui_runtime
 from lore.user_interface import get_input, msg_plant, msg_food
@@ -16,7 +16,7 @@ def feed_human(name, task_package):
     resources = task_package["resources"]
     turns_elapsed = task_package["counters"]["turns"]
     return_msg = ""
-    food_store = next((r for r in resources if r["name"] == "FoodStore"), None)
+    food_store = find_resource(resources, "FoodStore")
     is_human = name in humans
     pronouns = get_pronouns(name, is_human)
 
@@ -98,7 +98,7 @@ def feed_human(name, task_package):
     # Again check days of food left and warn if below two days' worth
     how_much_food_now = days_of_food_left(resources)
     if how_much_food_now < 2 and how_much_food >= 2:
-        msg_food(get_message("feed", "low_food_warning"), turns_elapsed, num_humans=NUM_HUMANS, tone="warn")
+        msg_food(get_message("feed", "low_food_warning", num_humans=NUM_HUMANS), turns_elapsed, tone="warn")
     
     task_package = process_hunger_status(name, task_package)
     return return_msg, task_package
@@ -109,7 +109,7 @@ def update_food_amount(resources, food_type, amount, turns_elapsed, allow_negati
     # food_type (str): The type of food to update ("apple", "soup", etc.)
     # amount (float or int): Amount to add (positive) or subtract (negative).
     
-    food_store = next((r for r in resources if r["name"] == "FoodStore"), None)
+    food_store = find_resource(resources, "FoodStore")
     if not food_store:
         msg_plant(get_message("error", "no_food_store"), turns_elapsed, tone="error")
 
@@ -126,7 +126,7 @@ def update_food_amount(resources, food_type, amount, turns_elapsed, allow_negati
 
 def get_food_amount(resources, food_type):
     # Returns the current quantity of a given food type from the FoodStore.
-    food_store = next((r for r in resources if r["name"] == "FoodStore"), None)
+    food_store = find_resource(resources, "FoodStore")
     if not food_store:
         return 0
 
@@ -155,37 +155,37 @@ def update_multiple_foods(resources, allow_negative=False, **kwargs):
     return resources
 
 
-def initialise_hydroponics_room(resources):
+def initialise_hydroponics_room(resources, rng):
     #  Ensure the HydroponicsRoom resource has beds, powered flag, and power_usage.
     # Safe to call multiple times – will only initialise once.
-    for r in resources:
-        if r.get("name") == "HydroponicsRoom":
-            # Already initialised? Leave it.
-            if "beds" in r and r["beds"]:
-                return resources
-
-            bed_count = random.randint(HYDROPONICS_BED_MIN, HYDROPONICS_BED_MAX)
-
-            r["beds"] = [
-                {
-                    "id": i + 1,
-                    "occupied": False,
-                    "reserved": False,
-                    "crop_id": None  # will point into crops dict later
-                }
-                for i in range(bed_count)
-            ]
-
-            # Preserve your existing flags; just set defaults if missing
-            r.setdefault("replaced", False)
-            r.setdefault("augmented", False)
-
-            # Power-related fields – these will matter when we wire the power system
-            r.setdefault("powered", True)
-            r.setdefault("power_usage", 10)  # tweak later for balance
-
+    r = find_resource(resources, "HydroponicsRoom")
+    if r is not None:
+        # Already initialised? Leave it.
+        if "beds" in r and r["beds"]:
             return resources
 
+        bed_count = rng.randint(HYDROPONICS_BED_MIN, HYDROPONICS_BED_MAX)
+
+        r["beds"] = [
+            {
+                "id": i + 1,
+                "occupied": False,
+                "reserved": False,
+                "crop_id": None  # will point into crops dict later
+            }
+            for i in range(bed_count)
+        ]
+
+        # Preserve your existing flags; just set defaults if missing
+        r.setdefault("replaced", False)
+        r.setdefault("augmented", False)
+
+        # Power-related fields – these will matter when we wire the power system
+        r.setdefault("powered", True)
+        r.setdefault("power_usage", 10)  # tweak later for balance
+
+        return resources
+
     # If there is no HydroponicsRoom yet, just return.
     return resources
 
@@ -193,7 +193,7 @@ def get_hydroponics_summary(resources, crops):
     # Returns a dict summary of the HydroponicsRoom beds and their crops.
     # Also optionally logs a nice description if you want to call it directly.
     
-    room = next((r for r in resources if r.get("name") == "HydroponicsRoom"), None)
+    room = find_resource(resources, "HydroponicsRoom")
     if not room or "beds" not in room:
         # Nothing to show
         return None
@@ -236,7 +236,7 @@ def update_crop_growth(task_package):
     resources = task_package["resources"]
     turns_elapsed = task_package["counters"]["turns"]
 
-    hydro = next((r for r in resources if r.get("name") == "HydroponicsRoom"), None)
+    hydro = find_resource(resources, "HydroponicsRoom")
     if not hydro:
         return task_package
 
@@ -265,7 +265,7 @@ def update_crop_growth(task_package):
 
 def enough_seeds(seed_type, resources):
     # Seed check
-    stash = next((r for r in resources if r["name"] == "SeedStash"), None)
+    stash = find_resource(resources, "SeedStash")
     return stash[seed_type] >= SEED_PACKETS_USED[seed_type]
 
 
@@ -335,7 +335,7 @@ def continue_determine_what_to_plant_and_where(context):
     context["worker_name"] = worker_name
     context["is_human"] = is_human
 
-    food_store = next((r for r in resources if r.get("name") == "FoodStore"), None)
+    food_store = find_resource(resources, "FoodStore")
 
     if not food_store:
         msg_plant("No FoodStore found.", turns_elapsed, tone="error")
@@ -364,7 +364,7 @@ def continue_determine_what_to_plant_and_where(context):
         f"Potato: {SEED_PACKETS_USED['potato']}"
     )
 
-    seeds = next((r for r in resources if r.get("name") == "SeedStash"), None)
+    seeds = find_resource(resources, "SeedStash")
 
     if not seeds:
         msg_plant(get_message("plant", "no_seedstash"), turns_elapsed, tone="error")
@@ -377,7 +377,7 @@ def continue_determine_what_to_plant_and_where(context):
         f"Potato: {seeds.get('potato', 0)}"
     )
 
-    hydro = next((r for r in resources if r.get("name") == "HydroponicsRoom"), None)
+    hydro = find_resource(resources, "HydroponicsRoom")
 
     if not hydro:
         msg_plant(get_message("plant", "no_hydro"), turns_elapsed, tone="error")
@@ -605,9 +605,11 @@ def finish_initiate_plant_task(name, crop_instructions, task_package, queued_tas
     # --- Inline functions ported from commands.py to avoid circular references ---
     def set_task_length(task_type):
         low, high = TASK_LENGTH[task_type]
-        return random.randint(low, high)
+        return game_rng(task_package).randint(low, high)
 
+    # The package keeps a tracked copy, which is the one to carry on with
     task_package["task_data"] = crop_instructions
+    crop_instructions = task_package["task_data"]
 
     is_human = name in humans
     duration = set_task_length("plant_human") if is_human else set_task_length("plant_droid")
@@ -1,9 +1,9 @@
 # queuing.py
-import random
 
-from command_utils import create_task, get_pronouns
+from command_utils import create_task, find_resource, get_pronouns
 from constants import (TASK_EATING, TASK_CHARGING, TASK_EXPLORING, TASK_ASSIGNED, TASK_EXAMINING, TASK_PLANTING, TASK_MINING, TASK_REAPING, TASK_TOWING_DROID,
                        TASK_REFUELING, TASK_LENGTH, CHARGE_DURATION, LOW_CHARGE_FLAG, IDLE_CHARGE_USAGE, TOW_TASK_LENGTH)
+from game_random import game_rng
 from lore.lore_ingame import get_message
 import lore.user_interface as ui_runtime
 from lore.user_interface import get_input, msg_food, msg_power, msg_error,  msg_info, msg_explore, msg_mine, msg_plant, msg_resource, log_and_display
@@ -381,7 +381,7 @@ def do_auto_feed(name, task_package):
         task_package["droids"] = droids
 
         low, high = TASK_LENGTH["feed_human"]
-        duration = random.randint(low, high)
+        duration = game_rng(task_package).randint(low, high)
         task_type = TASK_EATING
         return_msg, task_package = create_task(name, task_type, duration, task_package)
 
@@ -432,9 +432,9 @@ def restart_examine(name, task_package):
     
     def set_task_length(task_type):
         low, high = TASK_LENGTH[task_type]
-        return random.randint(low, high)
+        return game_rng(task_package).randint(low, high)
 
-    item = next((r for r in resources if r["name"] == item_name), None)
+    item = find_resource(resources, item_name)
     if not item:
         msg_resource(get_message("examine", "not_found", item=item_name), turns_elapsed)
         return task_package
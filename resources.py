@@ -1,19 +1,29 @@
 # resources.py
 
-import random
-from command_utils import get_task_by_worker, remove_task_by_id
+from functools import lru_cache
+
+from command_utils import find_resource, get_task_by_worker, remove_task_by_id
 from constants import (
-    RATION_PACKS, MAJOR_RESOURCES_ORDER, CHAIN_RESOURCES_ORDER, GATING_RULES, NORMAL_ITEM_RARITY, GATE_ITEM_RARITY, POST_CRITICAL_ITEM_RARITY,
+    RATION_PACKS, MAJOR_RESOURCES_ORDER, CHAIN_RESOURCES_ORDER, NORMAL_ITEM_RARITY, GATE_ITEM_RARITY, POST_CRITICAL_ITEM_RARITY,
+    CHAIN_FIND_CHANCE, JUNK_FIND_CHANCE, GATE_STREAKS, FORCE_CRITICAL_STREAK,
     IDLE_CHARGE_USAGE, FULL_CHARGE, INITIAL_CHARGE, INITIAL_SEED_STASH, SEED_PACKETS_USED, NUM_DROIDS, LOW_CHARGE_FLAG, 
     TASK_CHARGING, TASK_ASSIGNED, TASK_PLANTING, TASK_EXAMINING, POWER_PER_RED, POWER_PER_INDIGO, POWER_PER_GOLD
 )
-from items import REPLACEMENT, CHAIN, NOVELTY, JUNK, ITEM_DB, get_item_template
+from exploration import exploration_stage
+from game_random import game_rng
+from items import ITEM_BITS, ITEM_NAMES_BY_CATEGORY, get_item_template
 from lore.lore_ingame import get_message
 from lore.user_interface import msg_power
 from planting import initialise_hydroponics_room
+from timelines import drains_charge
+from tracking import ResourceList
 from utils import set_shield_state
 
 def get_resource(resources, name):
+    # Finds a resource by name, ignoring case
+    if isinstance(resources, ResourceList):
+        return resources.find(name, ignore_case=True)
+
     for res in resources:
         # Safety first: skip invalid items
         if not isinstance(res, dict):
@@ -25,13 +35,13 @@ def get_resource(resources, name):
 
 def resource_is_discovered(resources, name) -> bool:
     # True if this item name already exists in the discovered resources list.
-    return any(r.get("name") == name for r in resources)
+    return find_resource(resources, name) is not None
 
 
 def add_or_get_discovered_item(resources, name):
     # Ensure that an item with this name exists in the discovered list.
     # - If already there, return that instance and the unchanged list.
-    # - If not, pull its template from ITEM_DB, clone, append, and return it.
+    # - If not, check ITEM_DB has a template for it, append it, and return it.
     
     existing = get_resource(resources, name)
     if existing is not None:
@@ -42,8 +52,11 @@ def add_or_get_discovered_item(resources, name):
         # Unknown name: just ignore silently; caller should handle None if needed
         return None, resources
 
-    resources.append(template)
-    return template, resources
+    # Hand back the stored instance, not what was appended (see tracking). In a task_package's
+    # resources that is a TrackedItem, which keeps just the name and reads everything else from
+    # the template until it's changed.
+    resources.append(dict(template))
+    return resources[-1], resources
 
 
 def all_major_resources_found(resources) -> bool:
@@ -53,11 +66,10 @@ def all_major_resources_found(resources) -> bool:
 
 def update_resource(resource_name, updates, resource_list):
     # Finds a resource in a list of resource dicts by name and updates its fields.
-    for res in resource_list:
-        if res.get("name") == resource_name:
-            res.update(updates)
-            break
-        
+    res = find_resource(resource_list, resource_name)
+    if res is not None:
+        res.update(updates)
+
     return resource_list
 
 
@@ -98,21 +110,33 @@ def force_next_critical(current_resources):
     return None
 
 
-def _pick_unfound_item(candidates):
-    #Generic helper: from a list of item dicts (Tarot, replacement, etc.),
-    #return a random unfound one, or None if none are available.
-    unfound = [c for c in candidates if not c.get("found", False)]
+@lru_cache(maxsize=4096)
+def unfound_item_names(category, found_items):
+    # The names in a category that aren't in found_items. found_items only changes when something
+    # is found, so nearly every roll is answered from the cache.
+    return tuple(name for name in ITEM_NAMES_BY_CATEGORY[category] if not found_items & ITEM_BITS[name])
+
+
+def _pick_unfound_item(task_package, category):
+    #Generic helper: from a category of items (replacement, novelty, junk),
+    #return the name of a random one this game hasn't found, or None if none are left.
+    unfound = unfound_item_names(category, task_package["counters"]["found_items"])
     if not unfound:
         return None
-    return random.choice(unfound)
+    return game_rng(task_package).choice(unfound)
 
 
-def react_to_found_resource(resource_name, resources, droids, gamestate, shieldstate):
-    for res in resources:
-        if res["name"] == resource_name:
-            res["found"] = True
-            amount = res.get("amount")
-            break
+def mark_item_found(task_package, name):
+    # Record that this game has found the item (see ITEM_BITS). Everything exploring turns up is
+    # recorded, so found_items is also what the game has discovered.
+    task_package["counters"]["found_items"] |= ITEM_BITS[name]
+
+
+def react_to_found_resource(resource_name, resources, droids, gamestate, shieldstate, rng):
+    res = find_resource(resources, resource_name)
+    if res is not None:
+        res["found"] = True
+        amount = res.get("amount")
 
     if not gamestate["list"]: gamestate["list"] = True
 
@@ -134,9 +158,8 @@ def react_to_found_resource(resource_name, resources, droids, gamestate, shields
             total_weight = sum(base_weights.values())
 
             # Random variation factor (0.85–1.15 gives nice replayability)
-            import random
             variation = {
-                crop: random.uniform(0.85, 1.15)
+                crop: rng.uniform(0.85, 1.15)
                 for crop in base_weights
             }
 
@@ -164,7 +187,7 @@ def react_to_found_resource(resource_name, resources, droids, gamestate, shields
             gamestate["assign"] = True
 
     elif resource_name == "HydroponicsRoom":
-        resources = initialise_hydroponics_room(resources)
+        resources = initialise_hydroponics_room(resources, rng)
         if resource_is_discovered(resources, "WaterSource") and resource_is_discovered(resources, "SeedStash"):
             gamestate["plant"] = True
             gamestate["reap"] = True
@@ -199,75 +222,59 @@ def attempt_exploration(task_package, allow_chain_early=True):
     explore_count = task_package["counters"]["explore"]
     found_nothing_count = task_package["counters"]["found_nil"]
     day = turns_elapsed // 10
+    rng = game_rng(task_package)
 
     # Every call increments the explore counter
     explore_count += 1
     task_package["counters"]["explore"] = explore_count
 
+    # What is still to be found, from the compiled rules (see exploration.py)
+    stage = exploration_stage(task_package["counters"]["found_items"])
+
     # ---------------------------------------------------
     # 1) Scripted early finds: FoodStore and PowerSupply
     # ---------------------------------------------------
-    if not resource_is_discovered(current_resources, "FoodStore"):
+    if stage["scripted"]:
+        mark_item_found(task_package, stage["scripted"])
         found_nothing_count = 0
         task_package["counters"]["found_nil"] = found_nothing_count
-        return "FoodStore", task_package
-
-    if not resource_is_discovered(current_resources, "PowerSupply"):
-        found_nothing_count = 0
-        task_package["counters"]["found_nil"] = found_nothing_count
-        return "PowerSupply", task_package
+        return stage["scripted"], task_package
 
     # ---------------------------------------------------
     # 2) Day/turn-based GATING_RULES for essentials
     #    ("If day>1 and explore_count>10, make sure SeedStash exists", etc.)
+    #    Only the rules for items not yet discovered are in stage["gates"].
     # ---------------------------------------------------
-    for name, min_day, min_explores in GATING_RULES:
+    for name, min_day, min_explores in stage["gates"]:
         if day > min_day and explore_count > min_explores:
-            if not resource_is_discovered(current_resources, name):
-                # Force-discover this item
-                found_nothing_count = 0
-                task_package["counters"]["found_nil"] = found_nothing_count
-                return name, task_package
+            # Force-discover this item
+            mark_item_found(task_package, name)
+            found_nothing_count = 0
+            task_package["counters"]["found_nil"] = found_nothing_count
+            return name, task_package
 
     # ---------------------------------------------------
     # 3) Try soft discovery of major essentials
     # ---------------------------------------------------
-    
-    major_candidates = [
-        name for name in MAJOR_RESOURCES_ORDER
-        if not resource_is_discovered(current_resources, name)
-    ]
-
     found_resource = None
-    if major_candidates:
-
-        next_major_name = major_candidates[0]
-        next_major = ITEM_DB[next_major_name]   # ← turn name into dict
-
-        roll = random.random()
+    if stage["major"]:
+        roll = rng.random()
 
         # Classic spreadsheet logic: roll > prob = find
-        if roll > next_major.get("prob", 1.0):
-            found_resource = next_major
+        if roll > stage["prob"]:
+            found_resource = stage["major"]
 
     # ---------------------------------------------------
     # 4) Chain resources (CrystalCombination → DecodeKey → AncientDroidCode)
     #    - Only considered once ALL major essentials are found.
     # ---------------------------------------------------
-    if not found_resource and all_major_resources_found(current_resources):
-        chain_to_consider = None
-
-        if not resource_is_discovered(current_resources, "CrystalCombination"):
-            chain_to_consider = "CrystalCombination"
-        elif not resource_is_discovered(current_resources, "DecodeKey"):
-            chain_to_consider = "DecodeKey"
-        elif not resource_is_discovered(current_resources, "AncientDroidCode"):
-            chain_to_consider = "AncientDroidCode"
+    if not found_resource and not stage["major"]:
+        chain_to_consider = stage["chain"]
 
         if chain_to_consider and allow_chain_early:
-            chain_roll = random.random()
-            # 25% chance per explore attempt to get the next chain item
-            if chain_roll < 0.25:
+            chain_roll = rng.random()
+            # CHAIN_FIND_CHANCE per explore attempt to get the next chain item
+            if chain_roll < CHAIN_FIND_CHANCE:
                 found_resource = chain_to_consider
 
     # ---------------------------------------------------
@@ -278,6 +285,7 @@ def attempt_exploration(task_package, allow_chain_early=True):
             found_resource if isinstance(found_resource, str)
             else found_resource.get("name", "")
         )
+        mark_item_found(task_package, name_of_found_resource)
         found_nothing_count = 0
         return name_of_found_resource, task_package
 
@@ -286,20 +294,21 @@ def attempt_exploration(task_package, allow_chain_early=True):
     task_package["counters"]["found_nil"] = found_nothing_count
 
     # Streak-based gating
-    is_gate_streak = found_nothing_count in (3, 6, 9)
-    force_critical_by_streak = found_nothing_count >= 12
+    is_gate_streak = found_nothing_count in GATE_STREAKS
+    force_critical_by_streak = found_nothing_count >= FORCE_CRITICAL_STREAK
 
-    # If we've hit 12+ failed critical attempts, force next critical.
+    # If we've hit FORCE_CRITICAL_STREAK failed critical attempts, force next critical.
     if force_critical_by_streak:
         forced = force_next_critical(current_resources)
         if forced:
+            mark_item_found(task_package, forced)
             found_nothing_count = 0 # reset streak
             task_package["counters"]["found_nil"] = found_nothing_count
             return forced, task_package 
 
     # If ALL critical resources are found, we are in "post critical" mode:
     # exploring is pure lore / flavour.
-    in_post_critical_mode = all_critical_resources_found(current_resources)
+    in_post_critical_mode = stage["post_critical"]
 
     # Choose the rarity table
     if in_post_critical_mode:
@@ -316,34 +325,31 @@ def attempt_exploration(task_package, allow_chain_early=True):
 
     # 7a) Replacement items
     replacement_chance = rarity.get("replacement", 0.0)
-    replacement_item = _pick_unfound_item(REPLACEMENT)
-    if replacement_item and random.random() < replacement_chance:
-        replacement_item["found"] = True
-        replacement_name = replacement_item["name"]
+    replacement_name = _pick_unfound_item(task_package, "replacement")
+    if replacement_name and rng.random() < replacement_chance:
+        mark_item_found(task_package, replacement_name)
         found_nothing_count = 0
         task_package["counters"]["found_nil"] = found_nothing_count
         return replacement_name, task_package
 
     # 7b) Novelty / Junk
     novelty_chance = rarity.get("novelty", 0.0)
-    novelty_item = _pick_unfound_item(NOVELTY)
+    novelty_item_name = _pick_unfound_item(task_package, "novelty")
 
     # At gates (3/6/9) we guarantee *something* non-critical:
     #  - Try novelty first with elevated chance
     #  - If that fails (or none left), fall through to junk.
     if is_gate_streak:
-        if novelty_item and random.random() < novelty_chance:
-            novelty_item["found"] = True
-            novelty_item_name = novelty_item["name"]
+        if novelty_item_name and rng.random() < novelty_chance:
+            mark_item_found(task_package, novelty_item_name)
             found_nothing_count = 0
             task_package["counters"]["found_nil"] = found_nothing_count
             return novelty_item_name, task_package
 
         # If we didn't get novelty, give junk (if any) as a consolation prize.
-        junk_item = _pick_unfound_item(JUNK)
-        if junk_item:
-            junk_item["found"] = True
-            junk_item_name = junk_item["name"]
+        junk_item_name = _pick_unfound_item(task_package, "junk")
+        if junk_item_name:
+            mark_item_found(task_package, junk_item_name)
             found_nothing_count = 0
             task_package["counters"]["found_nil"] = found_nothing_count
             return junk_item_name, task_package
@@ -352,18 +358,16 @@ def attempt_exploration(task_package, allow_chain_early=True):
         return None, task_package
 
     # Non-gate normal exploration:
-    if novelty_item and random.random() < novelty_chance:
-        novelty_item["found"] = True
-        novelty_item_name = novelty_item["name"]
+    if novelty_item_name and rng.random() < novelty_chance:
+        mark_item_found(task_package, novelty_item_name)
         found_nothing_count = 0
         task_package["counters"]["found_nil"] = found_nothing_count
         return novelty_item_name, task_package
 
     # Small chance to get junk even on non-gate runs to keep things spicy
-    junk_item = _pick_unfound_item(JUNK)
-    if junk_item and random.random() < 0.05:
-        junk_item["found"] = True
-        junk_item_name = junk_item["name"]
+    junk_item_name = _pick_unfound_item(task_package, "junk")
+    if junk_item_name and rng.random() < JUNK_FIND_CHANCE:
+        mark_item_found(task_package, junk_item_name)
         return junk_item_name, task_package
 
     # ---------------------------------------------------
@@ -374,7 +378,7 @@ def attempt_exploration(task_package, allow_chain_early=True):
 
 def charge_droid(droid_name, droids, resources, turns_elapsed):
     user_message = ""
-    power_resource = next((r for r in resources if r.get("name") == "PowerSupply"), None)
+    power_resource = find_resource(resources, "PowerSupply")
 
     if not power_resource or not power_resource.get("found", False):
         user_message = get_message("charge", "nowhere_to_charge", droid_name=droid_name)
@@ -419,10 +423,8 @@ def decrease_droid_charge(task_package):
     tasks = task_package["tasks"]
     turns_elapsed = task_package["counters"]["turns"]
         
-    for i in range(NUM_DROIDS):
-        droid_name = list(droids.keys())[i]
-        droid_stats = droids[droid_name]
-        if droid_stats["charge"] > 0 and droid_stats["item"] != "CloakingShield":
+    for droid_name, droid_stats in droids.items():
+        if drains_charge(droid_stats):
             droid_stats["charge"] = max(0, droid_stats["charge"] - IDLE_CHARGE_USAGE)
 
         # Warn if the charge drops below a certain level, but only warn once or twice at most (future proof for power usage)
@@ -457,10 +459,12 @@ def interrupt_task_if_no_power(name, task_package):
         if task["type"] == TASK_ASSIGNED or task["type"] == TASK_EXAMINING:
             item_name = task.get("item_name", "")
         elif task["type"] == TASK_PLANTING:
-            hydro = next((r for r in resources if r["name"] == "HydroponicsRoom"), None)
+            hydro = find_resource(resources, "HydroponicsRoom")
             # Free the beds
             for b in hydro["beds"]:
-                if b["reserved_by"] == name:
+                # Only the beds still waiting on this planting (planted beds keep their planter)
+                if b["reserved"] and b.get("reserved_by") == name:
+                    b["reserved"] = False
                     b["occupied"] = False
                     b["crop_id"] = None
                     b["name"] = ""
@@ -0,0 +1,187 @@
+# serializers.py
+
+import json
+import marshal
+import time
+
+from items import ITEM_DB
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+# The item templates (read-only). Compact saves only store where a discovered item differs from these.
+BASE_ITEMS = ITEM_DB
+
+EMPTY_QUEUE_SLOT = {"task": "", "item": ""}
+QUEUE_SLOTS = ("1", "2", "3")
+
+COMPACT_MAGIC = b"OUTPOST-M1\n"
+MSGPACK_MAGIC = b"OUTPOST-P1\n"
+
+# Each format's snapshots have their own extension, so a binary save never sits in a .json file.
+# msgpack is listed even when it isn't installed, so its saves are found (and reported) rather than passed over.
+SNAPSHOT_EXTENSIONS = {"json": ".json", "msgpack": ".msgpack", "compact": ".marshal"}
+
+
+def pack_queue(queue):
+    # The three-slot queue dict becomes a list, with None for an empty slot
+    if set(queue) != set(QUEUE_SLOTS):
+        return queue
+    return [None if queue[slot] == EMPTY_QUEUE_SLOT else queue[slot] for slot in QUEUE_SLOTS]
+
+
+def unpack_queue(queue):
+    if not isinstance(queue, list):
+        return queue
+    return {slot: dict(EMPTY_QUEUE_SLOT) if entry is None else entry for slot, entry in zip(QUEUE_SLOTS, queue)}
+
+
+def pack_resource(resource):
+    # A discovered item becomes [name, changed fields, removed fields] against its template.
+    # Anything without a template is kept whole.
+    base = BASE_ITEMS.get(resource.get("name"))
+    if base is None:
+        return resource
+
+    changed = {key: value for key, value in resource.items() if key not in base or base[key] != value}
+    removed = [key for key in base if key not in resource]
+    return [resource["name"], changed, removed]
+
+
+def unpack_resource(entry):
+    if not isinstance(entry, list):
+        return entry
+
+    name, changed, removed = entry
+    resource = dict(BASE_ITEMS[name])
+    for key in removed:
+        del resource[key]
+    resource.update(changed)
+    return resource
+
+
+def pack_state(data):
+    # Shrink the saved sections down to what is particular to this game
+    packed = dict(data)
+    for section in ("humans", "droids"):
+        if section in data:
+            packed[section] = {
+                name: dict(character, queue=pack_queue(character["queue"])) if "queue" in character else character
+                for name, character in data[section].items()
+            }
+    if "resources" in data:
+        packed["resources"] = [pack_resource(resource) for resource in data["resources"]]
+    return packed
+
+
+def unpack_state(packed):
+    data = dict(packed)
+    for section in ("humans", "droids"):
+        if section in packed:
+            for character in packed[section].values():
+                if "queue" in character:
+                    character["queue"] = unpack_queue(character["queue"])
+    if "resources" in packed:
+        data["resources"] = [unpack_resource(entry) for entry in packed["resources"]]
+    return data
+
+
+def encode_json(data):
+    # The original, readable layout. Also used for exports.
+    return json.dumps(data, indent=4).encode("utf-8")
+
+
+def decode_json(raw):
+    return json.loads(raw.decode("utf-8"))
+
+
+# marshal is quick and small, but Python only promises to read what the same version wrote
+def encode_compact(data):
+    return COMPACT_MAGIC + marshal.dumps(pack_state(data))
+
+
+def decode_compact(raw):
+    try:
+        return unpack_state(marshal.loads(raw[len(COMPACT_MAGIC):]))
+    except (EOFError, TypeError) as e:
+        raise ValueError(f"Corrupt compact save: {e}")
+
+
+# msgpack ints stop at 64 bits, and found_items has a bit for every item, so it goes as hex
+def encode_msgpack(data):
+    packed = pack_state(data)
+    if "found_items" in packed.get("counters", {}):
+        packed["counters"] = dict(packed["counters"], found_items=format(packed["counters"]["found_items"], "x"))
+    return MSGPACK_MAGIC + msgpack.packb(packed)
+
+
+def decode_msgpack(raw):
+    try:
+        data = unpack_state(msgpack.unpackb(raw[len(MSGPACK_MAGIC):]))
+    except msgpack.exceptions.UnpackException as e:
+        raise ValueError(f"Corrupt msgpack save: {e}")
+    if isinstance(data.get("counters", {}).get("found_items"), str):
+        data["counters"]["found_items"] = int(data["counters"]["found_items"], 16)
+    return data
+
+
+SERIALIZERS = {
+    "json": {"magic": b"", "encode": encode_json, "decode": decode_json},
+    "compact": {"magic": COMPACT_MAGIC, "encode": encode_compact, "decode": decode_compact},
+}
+
+if msgpack is not None:
+    SERIALIZERS["msgpack"] = {"magic": MSGPACK_MAGIC, "encode": encode_msgpack, "decode": decode_msgpack}
+
+
+def encode_state(data, fmt):
+    if fmt not in SERIALIZERS:
+        raise ValueError(f"Unknown save format '{fmt}'. Available: {', '.join(SERIALIZERS)}")
+    return SERIALIZERS[fmt]["encode"](data)
+
+
+def decode_state(raw):
+    # Work out the format from the header, so any save can be read whatever SAVE_FORMAT is now.
+    # Raises ValueError if the bytes can't be decoded.
+    for fmt, serializer in SERIALIZERS.items():
+        if serializer["magic"] and raw.startswith(serializer["magic"]):
+            return serializer["decode"](raw)
+
+    if raw[:len(MSGPACK_MAGIC)] == MSGPACK_MAGIC:
+        raise ValueError("This save needs msgpack, which isn't installed")
+
+    return decode_json(raw)
+
+
+def benchmark_serializers(data, repeat=20):
+    # Size and average encode/decode time (ms) of data in each available format
+    report = {}
+    for fmt, serializer in SERIALIZERS.items():
+        start = time.perf_counter()
+        for _ in range(repeat):
+            raw = serializer["encode"](data)
+        encode_ms = (time.perf_counter() - start) * 1000 / repeat
+
+        start = time.perf_counter()
+        for _ in range(repeat):
+            serializer["decode"](raw)
+        decode_ms = (time.perf_counter() - start) * 1000 / repeat
+
+        report[fmt] = {"size": len(raw), "encode_ms": encode_ms, "decode_ms": decode_ms}
+
+    return report
+
+
+if __name__ == "__main__":
+    # Compare the formats on the current save
+    from persistence import read_saved_data
+
+    data = read_saved_data()
+    if data is None:
+        print("No saved game to measure.")
+    else:
+        print(f"{'format':<10}{'bytes':>10}{'encode ms':>12}{'decode ms':>12}")
+        for fmt, result in benchmark_serializers(data).items():
+            print(f"{fmt:<10}{result['size']:>10}{result['encode_ms']:>12.3f}{result['decode_ms']:>12.3f}")
@@ -1,11 +1,14 @@
 # status.py
 
+from command_utils import find_resource, find_tasks, get_task_by_worker, task_turns_remaining
 from constants import (ENDGAME_REASONS, FULL_CHARGE, HUNGER, NUM_HUMANS, NUM_DROIDS, LOW_CHARGE_FLAG, IDLE_CHARGE_USAGE, COMMAND_MAP,
                       TASK_ASSIGNED, TASK_EXAMINING, TASK_EATING, TASK_CHARGING, TASK_REAPING, TASK_PLANTING, ONE_DAY_HUNGRY)
 import lore.user_interface as ui_runtime
 from lore.user_interface import (log_and_display, get_input, msg_food, msg_power, msg_info, msg_plant,
                                  msg_error, msg_info, msg_crystal, msg_resource, msg_shield, DOMAIN_EMOJI)
+from exploration import CRITICAL_ORDER, forecast_discoveries
 from lore.lore_ingame import get_message
+from tracking import TaskPackage
 
 def count_resource_by_category(resources, category1=0, category2=0):
     sub_list = []
@@ -20,27 +23,96 @@ def count_resource_by_category(resources, category1=0, category2=0):
     return sub_list, count
 
 
+# Numbers for the top bar of the GUI
+def get_top_bar_data(task_package):
+    counters = task_package.get("counters", {})
+    resources = task_package.get("resources", [])
+
+    turn = counters.get("turns", 0)
+    day = turn // 10
+
+    power = 0
+    food = 0
+    seeds = 0
+    crystals = 0
+
+    r = find_resource(resources, "PowerSupply")
+    if r is not None:
+        power = r.get("amount", 0)
+        crystal_store = r.get("CrystalStore", {})
+        crystals = (
+            crystal_store.get("red", 0)
+            + crystal_store.get("indigo", 0)
+            + crystal_store.get("gold", 0)
+        )
+
+    r = find_resource(resources, "FoodStore")
+    if r is not None:
+        food = (
+            r.get("rationPack", 0)
+            + r.get("apple", 0)
+            + r.get("cabbage", 0)
+            + r.get("potato", 0)
+            + r.get("soup", 0)
+            + r.get("smoothie", 0)
+            + r.get("stirFry", 0)
+        )
+
+    r = find_resource(resources, "SeedStash")
+    if r is not None:
+        seeds = (
+            r.get("apple", 0)
+            + r.get("cabbage", 0)
+            + r.get("potato", 0)
+        )
+
+    return {
+        "day": day,
+        "turn": turn,
+        "power": power,
+        "food": food,
+        "seeds": seeds,
+        "crystals": crystals,
+    }
+
+
 # Text for the Outpost state panel of the GUI
+# The last text drawn for each panel, and the package it was drawn from
+_panel_cache = {"package": None, "panels": {}}
+
+
 def get_state_panel_text(task_package):
-    return (
-        get_humans_panel_text(task_package)
-        + "\n\n"
-        + get_droids_panel_text(task_package)
-        + "\n\n"
-        + get_resources_panel_text(task_package)
-        + "\n\n"
-        + get_crops_panel_text(task_package)
-        + "\n\n"
-        + get_shield_panel_text(task_package)
+    # Each panel, and the task_package sections it is drawn from.
+    # Only panels whose sections have changed since the last refresh are re-rendered.
+    state_panels = (
+        ("humans", get_humans_panel_text, ("humans", "droids", "tasks", "counters")),
+        ("droids", get_droids_panel_text, ("humans", "droids", "tasks", "counters")),
+        ("resources", get_resources_panel_text, ("resources", "gamestate")),
+        ("crops", get_crops_panel_text, ("crops", "gamestate")),
+        ("shield", get_shield_panel_text, ("resources", "shieldstate")),
     )
 
+    dirty = None
+    if isinstance(task_package, TaskPackage):
+        dirty = task_package.take_dirty("screen")
+        if _panel_cache["package"] is not task_package:
+            dirty = None
+
+    panels = _panel_cache["panels"]
+    for name, render, sections in state_panels:
+        if dirty is None or name not in panels or any(section in dirty for section in sections):
+            panels[name] = render(task_package)
+    _panel_cache["package"] = task_package
+
+    return "\n\n".join(panels[name] for name, _, _ in state_panels)
+
 # GUI function for humans
 def get_humans_panel_text(task_package):
-    humans = task_package.get("humans", {})
+    humans = task_package["humans"]
     lines = ["HUMANS"]
     for name, h in humans.items():
-        state = h.get("state", "Unknown")
-        hunger = int(h.get("hunger", 0)/(ONE_DAY_HUNGRY/10))
+        state = h["state"]
+        hunger = int(h["hunger"]/(ONE_DAY_HUNGRY/10))
         task_and_queue = get_character_task_and_queue(name, task_package)
         lines.append(f"{name:<7} | Hunger: {hunger} ({state}) | {task_and_queue}")
     return "\n".join(lines)
@@ -48,10 +120,10 @@ def get_humans_panel_text(task_package):
 
 # GUI function for droids
 def get_droids_panel_text(task_package):
-    droids = task_package.get("droids", {})
+    droids = task_package["droids"]
     lines = ["DROIDS"]
     for name, d in droids.items():
-        charge = int(d.get("charge", 0)//(FULL_CHARGE/100))
+        charge = int(d["charge"]//(FULL_CHARGE/100))
         task_and_queue = get_character_task_and_queue(name, task_package)
         lines.append(f"{name:<7} | Charge: {charge}% | {task_and_queue}")
     return "\n".join(lines)
@@ -66,8 +138,9 @@ def get_character_task_and_queue(name, task_package):
     if name in humans or name in droids:
         task = get_task_data(tasks, name)
         if task:
-            plural = "s" if task["duration"] != 1 else ""
-            turns_to_complete = f"({task["duration"]} turn{plural})"
+            turns_left = task_turns_remaining(task, task_package["counters"]["turns"])
+            plural = "s" if turns_left != 1 else ""
+            turns_to_complete = f"({turns_left} turn{plural})"
         else:
             turns_to_complete = ""
 
@@ -108,21 +181,19 @@ def get_character_task_and_queue(name, task_package):
 
 
 def get_task_data(tasks, name):
-    # Returns (task_id, task_data) for the active task assigned to worker_name, or (None, None) if not found.
-    for tid, task in tasks.items():
-        if task.get("name") == name:
-            return task
-    return None
+    # Returns the task data for the active task assigned to name, or None if not found.
+    task_id, task = get_task_by_worker(tasks, name)
+    return task
 
 
 # GUI function for crops
 def get_crops_panel_text(task_package):
-    crops = task_package.get("crops", {})
-    gamestate = task_package.get("gamestate", {})
+    crops = task_package["crops"]
+    gamestate = task_package["gamestate"]
     lines = ["CROPS"]
 
     if gamestate:
-        if gamestate.get("plant", False):
+        if gamestate["plant"]:
             planting_enabled = "*Planting is enabled*"
         else:
             planting_enabled = "(cannot plant yet)"
@@ -133,16 +204,16 @@ def get_crops_panel_text(task_package):
         lines.append("No crops growing  " + planting_enabled)
     else:
         for _, crop in crops.items():
-            crop_type = crop.get("crop_type", "Unknown").capitalize()
-            worker = crop.get("worker", "Unknown")
-            turns_remaining = crop.get("turns_remaining", 0)
+            crop_type = crop["crop_type"].capitalize()
+            worker = crop["worker"]
+            turns_remaining = crop["turns_remaining"]
             lines.append(f"{crop_type:<7} | {worker:<7} | {turns_remaining} turns")
     return "\n".join(lines)
 
 
 def get_resources_panel_text(task_package):
-    resources = task_package.get("resources", [])
-    gamestate = task_package.get("gamestate", {})
+    resources = task_package["resources"]
+    gamestate = task_package["gamestate"]
     lines = ["RESOURCES"]
     
     # Resource Summary
@@ -158,7 +229,7 @@ def get_resources_panel_text(task_package):
         lines.append(f"Sustainment:   Power - {power}\tFood - {food}\tSeeds - {seeds}")
 
     if gamestate:
-        if gamestate.get("mine", False):
+        if gamestate["mine"]:
             mining_enabled = "*Mining is enabled*"
         else:
             mining_enabled = "(Mining: cannot mine yet)"
@@ -178,10 +249,10 @@ def get_resources_panel_text(task_package):
         junk, num_junk = count_resource_by_category(resources, category1="junk")
 
         lines.append(f"Resources:     Important {num_important}, Useful {num_useful}, Junk {num_junk}")
-        crystal_processor = next((r for r in resources if r.get("name") == "CrystalProcessor"), None)
-        meal_maker = next((r for r in resources if r.get("name") == "MealMaker"), None)
-        old_terminal = next((r for r in resources if r.get("name") == "OldTerminal"), None)
-        cloaking_shield = next((r for r in resources if r.get("name") == "CloakingShield"), None)
+        crystal_processor = find_resource(resources, "CrystalProcessor")
+        meal_maker = find_resource(resources, "MealMaker")
+        old_terminal = find_resource(resources, "OldTerminal")
+        cloaking_shield = find_resource(resources, "CloakingShield")
 
         assignables = []
         if crystal_processor:
@@ -200,32 +271,35 @@ def get_resources_panel_text(task_package):
 
 
 def get_resource_amount(name, resources):
-    for res in resources:
-        if res.get("name") == "FoodStore" and res.get("found") and name == "FoodStore" :
-            total_food = res.get("rationPack") + res.get("apple") + res.get("cabbage") + res.get("potato") +\
-                            res.get("soup") + res.get("smoothie") + res.get("stirFry")
-            return total_food
-        elif res.get("name") == "SeedStash" and name == "SeedStash" and res.get("found"):
-            seeds_amount = res.get("apple") + res.get("cabbage") + res.get("potato")
-            return seeds_amount
-        elif res.get("name") == "PowerSupply" and res.get("found") and name == "PowerSupply":
-            power_amount = res.get("amount")
-            return power_amount
-        elif res.get("name") == "PowerSupply" and res.get("found") and name == "CrystalStore":
-            crystal_store = res.get("CrystalStore", "")
-            total_crystals = 0
-            if crystal_store:
-                total_crystals = crystal_store["red"] + crystal_store["indigo"] + crystal_store["gold"]
-            return total_crystals
-        elif res.get("name") == "PowerSupply" and res.get("found") and name == "VialStore":
-            vial_store = res.get("VialStore", "")
-            total_vials = 0
-            if vial_store:
-                total_vials = vial_store["red"] + vial_store["indigo"] + vial_store["gold"]
-            return total_vials
-        elif res.get("name") == name and res.get("found"):
-            return res.get("amount", "None")
-    return 0
+    # The crystal and vial stores are part of the PowerSupply
+    holder = "PowerSupply" if name in ("CrystalStore", "VialStore") else name
+    res = find_resource(resources, holder, found=True)
+    if res is None:
+        return 0
+
+    if name == "FoodStore":
+        total_food = res.get("rationPack") + res.get("apple") + res.get("cabbage") + res.get("potato") +\
+                        res.get("soup") + res.get("smoothie") + res.get("stirFry")
+        return total_food
+    elif name == "SeedStash":
+        seeds_amount = res.get("apple") + res.get("cabbage") + res.get("potato")
+        return seeds_amount
+    elif name == "PowerSupply":
+        power_amount = res.get("amount")
+        return power_amount
+    elif name == "CrystalStore":
+        crystal_store = res.get("CrystalStore", "")
+        total_crystals = 0
+        if crystal_store:
+            total_crystals = crystal_store["red"] + crystal_store["indigo"] + crystal_store["gold"]
+        return total_crystals
+    elif name == "VialStore":
+        vial_store = res.get("VialStore", "")
+        total_vials = 0
+        if vial_store:
+            total_vials = vial_store["red"] + vial_store["indigo"] + vial_store["gold"]
+        return total_vials
+    return res.get("amount", "None")
 
 
 def get_discovered_resources(resources):
@@ -237,21 +311,21 @@ def get_discovered_resources(resources):
 
     
 def get_shield_panel_text(task_package):
-    resources = task_package.get("resources", [])
-    shieldstate = task_package.get("shieldstate", {})
+    resources = task_package["resources"]
+    shieldstate = task_package["shieldstate"]
     lines = ["SHIELD"]
 
-    cloaking_shield = next((r for r in resources if r.get("name") == "CloakingShield" and r.get("found")), None)
-    shield_manual = next((r for r in resources if r.get("name") == "ShieldManual" and r.get("found")), None)
-    decode_key = next((r for r in resources if r.get("name") == "DecodeKey" and r.get("found")), None)
-    crystal_combination = next((r for r in resources if r.get("name") == "CrystalCombination" and r.get("found")), None)
-    droid_code = next((r for r in resources if r.get("name") == "AncientDroidCode" and r.get("found")), None)
+    cloaking_shield = find_resource(resources, "CloakingShield", found=True)
+    shield_manual = find_resource(resources, "ShieldManual", found=True)
+    decode_key = find_resource(resources, "DecodeKey", found=True)
+    crystal_combination = find_resource(resources, "CrystalCombination", found=True)
+    droid_code = find_resource(resources, "AncientDroidCode", found=True)
 
     # Hide shield panel entirely until the shield itself is found
     if not cloaking_shield:
         return ""
 
-    shield_status = "Active" if shieldstate.get("shield_active", False) else "Inactive"
+    shield_status = "Active" if shieldstate["shield_active"] else "Inactive"
     lines.append(f"Status: {shield_status}")
 
     items = ["CloakingShield"]
@@ -307,6 +381,43 @@ def handle_list_command(qualifier, task_package):
     return None
 
 
+def handle_forecast_command(qualifier, task_package):
+    # How long until each essential and chain item still to find turns up, going by the exploration
+    # rules and how fast this game has been exploring (see exploration.forecast_discoveries)
+    turns_elapsed = task_package["counters"]["turns"]
+    forecast = forecast_discoveries(task_package)
+
+    names = list(forecast)
+    if qualifier:
+        name = next((name for name in CRITICAL_ORDER if name.lower() == qualifier.lower()), None)
+        if name is None:
+            msg_error(get_message("forecast", "unknown", name=qualifier, names=", ".join(names) or "none"), turns_elapsed)
+            return None
+        if name not in forecast:
+            msg_resource(get_message("forecast", "already_found", name=name), turns_elapsed)
+            return None
+        names = [name]
+
+    if not names:
+        msg_resource(get_message("forecast", "all_found"), turns_elapsed)
+        return None
+
+    msg_resource(get_message("forecast", "header"), turns_elapsed)
+    for name in names:
+        odds = forecast[name]
+        if odds["explores"] is None:
+            log_and_display(f" {name}:".ljust(30) + get_message("forecast", "not_soon"), turns_elapsed)
+            continue
+
+        turn = turns_elapsed + round(odds["turns"])
+        message = get_message("forecast", "item", explores=round(odds["explores"]), turns=round(odds["turns"]), day=turn // 10)
+        if odds["chance"] < 0.95:
+            message += get_message("forecast", "chance", percent=round(100 * odds["chance"]))
+        log_and_display(f" {name}:".ljust(30) + message, turns_elapsed)
+
+    return None
+
+
 def resume_list_command(answer, context):
     task_package = context["task_package"]
     turns_elapsed = task_package["counters"]["turns"]
@@ -337,7 +448,7 @@ def list_food(task_package):
     turns_elapsed = task_package["counters"]["turns"]
 
     # --- FOOD STORE ---
-    food_store = next((r for r in resources if r.get("name") == "FoodStore"), None)
+    food_store = find_resource(resources, "FoodStore")
     if not food_store:
         msg_food(" FOOD STATUS:", turns_elapsed)
         msg_food("  No FoodStore found.", turns_elapsed)
@@ -408,7 +519,7 @@ def list_food(task_package):
     log_and_display("", turns_elapsed, stamp=None)
     msg_plant(" SEEDS:", turns_elapsed)
 
-    seeds = next((r for r in resources if r.get("name") == "SeedStash"), None)
+    seeds = find_resource(resources, "SeedStash")
     if seeds:
         msg_plant(
             f"  Apple: {seeds.get('apple', 0)} | "
@@ -430,12 +541,11 @@ def list_food(task_package):
         msg_plant(f"  No mature crops", turns_elapsed)
     else:
         msg_plant(f"  *Mature crops = {mature_count}*", turns_elapsed)
-        for tid, task in tasks.items():
-            if task["type"] == TASK_REAPING:
-                msg_plant(f"Crops being reaped by: {task["name"]}", turns_elapsed)
+        for tid, task in find_tasks(tasks, "type", TASK_REAPING):
+            msg_plant(f"Crops being reaped by: {task["name"]}", turns_elapsed)
 
     # --- HYDROPONICS STATUS ---
-    hydro = next((r for r in resources if r.get("name") == "HydroponicsRoom"), None)
+    hydro = find_resource(resources, "HydroponicsRoom")
     if hydro:
         beds = hydro.get("beds", [])
         free = sum(1 for b in beds if not b["occupied"] and not b["reserved"])
@@ -447,7 +557,7 @@ def list_food(task_package):
         msg_plant(f"  Beds — Free: {free}, Reserved: {reserved}, In Use: {occupied}", turns_elapsed)
 
     # --- MEAL PREPARATION ---
-    meal_maker = next((r for r in resources if r.get("name") == "MealMaker"), None)
+    meal_maker = find_resource(resources, "MealMaker")
 
     log_and_display("", turns_elapsed, stamp=None)
     msg_food(" FOOD PREPARATION:", turns_elapsed)
@@ -477,7 +587,7 @@ def list_power(task_package):
     FULL = FULL_CHARGE  # from constants.py
 
     # --- Power Supply ---
-    power = next((r for r in resources if r["name"] == "PowerSupply"), None)
+    power = find_resource(resources, "PowerSupply")
     if not power:
         msg_power(get_message("error", "power_not_found"), turns_elapsed)
         return
@@ -535,8 +645,8 @@ def list_power(task_package):
         msg_crystal("  No vials in storage.", turns_elapsed)
 
     # --- Crystal Processing ---
-    processor = next((r for r in resources if r["name"] == "CrystalProcessor"), None)
-    mortar = next((r for r in resources if r["name"] == "CrystalMortarAndPestle"), None)
+    processor = find_resource(resources, "CrystalProcessor")
+    mortar = find_resource(resources, "CrystalMortarAndPestle")
 
     msg_crystal("\nCRYSTAL PROCESSING:", turns_elapsed)
 
@@ -547,10 +657,9 @@ def list_power(task_package):
     else:
         msg_crystal("  No processing equipment available.", turns_elapsed)
     cp_assigned = ""
-    for tid, task in tasks.items():
+    for tid, task in find_tasks(tasks, "item_name", "CrystalProcessor"):
         if task["type"] == TASK_ASSIGNED:
-            if task["item_name"] == "CrystalProcessor":
-                cp_assigned = task["name"]
+            cp_assigned = task["name"]
     if cp_assigned != "":
         msg_crystal(f"  Assigned to the Crystal Processor:  {cp_assigned}")
 
@@ -618,7 +727,7 @@ def list_crystals(task_package):
     FULL = FULL_CHARGE  # from constants.py
 
     # --- Power Supply ---
-    power = next((r for r in resources if r["name"] == "PowerSupply"), None)
+    power = find_resource(resources, "PowerSupply")
     if not power:
         msg_power(get_message("error", "power_not_found"), turns_elapsed)
         return
@@ -656,7 +765,7 @@ def list_crystals(task_package):
         msg_crystal(f"   Red: {crystals["processed"]["red"]}  Indigo: {crystals["processed"]["indigo"]}  Gold: {crystals["processed"]["gold"]}", turns_elapsed)
 
     # --- Crystal combination - if found ---
-    crystal_combination = next((r for r in resources if r.get("name") == "CrystalCombination"), None)
+    crystal_combination = find_resource(resources, "CrystalCombination")
     red = indigo = gold = 0
     if crystal_combination: 
         red = crystal_combination["red"]
@@ -760,34 +869,6 @@ def print_status(task_package):
     day = turns_elapsed // 10
     turn = turns_elapsed
 
-    def get_resource_amount(name, resources):
-        for res in resources:
-            if res.get("name") == "FoodStore" and res.get("found") and name == "FoodStore" :
-                total_food = res.get("rationPack") + res.get("apple") + res.get("cabbage") + res.get("potato") +\
-                             res.get("soup") + res.get("smoothie") + res.get("stirFry")
-                return total_food
-            elif res.get("name") == "SeedStash" and name == "SeedStash" and res.get("found"):
-                seeds_amount = res.get("apple") + res.get("cabbage") + res.get("potato")
-                return seeds_amount
-            elif res.get("name") == "PowerSupply" and res.get("found") and name == "PowerSupply":
-                power_amount = res.get("amount")
-                return power_amount
-            elif res.get("name") == "PowerSupply" and res.get("found") and name == "CrystalStore":
-                crystal_store = res.get("CrystalStore", "")
-                total_crystals = 0
-                if crystal_store:
-                    total_crystals = crystal_store["red"] + crystal_store["indigo"] + crystal_store["gold"]
-                return total_crystals
-            elif res.get("name") == "PowerSupply" and res.get("found") and name == "VialStore":
-                vial_store = res.get("VialStore", "")
-                total_vials = 0
-                if vial_store:
-                    total_vials = vial_store["red"] + vial_store["indigo"] + vial_store["gold"]
-                return total_vials
-            elif res.get("name") == name and res.get("found"):
-                return res.get("amount", "None")
-        return 0
-
     def format_human_status(stats, task_name=None):
         state = stats.get("state", "Okay")
         hunger = stats.get("hunger", 0)
@@ -810,13 +891,6 @@ def print_status(task_package):
         task_str = f"{task_name}" if task_name else "--Idle--"
         return f"{state} - Charge: {charge}%  ".ljust(14) + task_str
 
-    def get_task_data(tasks, worker_name):
-        # Returns (task_id, task_data) for the active task assigned to worker_name, or (None, None) if not found.
-        for tid, task in tasks.items():
-            if task.get("name") == worker_name:
-                return task
-        return None
-
     # Header
     print("-" * 85)
     print(f"Aynsefian Outpost Status  (Day {day+1}, Turn {turn})\n")
@@ -829,8 +903,9 @@ def print_status(task_package):
         human_name = list(humans.keys())[i]
         task = get_task_data(tasks, human_name)
         if task:
-            plural = "s." if task["duration"] != 1 else "."
-            more_turns = f" for {task["duration"]} more turn{plural}"
+            turns_left = task_turns_remaining(task, turns_elapsed)
+            plural = "s." if turns_left != 1 else "."
+            more_turns = f" for {turns_left} more turn{plural}"
         else:
             more_turns = ""
 
@@ -858,8 +933,9 @@ def print_status(task_package):
         droid_name = list(droids.keys())[i]
         task = get_task_data(tasks, droid_name)
         if task:
-            plural = "s." if task["duration"] != 1 else "."
-            more_turns = f" for {task["duration"]} more turn{plural}"
+            turns_left = task_turns_remaining(task, turns_elapsed)
+            plural = "s." if turns_left != 1 else "."
+            more_turns = f" for {turns_left} more turn{plural}"
         else:
             more_turns = ""
 
@@ -923,22 +999,22 @@ def print_status(task_package):
         print(f"Resources:     Important - {num_important}\tUseful - {num_useful}\tJunk - {num_junk}")
 
         assignable_string = "-- nothing assignable yet --"
-        crystal_processor = next((r for r in resources if r.get("name") == "CrystalProcessor"), None)
+        crystal_processor = find_resource(resources, "CrystalProcessor")
         if crystal_processor:
             assignable_string = "CrystalProcessor"
-        meal_maker = next((r for r in resources if r.get("name") == "MealMaker"), None)
+        meal_maker = find_resource(resources, "MealMaker")
         if meal_maker:
             if not crystal_processor:
                 assignable_string = "MealMaker"
             else:
                 assignable_string += ", MealMaker"
-        old_terminal = next((r for r in resources if r.get("name") == "OldTerminal"), None)
+        old_terminal = find_resource(resources, "OldTerminal")
         if old_terminal:
             if not (crystal_processor and meal_maker):
                 assignable_string = "OldTerminal"
             else:
                 assignable_string += ", OldTerminal"
-        cloaking_shield = next((r for r in resources if r.get("name") == "CloakingShield"), None)
+        cloaking_shield = find_resource(resources, "CloakingShield")
         if cloaking_shield:
             if not (crystal_processor and meal_maker and old_terminal):
                 assignable_string = "CloakingShield"
@@ -962,19 +1038,19 @@ def print_status(task_package):
     shield_manual = decode_key = crystal_combination = droid_code = None
 
     if discovered:  
-        cloaking_shield = next((r for r in resources if r.get("name") == "CloakingShield"), None)
+        cloaking_shield = find_resource(resources, "CloakingShield")
         if cloaking_shield: shield_located = "* Shield Found *"
 
-        shield_manual = next((r for r in resources if r.get("name") == "ShieldManual"), None)
+        shield_manual = find_resource(resources, "ShieldManual")
         if shield_manual: 
             manual_status = "On the main desk in the outpost"
 
-        decode_key = next((r for r in resources if r.get("name") == "DecodeKey"), None)
+        decode_key = find_resource(resources, "DecodeKey")
         if decode_key: decode_status = "Usable by the droids"
         if shield_manual:
             if shield_manual["decoded"] and decode_key: manual_status = "-- Decoded and usable --"
 
-        crystal_combination = next((r for r in resources if r.get("name") == "CrystalCombination"), None)
+        crystal_combination = find_resource(resources, "CrystalCombination")
         red = indigo = gold = 0
         combi_text = ""
         if crystal_combination: 
@@ -984,7 +1060,7 @@ def print_status(task_package):
             gold = crystal_combination["gold"]
             combi_text = f"- Red: {red}  Indigo: {indigo}  Gold: {gold}"
 
-        droid_code = next((r for r in resources if r.get("name") == "AncientDroidCode"), None)
+        droid_code = find_resource(resources, "AncientDroidCode")
         if droid_code: 
             droidcode_status = "Found: "
             ancient_droid_name = droid_code["droidName"]
@@ -1,12 +1,12 @@
 # tasks.py
 
-import random
 
 from actions import start_next_queued_task_for_character
 from commands import initiate_charge_task, clear_task_for_character
-from command_utils import create_task, get_pronouns, get_task_by_worker, remove_task_by_id, remove_task_by_name, choose_vials_and_display_power_produced
+from command_utils import create_task, due_tasks, find_resource, get_pronouns, get_task_by_worker, remove_task_by_id, remove_task_by_name, choose_vials_and_display_power_produced
 from constants import (TASK_EATING, TASK_CHARGING, TASK_EXPLORING, TASK_PLANTING, TASK_EXAMINING, TASK_REAPING, TASK_MINING, TASK_ASSIGNED, TASK_REFUELING, TASK_TOWING_DROID,
                        RATION_PACKS, GROWTH_TURNS, YIELD_RANGE, CRYSTAL_RATIO, BASE_CRYSTAL_YIELD, TASK_LENGTH, INITIAL_SEED_STASH, REAP_SEED_FRACTION, SEED_PACKETS_USED)
+from game_random import game_rng
 from lore.lore_ingame import get_message
 import lore.user_interface as ui_runtime
 from lore.user_interface import (get_input, msg_plant, msg_explore, msg_resource, msg_power, msg_food, msg_shield, msg_mine, msg_crystal,
@@ -18,17 +18,14 @@ from utils import set_shield_state, set_examine_needed_after_explore, save_confi
 
 
 def advance_tasks(task_package):
-    completed = []
     awaiting_input = False
 
     tasks = task_package["tasks"]
     humans = task_package["humans"]
     turns_elapsed = task_package["counters"]["turns"]
 
-    # Don't decrement the task counter here, just check for completed tasks
-    for task_id, task in tasks.items():
-        if task["duration"] <= 1:       # We stop at one here, because the counters get decremented at the end of the turn (in complete_turn())
-            completed.append(task_id)
+    # Tasks with one turn left finish now, at the end of their last turn
+    completed = due_tasks(tasks, turns_elapsed)
 
     for task_id in completed:
         task = tasks[task_id]
@@ -149,7 +146,7 @@ def complete_explore_task(name, task_package):
         
     def set_task_length(task_type):
         low, high = TASK_LENGTH[task_type]
-        return random.randint(low, high)
+        return game_rng(task_package).randint(low, high)
     
     # Resolve the end of an explore task for `character`.
     discovered_name, task_package = attempt_exploration(task_package)
@@ -167,7 +164,7 @@ def complete_explore_task(name, task_package):
         res_name = discovered["name"]
 
         # React to the newly found resourc
-        resources, droids, shieldstate = react_to_found_resource(res_name, resources, droids, gamestate, shieldstate)
+        resources, droids, shieldstate = react_to_found_resource(res_name, resources, droids, gamestate, shieldstate, game_rng(task_package))
 
         # Is this a human or droid?
         is_human = name in humans
@@ -282,7 +279,7 @@ def examine_after_explore(task_package, character_name, item, item_name, is_huma
     
     def set_task_length(task_type):
         low, high = TASK_LENGTH[task_type]
-        return random.randint(low, high)
+        return game_rng(task_package).randint(low, high)
 
     if item.get("examine_turns", 0) > 0:
         task_type = TASK_EXAMINING
@@ -339,13 +336,13 @@ def complete_plant_task(name, task_package):
     worker = task_data["worker"]
 
     # Locate hydroponics room
-    hydro = next((r for r in resources if r["name"] == "HydroponicsRoom"), None)
+    hydro = find_resource(resources, "HydroponicsRoom")
     if not hydro:
         return_msg = get_message("plant", "no_hydroponics")
         return return_msg, task_package
 
     # Locate seed stash
-    stash = next((r for r in resources if r["name"] == "SeedStash"), None)
+    stash = find_resource(resources, "SeedStash")
     if not stash:
         return_msg = get_message("plant", "no_seedstash")
         humans, droids = clear_task_for_character(worker, "", humans, droids)   # Clear the task
@@ -382,7 +379,7 @@ def complete_plant_task(name, task_package):
             # ⏱ Growth time
             base = GROWTH_TURNS[crop_type]
             deviation = int(base * 0.1)
-            turns_to_complete = random.randint(base - deviation, base + deviation)
+            turns_to_complete = game_rng(task_package).randint(base - deviation, base + deviation)
 
             # 🌾 Register crop
             crops[str(crop_number)] = {
@@ -450,17 +447,17 @@ def complete_examine_task(name, task_package):
         return return_msg, task_package
 
     # Find the item in resources
-    item = next((r for r in resources if r["name"] == item_name), None)
+    item = find_resource(resources, item_name)
     if not item:
         return_msg = get_message("examine", "no_item", item=item_name)
         humans, droids = clear_task_for_character(name, "", humans, droids)   # Clear the task
         return return_msg, task_package
 
     if item_name == "AncientDroidCode":
-        resources, droids, shieldstate = choose_droid_with_ancient_code(resources, droids, shieldstate, turns_elapsed)
+        resources, droids, shieldstate = choose_droid_with_ancient_code(resources, droids, shieldstate, turns_elapsed, game_rng(task_package))
 
     elif item_name == "CrystalCombination":
-        resources, shieldstate = define_crystal_combination(resources, shieldstate, turns_elapsed)
+        resources, shieldstate = define_crystal_combination(resources, shieldstate, turns_elapsed, game_rng(task_package))
 
     else:
         # Print the message
@@ -496,7 +493,7 @@ def complete_reap_task(name, task_package):
     return_msg = ""
     appleseeds = cabbageseeds = potatoseeds = 0
 
-    hydro = next((r for r in resources if r["name"] == "HydroponicsRoom"), None)
+    hydro = find_resource(resources, "HydroponicsRoom")
 
     harvested_total = 0
     harvested_by_type = {"apple": 0, "cabbage": 0, "potato": 0}
@@ -519,7 +516,7 @@ def complete_reap_task(name, task_package):
 
 
             low, high = YIELD_RANGE[ctype]
-            yield_amount = random.randint(low, high)
+            yield_amount = game_rng(task_package).randint(low, high)
 
             # Track totals for the final message
             harvest_summary[ctype] = harvest_summary.get(ctype, 0) + yield_amount
@@ -559,7 +556,7 @@ def complete_reap_task(name, task_package):
     joined_msg = ", ".join(harvest_parts)
 
     # Now update the seeds, generated by reaping
-    stash = next((r for r in resources if r["name"] == "SeedStash"), None)
+    stash = find_resource(resources, "SeedStash")
     if not stash:
         return_msg = get_message("reap", "no_seedstash")
         return return_msg, task_package
@@ -599,7 +596,7 @@ def complete_mine_task(name, task_package):
     return_msg = ""
 
     # Store the crystals in the PowerSupply (the player won't see this anyway)
-    power_supply = next((r for r in resources if r["name"] == "PowerSupply"), None)
+    power_supply = find_resource(resources, "PowerSupply")
     if not power_supply and not power_supply["CrystalStore"]:
         return_msg = get_message("mine", "cannot_store")
         humans, droids = clear_task_for_character(name, "", humans, droids)   # Clear the task
@@ -637,7 +634,7 @@ def complete_assign_process_task(name, task_package):
     task_data = task_package["task_data"]
     return_msg = ""
 
-    power_supply = next((r for r in resources if r["name"] == "PowerSupply"), None)
+    power_supply = find_resource(resources, "PowerSupply")
     if not power_supply:
         return_msg = get_message("assign", "process_no_power_supply")
         humans, droids = clear_task_for_character(name, "", humans, droids)   # Clear the task
@@ -706,8 +703,8 @@ def complete_assign_shieldmanual_task(name, task_package):
     pronouns = get_pronouns(name, is_human=is_human)
 
     # 1. Check for DecodeKey in resources
-    decode_key = next((r for r in resources if r["name"] == "DecodeKey"), None)
-    shield_manual = next((r for r in resources if r["name"] == "ShieldManual"), None)
+    decode_key = find_resource(resources, "DecodeKey")
+    shield_manual = find_resource(resources, "ShieldManual")
 
     if not decode_key:
         return_msg = get_message("shield", "no_decode", name=name, pronoun=pronouns["p1"].lower())
@@ -752,34 +749,34 @@ def complete_refuel_task(name, task_package):
 
 
 
-def choose_droid_with_ancient_code(resources, droids, shieldstate, turns_elapsed):
+def choose_droid_with_ancient_code(resources, droids, shieldstate, turns_elapsed, rng):
     eligible_droids = list(droids.keys())
     if not eligible_droids:
         msg_shield(get_message("shield", "no_droid_with_code"), turns_elapsed)
         return resources, droids, shieldstate
 
-    chosen_droid = random.choice(eligible_droids)
+    chosen_droid = rng.choice(eligible_droids)
     droids[chosen_droid]["AncientCode"] = True
 
     msg = f"Inside the Shield Manual you see firmware specs — rare, old ones. You try each of your droids, and you are fortunate that the only droid that has a matching code is {chosen_droid}. This droid needs to be assigned to the Shield for it to work."
     msg_shield(msg, turns_elapsed)
 
     # Set the message inside the item - for display
-    ancient_code = next((r for r in resources if r.get("name") == "AncientDroidCode"), None)
+    ancient_code = find_resource(resources, "AncientDroidCode")
     ancient_code["msg"] = msg
     ancient_code["droidName"] = chosen_droid
 
     return resources, droids, shieldstate
 
 
-def define_crystal_combination(resources, shieldstate, turns_elapsed):
+def define_crystal_combination(resources, shieldstate, turns_elapsed, rng):
     item_found = False
     for item in resources:
         if item.get("name") == "CrystalCombination":
             item["examined"] = True
-            item["red"] = random.randint(1, 10)
-            item["indigo"] = random.randint(1, 10)
-            item["gold"] = random.randint(1, 10)
+            item["red"] = rng.randint(1, 10)
+            item["indigo"] = rng.randint(1, 10)
+            item["gold"] = rng.randint(1, 10)
             msg = f"This professionally typed booklet describes the correct combination of crystals to make the shield operate effectively: {item['red']} red, {item['indigo']} indigo, and {item['gold']} gold crystals."
             item_found = True
             msg_shield(msg, turns_elapsed)
@@ -802,13 +799,13 @@ def define_crystal_combination(resources, shieldstate, turns_elapsed):
 
 def get_available_crystals(resources):
     available_crystals = {"red": 0, "indigo": 0, "gold": 0}
-    for res in resources:
-        if res.get("name") == "PowerSupply" and res.get("found"):
-            crystal_store = res.get("CrystalStore")
-            if crystal_store:
-                available_crystals["red"] = crystal_store["red"]
-                available_crystals["indigo"] = crystal_store["indigo"]
-                available_crystals["gold"] = crystal_store["gold"]
+    res = find_resource(resources, "PowerSupply", found=True)
+    if res is not None:
+        crystal_store = res.get("CrystalStore")
+        if crystal_store:
+            available_crystals["red"] = crystal_store["red"]
+            available_crystals["indigo"] = crystal_store["indigo"]
+            available_crystals["gold"] = crystal_store["gold"]
     return available_crystals
 
 
@@ -0,0 +1,60 @@
+# conftest.py - shared setup for the tests
+
+import os
+import random
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import engine
+import persistence
+from batch import explore_policy
+
+
+@pytest.fixture(autouse=True)
+def game_folder(tmp_path, monkeypatch):
+    # Every test plays in an empty folder (saves, logs and transcripts land there) with no live game
+    monkeypatch.chdir(tmp_path)
+    persistence.discard_live_package()
+    yield tmp_path
+    persistence.wait_for_writes()
+    persistence.discard_live_package()
+
+
+@pytest.fixture
+def play():
+    # play(inputs) types up to that many inputs into the live game, chosen by batch's explore policy
+    # (letting a turn pass whenever a command doesn't use one up), and returns the game's state
+    def play(inputs):
+        for _ in range(inputs):
+            if engine.is_finished():
+                break
+            state = engine.get_state()
+            question = engine.pending_question()
+            if question:
+                engine.answer(explore_policy(state, question))
+                continue
+
+            engine.apply_command(explore_policy(state, None))
+            if engine.pending_question() is None and engine.get_state()["counters"]["turns"] == state["counters"]["turns"]:
+                engine.step_turn()
+        return engine.get_state()
+    return play
+
+
+@pytest.fixture
+def fuzz_index():
+    # fuzz_index(seed, new, mutate, check) checks an index against a plain search under random changes:
+    # it makes a collection with new(rng), changes it with mutate(rng, collection) again and again, and
+    # after each change check(collection) asserts the index finds just what a search would
+    def fuzz_index(seed, new, mutate, check, collections=200, changes=60):
+        rng = random.Random(seed)
+        for _ in range(collections):
+            collection = new(rng)
+            for _ in range(changes):
+                mutate(rng, collection)
+                check(collection)
+    return fuzz_index
@@ -0,0 +1,15 @@
+# test_batch.py - the batch runner's default policy
+
+import engine
+from batch import play_game
+
+
+def test_the_default_policy_grows_food():
+    # Without planting and reaping, every game starves long before anything worth measuring happens
+    result = play_game(1, max_turns=80)
+    state = engine.get_state()
+
+    assert result["error"] is None
+    assert result["turns"] == 80
+    assert result["starved"] == 0
+    assert state["counters"]["crop"] > len(state["crops"]), "nothing was planted and reaped"
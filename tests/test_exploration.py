@@ -0,0 +1,162 @@
+# test_exploration.py - the compiled exploration rules and the simulator against attempt_exploration
+
+import random
+from statistics import mean, pvariance
+
+import pytest
+
+import engine
+import exploration
+from constants import CHAIN_RESOURCES_ORDER, GATING_RULES, MAJOR_RESOURCES_ORDER
+from exploration import (CRITICAL_ORDER, SIM_BITS, SCRIPTED_FINDS, critical_stage, default_turns_per_explore, exploration_start,
+                         exploration_stage, forecast_from_state, simulate_explores, simulate_run)
+from game_random import GameRandom
+from items import ITEM_BITS, ITEM_DB
+from resources import all_critical_resources_found, all_major_resources_found, attempt_exploration, resource_is_discovered
+from utils import build_task_package
+
+
+def old_rules(resources):
+    # What attempt_exploration decided from the resources list, before the rules were compiled
+    scripted = next((name for name in ("FoodStore", "PowerSupply") if not resource_is_discovered(resources, name)), None)
+    majors = [name for name in MAJOR_RESOURCES_ORDER if not resource_is_discovered(resources, name)]
+    chain = None
+    if all_major_resources_found(resources):
+        chain = next((name for name in ("CrystalCombination", "DecodeKey", "AncientDroidCode")
+                      if not resource_is_discovered(resources, name)), None)
+    return {
+        "scripted": scripted,
+        "gates": tuple(rule for rule in GATING_RULES if not resource_is_discovered(resources, rule[0])),
+        "major": majors[0] if majors else None,
+        "prob": ITEM_DB[majors[0]].get("prob", 1.0) if majors else None,
+        "chain": chain,
+        "post_critical": all_critical_resources_found(resources),
+    }
+
+
+def test_the_compiled_rules_match_the_old_ones():
+    rng = random.Random(3)
+    for _ in range(500):
+        # Found items are a run from the start of CRITICAL_ORDER, as in a game, or any mix at all
+        if rng.random() < 0.5:
+            found = list(CRITICAL_ORDER[:rng.randrange(len(CRITICAL_ORDER) + 1)])
+        else:
+            found = [name for name in CRITICAL_ORDER if rng.random() < 0.5]
+        resources = [dict(ITEM_DB[name], found=True) for name in found]
+        found_items = sum(ITEM_BITS[name] for name in found)
+
+        stage = critical_stage(found_items)
+        expected = old_rules(resources)
+        if stage["major"]:
+            # The chain item is only looked at once every major is found
+            expected["chain"] = stage["chain"]
+        assert stage == expected, found
+
+        # Rare items found don't change what is left to find
+        assert exploration_stage(found_items | ITEM_BITS["AncientGnosticTextInAClayJar"]) is stage
+
+
+def test_the_chain_items_are_found_in_order():
+    found_items = sum(ITEM_BITS[name] for name in CRITICAL_ORDER if name not in CHAIN_RESOURCES_ORDER)
+    for name in CHAIN_RESOURCES_ORDER:
+        assert critical_stage(found_items)["chain"] == name
+        assert not critical_stage(found_items)["post_critical"]
+        found_items |= ITEM_BITS[name]
+    assert critical_stage(found_items)["post_critical"]
+
+
+class NoLuck(GameRandom):
+    # Every roll comes up 0.0, so no major item is ever found by chance
+    def random(self):
+        return 0.0
+
+
+@pytest.mark.parametrize("rule", range(len(GATING_RULES)))
+def test_a_gating_rule_forces_its_item_on_the_first_explore_past_it(rule):
+    name, min_day, min_explores = GATING_RULES[rule]
+    found = list(SCRIPTED_FINDS) + [gate[0] for gate in GATING_RULES[:rule]]
+    # (day, explore) -> whether this explore is forced to find the item
+    for day, explore, forced in ((min_day + 1, min_explores + 1, True), (min_day, min_explores + 1, False),
+                                 (min_day + 1, min_explores, False)):
+        task_package = build_task_package(rng={"seed": 1, "draws": 0})
+        task_package.rng = NoLuck(1)
+        task_package["counters"].update(turns=day * 10, explore=explore - 1, found_items=sum(ITEM_BITS[n] for n in found))
+        found_item, task_package = attempt_exploration(task_package)
+        assert (found_item == name) == forced, (day, explore)
+
+        start = dict(exploration_start(), found=sum(SIM_BITS[n] for n in found), explore=explore - 1, turns=day * 10)
+        assert (simulate_run(NoLuck(1), start, 1, 0)[name] == 1) == forced, (day, explore)
+
+
+def live_explores(runs, max_explores, turns_per_explore):
+    # simulate_explores(), but by calling attempt_exploration itself, with explores evenly spread over the turns
+    results = {name: [] for name in CRITICAL_ORDER}
+    for seed in range(runs):
+        task_package = build_task_package(rng={"seed": seed, "draws": 0})
+        found_on = {}
+        for step in range(1, max_explores + 1):
+            if len(found_on) == len(CRITICAL_ORDER):
+                break
+            task_package["counters"]["turns"] = int(step * turns_per_explore)
+            name, task_package = attempt_exploration(task_package)
+            if name in results:
+                found_on.setdefault(name, step)
+        for name in CRITICAL_ORDER:
+            results[name].append(found_on.get(name))
+    return results
+
+
+def assert_same_spread(first, second):
+    # Each critical item is found as often, and on about the same explore, in both sets of runs
+    for name in first:
+        a = [step for step in first[name] if step is not None]
+        b = [step for step in second[name] if step is not None]
+        assert len(a) / len(first[name]) == pytest.approx(len(b) / len(second[name]), abs=0.05), name
+        error = (pvariance(a) / len(a) + pvariance(b) / len(b)) ** 0.5
+        assert abs(mean(a) - mean(b)) <= 4 * error + 1e-9, name
+
+
+@pytest.mark.parametrize("turns_per_explore", [None, 2.5])
+def test_the_simulator_plays_by_the_same_rules_as_attempt_exploration(turns_per_explore):
+    # Everyone exploring, and one slow explorer (for whom the GATING_RULES' days come first)
+    turns_per_explore = turns_per_explore or default_turns_per_explore()
+    live = live_explores(300, 200, turns_per_explore)
+    simulated = simulate_explores(2000, max_explores=200, turns_per_explore=turns_per_explore, seed=1, use_numpy=False)
+    assert_same_spread(live, simulated)
+
+
+def test_the_numpy_simulator_matches_the_plain_one():
+    if exploration.numpy is None:
+        pytest.skip("numpy is not installed")
+    # From a new game, and from part-way through one
+    starts = [None, {"found": 0b111111, "explore": 20, "found_nil": 2, "turns": 90,
+                     "left": {"replacement": 3, "novelty": 4, "junk": 50}}]
+    for start in starts:
+        plain = simulate_explores(2000, start=start, seed=1, use_numpy=False)
+        arrays = simulate_explores(2000, start=start, seed=1, use_numpy=True)
+        assert list(arrays) == list(plain)
+        assert_same_spread(arrays, plain)
+
+
+def answered(play):
+    # The live game's state, once any question waiting has been answered
+    while engine.pending_question():
+        play(1)
+    return engine.get_state()
+
+
+def test_forecast_only_simulates_again_once_the_game_has_moved_on(play):
+    engine.new_game(seed=1)
+    play(30)
+    answered(play)
+    forecast_from_state.cache_clear()
+
+    first = engine.apply_command("forecast")
+    assert engine.apply_command("forecast") == first
+    assert forecast_from_state.cache_info()[:2] == (1, 1)     # (hits, misses)
+
+    turns = answered(play)["counters"]["turns"]
+    while answered(play)["counters"]["turns"] == turns:
+        engine.step_turn()
+    engine.apply_command("forecast")
+    assert forecast_from_state.cache_info()[:2] == (1, 2)
@@ -0,0 +1,23 @@
+# test_items.py - the found_items bits that saves are written with
+
+import hashlib
+
+from items import ITEM_BIT_ORDER, ITEM_BITS, ITEM_DB
+
+# The items that had bits when found_items was first saved (schema version 5), and a digest of their order.
+# If this fails, an item has been moved or removed in ITEM_BIT_ORDER and old saves would list the wrong finds.
+SAVED_ITEM_COUNT = 92
+SAVED_ITEM_DIGEST = "a1cc90172b2960ec12fce6684faaa9d611515ba3647ba63e3aa275a0ee924bf1"
+
+
+def test_items_keep_the_bits_they_were_saved_with():
+    saved = ",".join(ITEM_BIT_ORDER[:SAVED_ITEM_COUNT])
+    assert hashlib.sha256(saved.encode("utf-8")).hexdigest() == SAVED_ITEM_DIGEST
+    assert ITEM_BITS["FoodStore"] == 1 << 0
+    assert ITEM_BITS["CloakingShield"] == 1 << 10
+    assert ITEM_BITS["AncientGnosticTextInAClayJar"] == 1 << 91
+
+
+def test_every_item_has_a_bit_of_its_own():
+    assert len(set(ITEM_BIT_ORDER)) == len(ITEM_BIT_ORDER)
+    assert set(ITEM_DB) <= set(ITEM_BIT_ORDER)
@@ -0,0 +1,75 @@
+# test_log_rotation.py - the log moving to outpost_log.txt.1, .2... as it grows, and how many old logs are kept
+
+import gzip
+import os
+
+import pytest
+
+import user_interface
+from constants import LOG_FILE
+
+
+@pytest.fixture(autouse=True)
+def small_logs(monkeypatch):
+    # A new log every 1000 bytes, written to this test's folder
+    monkeypatch.setattr(user_interface, "LOG_ROTATE_BYTES", 1000)
+    monkeypatch.setattr(user_interface, "LOG_ROTATE_TURNS", 0)
+    monkeypatch.setattr(user_interface, "LOG_MAX_TOTAL_BYTES", 0)
+    user_interface.close_log()
+    user_interface.set_log_to_file(True)
+    yield
+    user_interface.close_log()
+
+
+def write_segment(number):
+    # One log's worth of lines, which rotates the log as it's flushed
+    user_interface.write_to_log(f"segment {number}\n" + "x" * 1100 + "\n")
+    user_interface.flush_log()
+
+
+def read_log(path):
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8") as f:
+        return f.read()
+
+
+def log_files():
+    return sorted(entry for entry in os.listdir() if entry.startswith(LOG_FILE))
+
+
+@pytest.mark.parametrize("compress", [True, False])
+def test_old_logs_shift_along_and_only_the_newest_are_kept(monkeypatch, compress):
+    monkeypatch.setattr(user_interface, "LOG_GENERATIONS", 3)
+    monkeypatch.setattr(user_interface, "LOG_COMPRESS", compress)
+
+    for number in range(1, 7):
+        write_segment(number)
+
+    suffix = ".gz" if compress else ""
+    assert log_files() == [f"{LOG_FILE}.{generation}{suffix}" for generation in (1, 2, 3)]
+    for generation, number in ((1, 6), (2, 5), (3, 4)):
+        text = read_log(f"{LOG_FILE}.{generation}{suffix}")
+        assert text.startswith("=====") and "Log started" in text
+        assert f"segment {number}\n" in text
+
+    # The next line starts a new log, with its own header
+    user_interface.write_to_log("segment 7\n")
+    user_interface.close_log()
+    assert read_log(LOG_FILE).endswith("segment 7\n")
+    assert "Log started" in read_log(LOG_FILE)
+
+
+def test_the_oldest_logs_go_once_they_pass_the_size_limit(monkeypatch):
+    monkeypatch.setattr(user_interface, "LOG_GENERATIONS", 5)
+    monkeypatch.setattr(user_interface, "LOG_COMPRESS", False)
+
+    write_segment(1)
+    size = os.path.getsize(f"{LOG_FILE}.1")
+    monkeypatch.setattr(user_interface, "LOG_MAX_TOTAL_BYTES", 2 * size + size // 2)
+    for number in range(2, 5):
+        write_segment(number)
+
+    # Room for two old logs, though five generations are allowed
+    assert log_files() == [f"{LOG_FILE}.1", f"{LOG_FILE}.2"]
+    assert "segment 4\n" in read_log(f"{LOG_FILE}.1")
+    assert "segment 3\n" in read_log(f"{LOG_FILE}.2")
@@ -0,0 +1,110 @@
+# test_migrations.py - old saves brought up to the current schema, in the game and by outpost_tools upgrade
+
+import copy
+import json
+import os
+from argparse import Namespace
+
+from constants import CONFIG_FILE, INITIAL_GAMESTATE, SAVE_INDEX_FILE, SAVE_SCHEMA_VERSION, SAVES_DIR
+from items import ITEM_BITS
+from migrations import migrate_state
+from outpost_tools import cmd_upgrade
+from persistence import list_slots, upgrade_save
+
+
+def old_save():
+    # A save as the game wrote it before saves had a schema_version (version 1)
+    queue = {"1": {"task": "", "item": ""}}
+    return {
+        "crops": {"1": {"crop_type": "potato", "bed_id": 2, "worker": "Ann", "turns_remaining": 3}},
+        "droids": {"Rho": {"charge": 40, "task": "", "generated": False, "item": "", "examine_needed": "", "queue": queue}},
+        "gamestate": {"explore": True, "plant": True},
+        "humans": {"Ann": {"hunger": 2, "state": "Okay", "task": "Exploring", "generated": False, "item": "",
+                           "examine_needed": "", "queue": copy.deepcopy(queue)}},
+        "item": "",
+        "resources": [
+            {"name": "FoodStore", "found": True, "amount": 10},
+            {"name": "PowerSupply", "found": True, "CrystalStore": {"red": 1, "total_found": {"red": 1}}, "VialStore": {"red": 2}},
+            {"name": "HydroponicsRoom", "found": True, "beds": [{"id": 1, "crop_id": None}, {"id": 2, "crop_id": "1"}]},
+        ],
+        "shieldstate": {"shield_found": False},
+        "tasks": {"3": {"type": "Exploring", "name": "Ann", "human": True, "duration": 4}},
+        "counters": {"turns": 25, "task": 3, "crop": 1, "explore": 4, "found_nil": 0},
+    }
+
+
+def assert_current_shape(data):
+    assert data["crops"]["1"]["bed_id"] == {"id": 2, "crop_id": "1"}
+    assert data["crops"]["1"]["mature"] is False
+
+    power_supply = data["resources"][1]
+    assert power_supply["CrystalStore"] == {"red": 1, "indigo": 0, "gold": 0, "total_found": {"red": 1, "indigo": 0, "gold": 0},
+                                            "processed": {"red": 0, "indigo": 0, "gold": 0}}
+    assert power_supply["VialStore"] == {"red": 2, "indigo": 0, "gold": 0}
+    assert all(resource["examined"] is False for resource in data["resources"])
+
+    assert data["tasks"]["3"] == {"type": "Exploring", "name": "Ann", "human": True, "ends": 29}
+    assert data["gamestate"] == dict(INITIAL_GAMESTATE, explore=True, plant=True)
+    assert data["task_data"] == {}
+    for character in (data["humans"]["Ann"], data["droids"]["Rho"]):
+        assert set(character["queue"]) == {"1", "2", "3"}
+    assert data["droids"]["Rho"]["first_charge"] is True
+    assert set(data["shieldstate"]) > {"shield_active", "shield_connected"}
+
+    assert set(data["rng"]) == {"seed", "draws"}
+    assert data["counters"]["found_items"] == ITEM_BITS["FoodStore"] | ITEM_BITS["PowerSupply"] | ITEM_BITS["HydroponicsRoom"]
+
+
+def test_an_old_save_is_migrated_to_the_current_shape():
+    data, migrated = migrate_state(old_save(), 1)
+    assert migrated
+    assert_current_shape(data)
+
+    # Migrating again, from the current version or all over again from version 1, changes nothing
+    assert migrate_state(copy.deepcopy(data), SAVE_SCHEMA_VERSION) == (data, False)
+    assert migrate_state(copy.deepcopy(data), 1) == (data, True)
+
+
+def write_old_save(config_file):
+    folder = os.path.dirname(config_file)
+    if folder:
+        os.makedirs(folder, exist_ok=True)
+    with open(config_file, "w") as f:
+        json.dump(old_save(), f)
+
+
+def read_save(config_file):
+    with open(config_file) as f:
+        return json.load(f)
+
+
+def test_upgrade_save_writes_the_migrated_save_back_once():
+    write_old_save(CONFIG_FILE)
+
+    assert upgrade_save(CONFIG_FILE) == "upgraded"
+    saved = read_save(CONFIG_FILE)
+    assert saved.pop("schema_version") == SAVE_SCHEMA_VERSION
+    assert saved.pop("journal_gen") == 1
+    assert_current_shape(saved)
+
+    with open(CONFIG_FILE, "rb") as f:
+        upgraded = f.read()
+    assert upgrade_save(CONFIG_FILE) == "current"
+    with open(CONFIG_FILE, "rb") as f:
+        assert f.read() == upgraded
+
+
+def test_the_upgrade_tool_skips_the_index_in_the_saves_folder(capsys):
+    write_old_save(CONFIG_FILE)
+    write_old_save(os.path.join(SAVES_DIR, "old", CONFIG_FILE))
+    with open(SAVE_INDEX_FILE, "w") as f:
+        json.dump({}, f)
+
+    cmd_upgrade(Namespace(saves_dir=SAVES_DIR, workers=2))
+    assert "2 of 2 saves upgraded." in capsys.readouterr().out
+    assert read_save(os.path.join(SAVES_DIR, "old", CONFIG_FILE))["schema_version"] == SAVE_SCHEMA_VERSION
+    assert sorted(slot for slot, _ in list_slots()) == ["default", "old"]
+
+    # The index it rebuilt is still there the second time round
+    cmd_upgrade(Namespace(saves_dir=SAVES_DIR, workers=2))
+    assert "0 of 2 saves upgraded." in capsys.readouterr().out
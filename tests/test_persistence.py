@@ -0,0 +1,144 @@
+# test_persistence.py - saves: snapshots, the journal in between, and the formats they're written in
+
+import json
+import os
+import random
+
+import pytest
+
+import engine
+import persistence
+import serializers
+from constants import CONFIG_FILE, DEFAULT_SLOT, JOURNAL_FILE, SAVE_INDEX_FILE, SAVES_DIR
+from persistence import apply_op, diff_state
+
+
+def random_value(rng, depth=0):
+    kind = rng.randrange(6 if depth < 3 else 3)
+    if kind == 0:
+        return rng.randrange(-5, 5)
+    if kind == 1:
+        return rng.choice(["", "a", "b", "Eating"])
+    if kind == 2:
+        return rng.choice([None, True, False, 1.5])
+    if kind in (3, 4):
+        return {rng.choice("abcdef"): random_value(rng, depth + 1) for _ in range(rng.randrange(4))}
+    return [random_value(rng, depth + 1) for _ in range(rng.randrange(4))]
+
+
+def test_journal_ops_turn_one_state_into_another():
+    rng = random.Random(1)
+    for _ in range(2000):
+        old = {"a": random_value(rng), "b": random_value(rng)}
+        new = {"a": random_value(rng), "b": old["b"] if rng.random() < 0.5 else random_value(rng)}
+
+        data = json.loads(json.dumps(old))
+        for op in json.loads(json.dumps(diff_state(old, new, [], []))):
+            apply_op(data, op)
+        assert data == new
+
+
+def reload_live_game():
+    # Read the live game back from disk, as a new session would
+    persistence.wait_for_writes()
+    persistence.discard_live_package()
+    return persistence.read_saved_data()
+
+
+@pytest.mark.parametrize("seed", [1, 2, 3])
+def test_a_saved_game_reads_back_the_same(play, seed):
+    engine.new_game(seed=seed, save=True)
+    state = play(80)
+
+    assert state["counters"]["turns"] > 10
+    with open(JOURNAL_FILE) as f:
+        assert f.read().strip(), "nothing was journalled between snapshots"
+
+    assert reload_live_game() == state
+
+
+@pytest.mark.parametrize("fmt", sorted(serializers.SNAPSHOT_EXTENSIONS))
+def test_every_save_format_reads_back_the_same(play, monkeypatch, fmt):
+    if fmt == "msgpack" and serializers.msgpack is None:
+        pytest.skip("msgpack is not installed")
+    monkeypatch.setattr(persistence, "SAVE_FORMAT", fmt)
+
+    engine.new_game(seed=4, save=True)
+    state = play(40)
+
+    assert reload_live_game() == state
+
+
+def test_a_loaded_game_carries_on_as_if_it_had_never_stopped(play):
+    engine.new_game(seed=5, save=True)
+    play(30)
+    inputs = 30
+    while engine.pending_question():
+        # A question waiting for an answer isn't part of the save, so stop once it's answered
+        play(1)
+        inputs += 1
+    reloaded = reload_live_game()
+    engine.load_game()
+    assert engine.get_state() == reloaded
+    after_reload = play(30)
+
+    engine.new_game(seed=5)
+    assert play(inputs + 30) == after_reload
+
+
+@pytest.mark.parametrize("failure", [OSError(28, "No space left on device"), TypeError("not serialisable")])
+def test_a_failed_background_write_is_made_good_by_the_next_checkpoint(play, monkeypatch, failure):
+    monkeypatch.setattr(persistence, "SAVE_IN_BACKGROUND", True)
+    engine.new_game(seed=6, save=True)
+    play(10)
+
+    # The next journal line fails to write, once
+    append_journal_line = persistence.append_journal_line
+    def fail_once(journal_file, line):
+        monkeypatch.setattr(persistence, "append_journal_line", append_journal_line)
+        raise failure
+    monkeypatch.setattr(persistence, "append_journal_line", fail_once)
+
+    task_package = persistence.get_live_package()
+    task_package["shieldstate"]["shield_active"] = not task_package["shieldstate"]["shield_active"]
+    persistence.set_live_package(task_package)
+    persistence.checkpoint()
+    persistence.wait_for_writes()
+
+    # The writer is still going, and the error comes out of the checkpoint that makes up for it
+    task_package["counters"]["turns"] += 1
+    persistence.set_live_package(task_package)
+    with pytest.raises(type(failure)):
+        persistence.checkpoint()
+    state = play(10)
+
+    assert reload_live_game() == state
+
+
+def test_slots_are_listed_from_the_index_which_can_be_rebuilt(play, monkeypatch):
+    # Back to the default slot afterwards, whatever happens
+    monkeypatch.setitem(persistence._live, "slot", DEFAULT_SLOT)
+    engine.new_game(seed=7, slot="alpha", save=True)
+    alpha = play(40)
+    engine.new_game(seed=8, slot="beta", save=True)
+    beta = play(20)
+    persistence.checkpoint(force=True)
+
+    # Most recently played first, each as of its last snapshot
+    slots = persistence.list_slots()
+    assert [slot for slot, _ in slots] == ["beta", "alpha"]
+    for (slot, summary), state in zip(slots, (beta, alpha)):
+        assert os.path.isdir(os.path.join(SAVES_DIR, slot))
+        assert summary["turn"] == state["counters"]["turns"]
+        assert summary["day"] == state["counters"]["turns"] // 10
+        assert summary["humans_alive"] == sum(human["state"] != "Deceased" for human in state["humans"].values())
+    assert not os.path.exists(CONFIG_FILE), "a named slot was saved in the game folder"
+
+    # Without the index there is nothing to list until it is rebuilt from the saves themselves
+    os.remove(SAVE_INDEX_FILE)
+    assert persistence.list_slots() == []
+    persistence.rebuild_index()
+
+    def without_times(slots):
+        return [(slot, dict(summary, modified=None)) for slot, summary in slots]
+    assert without_times(persistence.list_slots()) == without_times(slots)
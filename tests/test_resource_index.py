@@ -0,0 +1,77 @@
+# test_resource_index.py - find_resource's name index against a search of the list
+
+from command_utils import find_resource
+from items import ITEM_DB
+from tracking import TaskPackage, to_plain
+
+NAMES = list(ITEM_DB)[:8] + ["Crate", "crate", "Beacon"]
+
+
+def scan(resources, name, ignore_case=False):
+    if ignore_case:
+        return next((r for r in resources if isinstance(r.get("name"), str) and r["name"].lower() == name.lower()), None)
+    return next((r for r in resources if r.get("name") == name), None)
+
+
+def random_resource(rng):
+    name = rng.choice(NAMES)
+    if name in ITEM_DB and rng.random() < 0.7:
+        return dict(ITEM_DB[name], found=rng.random() < 0.5)
+    return {"name": name, "amount": rng.randrange(5)}
+
+
+def mutate(rng, resources):
+    op = rng.randrange(14)
+    if op == 0 or not resources:
+        resources.append(random_resource(rng))
+    elif op == 1:
+        resources.extend(random_resource(rng) for _ in range(rng.randrange(3)))
+    elif op == 2:
+        resources.insert(rng.randrange(len(resources) + 1), random_resource(rng))
+    elif op == 3:
+        resources[rng.randrange(len(resources))] = random_resource(rng)
+    elif op == 4:
+        del resources[rng.randrange(len(resources))]
+    elif op == 5:
+        resources.pop(rng.randrange(len(resources)))
+    elif op == 6:
+        resources.remove(rng.choice(resources))
+    elif op == 7:
+        resources.reverse()
+    elif op == 8:
+        resources.sort(key=lambda r: str(r.get("name")))
+    elif op == 9:
+        start = rng.randrange(len(resources))
+        resources[start:start + 2] = [random_resource(rng)]
+    elif op == 10:
+        rng.choice(resources)["name"] = rng.choice(NAMES)
+    elif op == 11:
+        rng.choice(resources).pop("name", None)
+    elif op == 12:
+        rng.choice(resources).update(name=rng.choice(NAMES))
+    elif rng.random() < 0.1:
+        resources.clear()
+    else:
+        rng.choice(resources)["amount"] = rng.randrange(5)
+
+
+def new_resources(rng):
+    return TaskPackage({"resources": [random_resource(rng) for _ in range(rng.randrange(6))]})["resources"]
+
+
+def check(resources):
+    for name in NAMES:
+        assert find_resource(resources, name) is scan(resources, name)
+        assert resources.find(name, ignore_case=True) is scan(resources, name, ignore_case=True)
+
+
+def test_the_index_finds_what_a_search_would(fuzz_index):
+    fuzz_index(13, new_resources, mutate, check)
+
+
+def test_found_only_returns_found_resources():
+    resources = TaskPackage({"resources": [dict(ITEM_DB["FoodStore"]), dict(ITEM_DB["PowerSupply"], found=True)]})["resources"]
+
+    assert find_resource(resources, "FoodStore", found=True) is None
+    assert find_resource(resources, "PowerSupply", found=True) is resources[1]
+    assert find_resource(to_plain(resources), "PowerSupply", found=True) == resources[1]
@@ -0,0 +1,43 @@
+# test_scheduler.py - the tasks section's schedule against checking every task each turn
+
+import random
+
+from command_utils import due_tasks
+from tracking import TaskPackage, to_plain
+
+
+def play_schedule(rng, reschedule):
+    # Random tasks come and go over the turns, finishing (being removed) some turns after they fall
+    # due; with reschedule, tasks also have their end moved. Yields (scheduled, searched) each turn.
+    tasks = TaskPackage({"tasks": {}})["tasks"]
+    next_id = 0
+    for turn in range(300):
+        for _ in range(rng.randrange(3)):
+            tasks[str(next_id)] = {"name": "Ann", "type": "Exploring", "ends": turn + rng.randrange(1, 12)}
+            next_id += 1
+
+        if reschedule and tasks and rng.random() < 0.3:
+            task = tasks[rng.choice(list(tasks))]
+            task["ends"] = max(turn + 1, task["ends"] + rng.randrange(-3, 4))
+
+        yield due_tasks(tasks, turn), due_tasks(to_plain(tasks), turn)
+
+        for task_id in due_tasks(tasks, turn):
+            if rng.random() < 0.7:
+                del tasks[task_id]
+        if tasks and rng.random() < 0.1:
+            del tasks[rng.choice(list(tasks))]
+
+
+def test_due_tasks_come_in_task_order():
+    rng = random.Random(15)
+    for _ in range(20):
+        for scheduled, searched in play_schedule(rng, reschedule=False):
+            assert scheduled == searched
+
+
+def test_rescheduled_tasks_fall_due_when_they_now_end():
+    rng = random.Random(16)
+    for _ in range(20):
+        for scheduled, searched in play_schedule(rng, reschedule=True):
+            assert sorted(scheduled) == sorted(searched)
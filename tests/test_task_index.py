@@ -0,0 +1,58 @@
+# test_task_index.py - the tasks section's indexes against a search of the tasks
+
+from command_utils import find_tasks, get_task_by_worker
+from tracking import TASK_INDEX_FIELDS, TaskPackage, to_plain
+
+WORKERS = ["Ann", "Bob", "Cy", "Dee"]
+TYPES = ["Exploring", "Eating", "Charging", "Examining"]
+ITEMS = ["", "ShieldManual", "CrystalProcessor"]
+VALUES = {"name": WORKERS, "type": TYPES, "item_name": ITEMS}
+
+
+def random_task(rng):
+    task = {"name": rng.choice(WORKERS), "type": rng.choice(TYPES), "ends": rng.randrange(20)}
+    if rng.random() < 0.6:
+        task["item_name"] = rng.choice(ITEMS)
+    return task
+
+
+def mutate(rng, tasks):
+    op = rng.randrange(9)
+    task_ids = list(tasks)
+    if op < 3 or not task_ids:
+        tasks[str(max(map(int, task_ids), default=-1) + 1)] = random_task(rng)
+        return
+
+    task_id = rng.choice(task_ids)
+    if op == 3:
+        del tasks[task_id]
+    elif op == 4:
+        tasks.pop(task_id)
+    elif op == 5:
+        tasks[task_id] = random_task(rng)
+    elif op == 6:
+        field = rng.choice(TASK_INDEX_FIELDS)
+        tasks[task_id][field] = rng.choice(VALUES[field])
+    elif op == 7:
+        tasks[task_id].pop("item_name", None)
+    elif rng.random() < 0.05:
+        tasks.clear()
+    else:
+        tasks[task_id]["ends"] += 1
+
+
+def new_tasks(rng):
+    return TaskPackage({"tasks": {str(i): random_task(rng) for i in range(rng.randrange(6))}})["tasks"]
+
+
+def check(tasks):
+    plain = to_plain(tasks)
+    for field, values in VALUES.items():
+        for value in values:
+            assert find_tasks(tasks, field, value) == find_tasks(plain, field, value)
+    for name in WORKERS:
+        assert get_task_by_worker(tasks, name) == get_task_by_worker(plain, name)
+
+
+def test_the_index_finds_what_a_search_would(fuzz_index):
+    fuzz_index(14, new_tasks, mutate, check)
@@ -0,0 +1,125 @@
+# test_tracking.py - the task_package's record of what has changed
+
+import pytest
+
+from items import ITEM_DB
+from tracking import ALL, TaskPackage, to_plain
+
+
+def make_package():
+    return TaskPackage({
+        "humans": {"Ann": {"hunger": 0, "queue": {"1": {"task": "", "item": ""}}}, "Bob": {"hunger": 3}},
+        "resources": [dict(ITEM_DB["FoodStore"], found=True)],
+        "task_data": {},
+        "item": "",
+    })
+
+
+def test_a_new_package_is_all_dirty():
+    package = make_package()
+    assert package.take_dirty("save") == {section: ALL for section in package}
+    assert package.take_dirty("save") == {}
+
+
+def test_changes_are_recorded_down_to_the_entry():
+    package = make_package()
+    package.take_dirty("save")
+    package.take_dirty("screen")
+
+    package["humans"]["Ann"]["hunger"] += 1
+    package["humans"]["Ann"]["queue"]["1"]["task"] = "Eating"
+    package["resources"][0]["rationPack"] -= 1
+
+    assert package.take_dirty("save") == {"humans": {"Ann"}, "resources": {0}}
+    # Each consumer has its own record
+    assert package.take_dirty("screen") == {"humans": {"Ann"}, "resources": {0}}
+    assert package.take_dirty("save") == {}
+
+
+def test_replacing_a_section_marks_all_of_it():
+    package = make_package()
+    package.take_dirty("save")
+
+    package["humans"] = {"Cy": {"hunger": 0}}
+    package["item"] = "FoodStore"
+
+    assert package.take_dirty("save") == {"humans": ALL, "item": ALL}
+
+
+def test_a_stored_dict_is_a_tracked_copy():
+    package = make_package()
+    package.take_dirty("save")
+
+    instructions = {"crop": "apple"}
+    package["task_data"] = instructions
+    stored = package["task_data"]
+    package.take_dirty("save")
+
+    # Changes through the caller's dict never reach the package...
+    instructions["crop"] = "potato"
+    assert stored["crop"] == "apple"
+    assert package.take_dirty("save") == {}
+
+    # ...changes through the one read back do
+    stored["crop"] = "cabbage"
+    assert package.take_dirty("save") == {"task_data": {"crop"}}
+
+
+def test_items_keep_only_their_own_fields():
+    package = make_package()
+    food_store = package["resources"][0]
+
+    assert food_store.own_fields() == {"name": "FoodStore", "found": True}
+    assert food_store == dict(ITEM_DB["FoodStore"], found=True)
+
+    food_store["rationPack"] = 7
+    assert food_store.own_fields() == {"name": "FoodStore", "found": True, "rationPack": 7}
+    assert ITEM_DB["FoodStore"]["rationPack"] == 20
+
+
+def test_deleting_a_template_field_leaves_a_tombstone():
+    package = make_package()
+    food_store = package["resources"][0]
+    package.take_dirty("save")
+
+    del food_store["msg"]
+    assert "msg" not in food_store
+    assert food_store.get("msg", "gone") == "gone"
+    assert "msg" not in to_plain(food_store)
+    assert len(food_store) == len(ITEM_DB["FoodStore"]) - 1
+    assert package.take_dirty("save") == {"resources": {0}}
+    with pytest.raises(KeyError):
+        food_store["msg"]
+
+    assert food_store.pop("apple") == 0
+    assert food_store.pop("apple", None) is None
+    with pytest.raises(KeyError):
+        food_store.pop("apple")
+
+    # Setting it again brings it back
+    food_store["msg"] = "Restocked"
+    assert food_store["msg"] == "Restocked"
+    assert "msg" in to_plain(food_store)
+
+
+def test_tombstones_survive_being_stored_again():
+    package = make_package()
+    food_store = package["resources"][0]
+    del food_store["msg"]
+
+    package["resources"] = [food_store]
+    assert "msg" not in package["resources"][0]
+
+    # A plain copy of the item is stored the same way
+    package["resources"] = [to_plain(food_store)]
+    assert "msg" not in package["resources"][0]
+    assert package["resources"][0] == to_plain(food_store)
+
+
+def test_a_cleared_item_is_empty():
+    package = make_package()
+    food_store = package["resources"][0]
+
+    food_store.clear()
+    assert not food_store
+    assert to_plain(food_store) == {}
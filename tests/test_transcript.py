@@ -0,0 +1,53 @@
+# test_transcript.py - recording what was typed, and playing it back to the same game
+
+import json
+
+import pytest
+
+import engine
+import persistence
+
+
+def test_a_new_game_replays_to_the_same_state(play, game_folder):
+    path = str(game_folder / "new.jsonl")
+    engine.new_game(seed=7, record=path)
+    recorded = play(60)
+
+    engine.replay(path)
+    assert engine.get_state() == recorded
+
+
+def test_a_loaded_game_replays_from_where_it_was_loaded(play, game_folder):
+    path = str(game_folder / "loaded.jsonl")
+    engine.new_game(seed=8, save=True)
+    play(30)
+    persistence.wait_for_writes()
+    persistence.discard_live_package()
+
+    engine.load_game(record=path)
+    recorded = play(30)
+
+    engine.replay(path)
+    assert engine.get_state() == recorded
+
+
+def test_a_replay_that_drifts_stops(play, game_folder):
+    path = game_folder / "drift.jsonl"
+    engine.new_game(seed=9, record=str(path))
+    play(20)
+
+    lines = path.read_text(encoding="utf-8").splitlines()
+    entry = json.loads(lines[-1])
+    entry["turn"] += 1
+    path.write_text("\n".join(lines[:-1] + [json.dumps(entry)]) + "\n", encoding="utf-8")
+
+    with pytest.raises(ValueError, match="typed on turn"):
+        engine.replay(str(path))
+
+
+def test_other_transcript_versions_are_refused(game_folder):
+    path = game_folder / "old.jsonl"
+    path.write_text(json.dumps({"version": 0, "seed": 1, "new_game": True}) + "\n", encoding="utf-8")
+
+    with pytest.raises(ValueError, match="version 0 transcript"):
+        engine.replay(str(path))
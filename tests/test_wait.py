@@ -0,0 +1,69 @@
+# test_wait.py - 'wait' plays the same game as typing 'next' turn after turn
+
+import pytest
+
+import engine
+from constants import HUNGER, SAVE_SCHEMA_VERSION
+from timelines import HUNGER_BAND_AT, turns_to_hunger_check
+
+
+def wait_and_step(state):
+    # From state, (the game after one 'wait', the game after 'next' up to the same turn), or None
+    # if the wait stopped on a question
+    engine.resume_game(state, SAVE_SCHEMA_VERSION)
+    engine.apply_command("wait")
+    if engine.pending_question():
+        return None
+    waited = engine.get_state()
+
+    engine.resume_game(state, SAVE_SCHEMA_VERSION)
+    while engine.get_state()["counters"]["turns"] < waited["counters"]["turns"] and not engine.pending_question():
+        engine.apply_command("next")
+    return waited, engine.get_state()
+
+
+@pytest.mark.parametrize("seed", range(1, 7))
+def test_wait_plays_the_same_turns_as_next(play, seed):
+    engine.new_game(seed=seed)
+    compared = 0
+    for _ in range(8):
+        state = play(6)
+        if engine.is_finished():
+            break
+        result = wait_and_step(state)
+        if result:
+            waited, stepped = result
+            assert waited == stepped
+            compared += 1
+        engine.resume_game(state, SAVE_SCHEMA_VERSION)
+    assert compared
+
+
+@pytest.mark.parametrize("seed", range(1, 7))
+def test_wait_rolls_for_the_mgc_as_next_does(play, seed):
+    # Move a new game (everyone idle, so the turns are quiet) on to days when the MGC can arrive,
+    # so each quiet turn makes its roll
+    engine.new_game(seed=seed)
+    state = play(1)
+    state["counters"]["turns"] += 120
+
+    compared = 0
+    while not state["gamestate"]["game_over"]:
+        result = wait_and_step(state)
+        if result:
+            waited, stepped = result
+            assert waited == stepped
+            compared += 1
+        else:
+            # Answer the question the wait stopped on, and carry on from there
+            play(1)
+        state = engine.get_state()
+    assert compared
+    assert state["gamestate"]["endgame_reason"] == "mgc_arrival_no_shield"
+
+
+@pytest.mark.parametrize("band", list(HUNGER))
+def test_hunger_timeline_matches_counting_up(band):
+    for hunger in range(HUNGER["Deceased"][1] + 1):
+        stepped = next((turns for turns in range(1, 40) if HUNGER_BAND_AT.get(hunger + turns, band) != band), None)
+        assert turns_to_hunger_check(hunger, band) == stepped
@@ -0,0 +1,98 @@
+# timelines.py - when each character, crop and task will next need looking at
+
+# Hunger goes up by one every turn and a droid's charge goes down by IDLE_CHARGE_USAGE, so the
+# turn a human reaches the next HUNGER band, or a droid the LOW_CHARGE_FLAG warning or a flat
+# battery, can be worked out in closed form instead of found by stepping turn by turn. The same
+# goes for crops ripening, tasks ending and the end of the day. Together they say how many of the
+# coming turns are quiet - nothing to do but count - so progress_outpost only checks a character
+# when something can happen to them, and 'wait' can play the quiet turns in one go (see
+# play_quiet_turns in turns).
+
+from functools import lru_cache
+
+from command_utils import find_resource, get_task_by_worker
+from constants import HUNGER, IDLE_CHARGE_USAGE, LOW_CHARGE_FLAG, TASK_CHARGING
+
+# The hunger band each hunger level is in. Levels between the bands aren't in any.
+HUNGER_BAND_AT = {hunger: band for band, (low, high) in HUNGER.items() for hunger in range(low, high + 1)}
+
+LOW_CHARGE = LOW_CHARGE_FLAG * IDLE_CHARGE_USAGE
+
+
+def hunger_needs_check(human):
+    # process_hunger_status only has anything to do when a human's hunger is in a band other than their state
+    return HUNGER_BAND_AT.get(human["hunger"], human["state"]) != human["state"]
+
+
+@lru_cache(maxsize=None)
+def turns_to_hunger_check(hunger, state):
+    # The number of turns until a human at this hunger and state next needs process_hunger_status:
+    # the first level above hunger that is in another band. None if they never will.
+    turns = [max(low, hunger + 1) - hunger for band, (low, high) in HUNGER.items() if band != state and high > hunger]
+    return min(turns, default=None)
+
+
+def drains_charge(droid):
+    # Whether decrease_droid_charge takes charge from this droid (one holding the shield keeps theirs)
+    return droid["charge"] > 0 and droid["item"] != "CloakingShield"
+
+
+def turns_to_charge_check(name, droid, tasks):
+    # The number of turns until decrease_droid_charge has something to do for this droid: a low-charge
+    # warning, a change of charge band (see get_charge_band), or a task to interrupt. None if never.
+    charge = droid["charge"]
+    if charge <= 0:
+        # Flat droids are checked every turn, for a task to interrupt
+        _, task = get_task_by_worker(tasks, name)
+        return 1 if task and task["type"] != TASK_CHARGING else None
+
+    if not drains_charge(droid):
+        # Held where the warning goes off, it goes off every turn
+        return 1 if LOW_CHARGE - IDLE_CHARGE_USAGE < charge <= LOW_CHARGE else None
+
+    # Down to the warning (which is also the "low" band), then flat
+    if charge > LOW_CHARGE:
+        return -(-(charge - LOW_CHARGE) // IDLE_CHARGE_USAGE)
+    return -(-charge // IDLE_CHARGE_USAGE)
+
+
+def turns_to_next_event(task_package):
+    # The number of turns, counting the next one, until a turn that has to be played in full: one on
+    # which a task ends, a day ends, someone's hunger or charge needs a look, a crop ripens, or the
+    # endgame checks could fire. Every turn before it is quiet.
+    counters = task_package["counters"]
+    turns = counters["turns"]
+    humans = task_package["humans"]
+    droids = task_package["droids"]
+    tasks = task_package["tasks"]
+    resources = task_package["resources"]
+
+    if task_package["gamestate"]["game_over"] or all(human["state"] == "Deceased" for human in humans.values()):
+        return 1
+
+    # The power supply running out ends the game, and the shield complains every turn it has no power
+    power_supply = find_resource(resources, "PowerSupply")
+    if power_supply is not None and power_supply.get("amount", 0) <= 0:
+        return 1
+
+    # A task is played out on the turn before it ends
+    events = [10 - turns % 10]
+    events += [max(1, task["ends"] - turns) for task in tasks.values()]
+
+    for human in humans.values():
+        if human["state"] != "Deceased":
+            events.append(turns_to_hunger_check(human["hunger"], human["state"]))
+
+    for name, droid in droids.items():
+        events.append(turns_to_charge_check(name, droid, tasks))
+
+    hydro = find_resource(resources, "HydroponicsRoom")
+    if hydro and hydro.get("powered", True):
+        events += [max(1, crop["turns_remaining"]) for crop in task_package["crops"].values() if not crop.get("mature", False)]
+
+    return min(event for event in events if event is not None)
+
+
+def quiet_turns(task_package):
+    # The number of turns from now that can be played in one go
+    return turns_to_next_event(task_package) - 1
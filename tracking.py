@@ -0,0 +1,585 @@
+# tracking.py - a task_package that knows which parts of it have changed
+
+import heapq
+
+from items import ITEM_DB
+
+# Every dict and list inside a TaskPackage is held as a TrackedDict / TrackedList, which tells
+# the package about any change made to it. The package keeps a separate record of what has
+# changed for each consumer ("save", "screen"), down to the character, task, crop or resource.
+#
+# NOTE: values are converted as they are stored, so storing a plain dict puts a tracked COPY
+# in the package, and later changes made through the original never reach it. A plain dict
+# can't be made to report its changes in place, so anywhere that keeps using a value after
+# storing it has to carry on with the one read back from the package.
+#
+# Discovered items (entries in resources with an item template) are held as TrackedItems, which
+# store only the fields set on them and read every other field from the shared template.
+
+ALL = None      # In a dirty record, means the whole section has changed
+
+TASK_INDEX_FIELDS = ("name", "type", "item_name")      # Task fields the tasks section is indexed by
+
+DIRTY_CONSUMERS = ("save", "screen")
+
+
+def track(value, on_change):
+    # Convert value (and everything inside it) to tracked containers reporting to on_change
+    if isinstance(value, dict):
+        if isinstance(value, TrackedDict) and value._on_change is on_change:
+            return value
+        if isinstance(value, TrackedItem):
+            return TrackedItem(value.template, value.own_fields(), on_change, value.removed)
+        return TrackedDict(value, on_change)
+    if isinstance(value, list):
+        if isinstance(value, TrackedList) and value._on_change is on_change:
+            return value
+        return TrackedList(value, on_change)
+    return value
+
+
+def retrack(value, on_change):
+    # Point an already-tracked value (and everything inside it) at a new on_change, in place,
+    # so references held elsewhere stay valid. Untracked values are converted.
+    if not isinstance(value, (TrackedDict, TrackedList)):
+        return track(value, on_change)
+
+    value._on_change = on_change
+    items = value.items() if isinstance(value, dict) else enumerate(value)
+    for key, item in list(items):
+        if isinstance(item, (dict, list)):
+            converted = retrack(item, on_change)
+            if converted is not item:
+                if isinstance(value, dict):
+                    dict.__setitem__(value, key, converted)
+                else:
+                    list.__setitem__(value, key, converted)
+    return value
+
+
+def to_plain(value):
+    # A plain dict/list copy of value, for anything that needs exact built-in types (marshal)
+    # or a copy that is detached from the package
+    if isinstance(value, dict):
+        return {key: to_plain(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [to_plain(item) for item in value]
+    return value
+
+
+class TrackedDict(dict):
+    def __init__(self, values, on_change):
+        super().__init__()
+        self._on_change = on_change
+        for key, value in values.items():
+            dict.__setitem__(self, key, self._child(key, value))
+
+    def _child(self, key, value):
+        return track(value, self._on_change)
+
+    def __setitem__(self, key, value):
+        dict.__setitem__(self, key, self._child(key, value))
+        self._on_change(key)
+
+    def __delitem__(self, key):
+        dict.__delitem__(self, key)
+        self._on_change(key)
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+    def update(self, *args, **kwargs):
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return dict.__getitem__(self, key)
+
+    def pop(self, key, *default):
+        had_key = key in self
+        value = dict.pop(self, key, *default)
+        if had_key:
+            self._on_change(key)
+        return value
+
+    def popitem(self):
+        key, value = dict.popitem(self)
+        self._on_change(key)
+        return key, value
+
+    def clear(self):
+        dict.clear(self)
+        self._on_change(ALL)
+
+
+class TrackedItem(TrackedDict):
+    # A discovered item. Only the fields set on it since it was discovered are stored here; the
+    # rest are read from its template in items.ITEM_DB, which every game shares and nothing
+    # changes. Reads, iteration and to_plain() see the whole item.
+    # Template fields deleted from the item are kept in removed (tombstones), so the template's
+    # value no longer shows through. A field is never both stored here and in removed.
+    def __init__(self, template, values, on_change, removed=()):
+        self.template = template
+        self.removed = set(removed)
+        super().__init__(values, on_change)
+
+    def own_fields(self):
+        return dict(dict.items(self))
+
+    def merged(self):
+        # The whole item as a plain dict, in the template's order (new fields at the end)
+        if self.removed:
+            merged = {key: value for key, value in self.template.items() if key not in self.removed}
+        else:
+            merged = dict(self.template)
+        merged.update(dict.items(self))
+        return merged
+
+    def __missing__(self, key):
+        if key in self.removed:
+            raise KeyError(key)
+        return self.template[key]
+
+    def get(self, key, default=None):
+        if dict.__contains__(self, key):
+            return dict.__getitem__(self, key)
+        if key in self.removed:
+            return default
+        return self.template.get(key, default)
+
+    def __contains__(self, key):
+        return dict.__contains__(self, key) or (key in self.template and key not in self.removed)
+
+    def __setitem__(self, key, value):
+        self.removed.discard(key)
+        super().__setitem__(key, value)
+
+    def __delitem__(self, key):
+        if key not in self:
+            raise KeyError(key)
+        if dict.__contains__(self, key):
+            dict.__delitem__(self, key)
+        if key in self.template:
+            self.removed.add(key)
+        self._on_change(key)
+
+    def pop(self, key, *default):
+        if key not in self:
+            if default:
+                return default[0]
+            raise KeyError(key)
+        value = self[key]
+        del self[key]
+        return value
+
+    def popitem(self):
+        if not self:
+            raise KeyError("popitem(): item is empty")
+        key = list(self.keys())[-1]
+        return key, self.pop(key)
+
+    def clear(self):
+        dict.clear(self)
+        self.removed = set(self.template)
+        self._on_change(ALL)
+
+    def keys(self):
+        return self.merged().keys()
+
+    def __iter__(self):
+        return iter(self.merged())
+
+    def __len__(self):
+        return len(self.template) - len(self.removed) + sum(1 for key in dict.keys(self) if key not in self.template)
+
+    def __bool__(self):
+        # "if resource:" is everywhere, so this mustn't build the whole item
+        return dict.__len__(self) > 0 or len(self.removed) < len(self.template)
+
+    def values(self):
+        return self.merged().values()
+
+    def items(self):
+        return self.merged().items()
+
+    def copy(self):
+        return self.merged()
+
+    def __eq__(self, other):
+        if isinstance(other, TrackedItem):
+            other = other.merged()
+        return isinstance(other, dict) and self.merged() == other
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __repr__(self):
+        return repr(self.merged())
+
+
+def as_item(value, on_change):
+    # value as a TrackedItem if it is an item with a template (keeping only the fields that differ
+    # from the template, and tombstones for the template fields it doesn't have), otherwise
+    # tracked as usual
+    if isinstance(value, dict) and not isinstance(value, TrackedItem):
+        template = ITEM_DB.get(value.get("name"))
+        if template is not None:
+            own = {key: item for key, item in value.items()
+                   if key == "name" or key not in template or template[key] != item}
+            removed = [key for key in template if key not in value]
+            return TrackedItem(template, own, on_change, removed)
+    return track(value, on_change)
+
+
+class TrackedList(list):
+    def __init__(self, values, on_change):
+        super().__init__(track(value, on_change) for value in values)
+        self._on_change = on_change
+
+    def _changed(self, index=ALL):
+        self._on_change(index)
+
+    def __setitem__(self, index, value):
+        if isinstance(index, slice):
+            list.__setitem__(self, index, [track(item, self._on_change) for item in value])
+            self._changed()
+        else:
+            list.__setitem__(self, index, track(value, self._on_change))
+            self._changed(index % len(self))
+
+    def __delitem__(self, index):
+        list.__delitem__(self, index)
+        self._changed()
+
+    def __iadd__(self, other):
+        self.extend(other)
+        return self
+
+    def __imul__(self, count):
+        list.__imul__(self, count)
+        self._changed()
+        return self
+
+    def append(self, value):
+        list.append(self, track(value, self._on_change))
+        self._changed(len(self) - 1)
+
+    def extend(self, values):
+        start = len(self)
+        list.extend(self, [track(value, self._on_change) for value in values])
+        for index in range(start, len(self)):
+            self._changed(index)
+
+    def insert(self, index, value):
+        list.insert(self, index, track(value, self._on_change))
+        self._changed()
+
+    def pop(self, index=-1):
+        value = list.pop(self, index)
+        self._changed()
+        return value
+
+    def remove(self, value):
+        list.remove(self, value)
+        self._changed()
+
+    def clear(self):
+        list.clear(self)
+        self._changed()
+
+    def sort(self, *args, **kwargs):
+        list.sort(self, *args, **kwargs)
+        self._changed()
+
+    def reverse(self):
+        list.reverse(self)
+        self._changed()
+
+
+class SectionList(TrackedList):
+    # A top-level list (resources). Each entry reports changes under its index, so if
+    # entries move (anything but an append) they are re-tracked under their new index.
+    def __init__(self, values, on_change):
+        list.__init__(self)
+        self._on_change = on_change
+        list.extend(self, [self._track_entry(value, self._entry_change(index)) for index, value in enumerate(values)])
+
+    def _entry_change(self, index):
+        return lambda key: self._on_change(index)
+
+    def _track_entry(self, value, on_change):
+        return track(value, on_change)
+
+    def _changed(self, index=ALL):
+        if index is ALL:
+            for i, value in enumerate(self):
+                converted = retrack(value, self._entry_change(i))
+                if converted is not value:
+                    list.__setitem__(self, i, converted)
+        self._on_change(index)
+
+    def __setitem__(self, index, value):
+        if isinstance(index, slice):
+            list.__setitem__(self, index, value)
+            self._changed()
+        else:
+            index = index % len(self)
+            list.__setitem__(self, index, self._track_entry(value, self._entry_change(index)))
+            self._on_change(index)
+
+    def append(self, value):
+        index = len(self)
+        list.append(self, self._track_entry(value, self._entry_change(index)))
+        self._on_change(index)
+
+    def extend(self, values):
+        for value in values:
+            self.append(value)
+
+    def insert(self, index, value):
+        list.insert(self, index, value)
+        self._changed()
+
+
+class ResourceList(SectionList):
+    # The resources section. Entries are held as TrackedItems where they can be (see as_item).
+    # Also keeps an index of the entries by name for find(), which is added to as resources are
+    # discovered and rebuilt (when next needed) if entries move or a name changes.
+    def __init__(self, values, on_change):
+        super().__init__(values, on_change)
+        self._names = None
+
+    def _track_entry(self, value, on_change):
+        return as_item(value, on_change)
+
+    def _entry_change(self, index):
+        def changed(key):
+            if key == "name" or key is ALL:
+                self._names = None
+            self._on_change(index)
+        return changed
+
+    def _changed(self, index=ALL):
+        self._names = None
+        super()._changed(index)
+
+    def __setitem__(self, index, value):
+        self._names = None
+        super().__setitem__(index, value)
+
+    def append(self, value):
+        super().append(value)
+        if self._names is not None:
+            self._index_entry(self[-1])
+
+    def _index_entry(self, entry):
+        # The first entry with a name wins, as with a search from the start of the list
+        if isinstance(entry, dict) and isinstance(entry.get("name"), str):
+            self._names.setdefault(entry["name"], entry)
+            self._lower_names.setdefault(entry["name"].lower(), entry)
+
+    def find(self, name, ignore_case=False):
+        # The entry called name, or None
+        if self._names is None:
+            self._names = {}
+            self._lower_names = {}
+            for entry in self:
+                self._index_entry(entry)
+
+        if ignore_case:
+            return self._lower_names.get(name.lower())
+        return self._names.get(name)
+
+
+class SectionDict(TrackedDict):
+    # A top-level dict (humans, droids, tasks, crops...). Each entry reports changes under its key.
+    def _child(self, key, value):
+        if isinstance(value, (dict, list)):
+            existing = dict.get(self, key)
+            if existing is value:
+                return value
+            entry_change = lambda _key: self._on_change(key)
+            if isinstance(value, dict):
+                return TrackedDict(value, entry_change)
+            return TrackedList(value, entry_change)
+        return value
+
+
+class TaskTable(SectionDict):
+    # The tasks section. Also keeps an index of the task ids by each of TASK_INDEX_FIELDS (the
+    # worker's name, the task type and the item), for task_ids_by(). Added and deleted tasks
+    # are indexed as they go; if a task is replaced or one of those fields changes, the index
+    # is rebuilt (in task order) when next needed.
+    #
+    # It is also the task scheduler: a heap of (turn due, order added, task id, ends), so
+    # due_task_ids() only has to look at the tasks that have come due. Entries for deleted or
+    # rescheduled tasks are dropped as they come off the heap.
+    def __init__(self, values, on_change):
+        self._index = None
+        self._heap = None
+        super().__init__(values, on_change)
+
+    def _child(self, key, value):
+        if isinstance(value, dict):
+            if dict.get(self, key) is value:
+                return value
+
+            def entry_change(field):
+                if field is ALL or field in TASK_INDEX_FIELDS:
+                    self._index = None
+                if field is ALL or field == "ends":
+                    self._schedule(key, dict.get(self, key))
+                self._on_change(key)
+            return TrackedDict(value, entry_change)
+        return super()._child(key, value)
+
+    def __setitem__(self, key, value):
+        replacing = key in self
+        super().__setitem__(key, value)
+        if replacing:
+            self._index = None
+        elif self._index is not None:
+            self._index_task(key, dict.__getitem__(self, key), add=True)
+        self._schedule(key, dict.__getitem__(self, key))
+
+    def __delitem__(self, key):
+        task = dict.__getitem__(self, key)
+        super().__delitem__(key)
+        if self._index is not None:
+            self._index_task(key, task, add=False)
+
+    def pop(self, key, *default):
+        self._index = None
+        return super().pop(key, *default)
+
+    def popitem(self):
+        self._index = None
+        return super().popitem()
+
+    def clear(self):
+        self._index = None
+        self._heap = None
+        super().clear()
+
+    def _index_task(self, task_id, task, add):
+        if not isinstance(task, dict):
+            return
+        for field in TASK_INDEX_FIELDS:
+            value = task.get(field)
+            if not isinstance(value, str):
+                continue
+            task_ids = self._index[field].setdefault(value, {})
+            if add:
+                task_ids[task_id] = None
+            else:
+                task_ids.pop(task_id, None)
+
+    def task_ids_by(self, field, value):
+        # The ids of the tasks whose field is value, in task order
+        if self._index is None:
+            self._index = {field: {} for field in TASK_INDEX_FIELDS}
+            for task_id, task in self.items():
+                self._index_task(task_id, task, add=True)
+
+        return list(self._index[field].get(value, ()))
+
+    def _schedule(self, task_id, task):
+        # A task falls due the turn before it ends (the turn its last turn is played)
+        if self._heap is None or not isinstance(task, dict) or not isinstance(task.get("ends"), int):
+            return
+        self._order += 1
+        heapq.heappush(self._heap, (task["ends"] - 1, self._order, task_id, task["ends"]))
+
+    def due_task_ids(self, turn):
+        # The ids of the tasks due by this turn, in the order they were added. A task stays
+        # due until it is removed.
+        if self._heap is None:
+            self._heap = []
+            self._due = {}
+            self._order = 0
+            for task_id, task in self.items():
+                self._schedule(task_id, task)
+
+        while self._heap and self._heap[0][0] <= turn:
+            _, order, task_id, ends = heapq.heappop(self._heap)
+            task = dict.get(self, task_id)
+            if task is not None and task.get("ends") == ends:
+                self._due[task_id] = order
+
+        for task_id in list(self._due):
+            task = dict.get(self, task_id)
+            if task is None or task.get("ends", turn + 2) - 1 > turn:
+                del self._due[task_id]
+
+        return sorted(self._due, key=self._due.get)
+
+
+class TaskPackage(dict):
+    def __init__(self, sections):
+        super().__init__()
+        self._dirty = {consumer: {} for consumer in DIRTY_CONSUMERS}
+        for section, value in sections.items():
+            dict.__setitem__(self, section, self._section(section, value))
+        self.mark_all_dirty()
+
+    def _section(self, section, value):
+        current = dict.get(self, section)
+        if current is value:
+            return value
+
+        on_change = lambda key: self.mark_dirty(section, key)
+        if section == "tasks" and isinstance(value, dict):
+            return TaskTable(value, on_change)
+        if isinstance(value, dict):
+            return SectionDict(value, on_change)
+        if section == "resources" and isinstance(value, list):
+            return ResourceList(value, on_change)
+        if isinstance(value, list):
+            return SectionList(value, on_change)
+        return value
+
+    def __setitem__(self, section, value):
+        dict.__setitem__(self, section, self._section(section, value))
+        self.mark_dirty(section, ALL)
+
+    def __delitem__(self, section):
+        dict.__delitem__(self, section)
+        self.mark_dirty(section, ALL)
+
+    def mark_dirty(self, section, key=ALL):
+        for dirty in self._dirty.values():
+            if key is ALL:
+                dirty[section] = ALL
+            else:
+                keys = dirty.setdefault(section, set())
+                if keys is not ALL:
+                    keys.add(key)
+
+    def mark_all_dirty(self):
+        for section in self:
+            self.mark_dirty(section, ALL)
+
+    def take_dirty(self, consumer):
+        # What has changed since this consumer last asked: {section: set of keys, or ALL}
+        dirty = self._dirty[consumer]
+        self._dirty[consumer] = {}
+        return dirty
+
+
+if __name__ == "__main__":
+    # Compare finding a resource by scanning the list with the name index, on large lists of
+    # discovered items (looking up the last one, as the worst case for the scan)
+    import timeit
+
+    print(f"{'items':>8}{'scan us':>12}{'index us':>12}")
+    for count in (10, 100, 1000, 10000):
+        plain = [{"name": f"Item{i}", "found": True} for i in range(count)]
+        resources = TaskPackage({"resources": plain})["resources"]
+        name = f"Item{count - 1}"
+
+        scan = min(timeit.repeat(lambda: next((r for r in plain if r.get("name") == name), None), number=200, repeat=5))
+        indexed = min(timeit.repeat(lambda: resources.find(name), number=200, repeat=5))
+        print(f"{count:>8}{scan / 200 * 1e6:>12.2f}{indexed / 200 * 1e6:>12.2f}")
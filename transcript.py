@@ -0,0 +1,67 @@
+# transcript.py - record what the player typed, so the game can be played back
+
+# A transcript is a JSONL file. The first line says where the game started: either a new game
+# from a seed (the opening question still to be answered), or the whole state of a game part-way
+# through. Every line after that is one input - a command, or an answer to a pending question -
+# with the turn it was typed on. With each game rolling from its own seed (see game_random),
+# engine.replay() plays a transcript back to exactly the same game.
+
+import atexit
+import json
+
+from constants import SAVE_SCHEMA_VERSION
+from game_random import sync_game_random
+from tracking import to_plain
+
+TRANSCRIPT_VERSION = 1      # Bump if the transcript lines change shape
+
+_transcript = {"file": None}
+
+
+def start_transcript(path, task_package, new_game):
+    # Start recording to path (replacing what's there). new_game means the game has only just been
+    # created and is waiting on its opening question, so the seed is enough to start it again.
+    stop_transcript()
+
+    header = {"version": TRANSCRIPT_VERSION, "seed": task_package["rng"]["seed"]}
+    if new_game:
+        header["new_game"] = True
+    else:
+        header["schema_version"] = SAVE_SCHEMA_VERSION
+        sync_game_random(task_package)
+        header["state"] = to_plain(task_package)
+
+    _transcript["file"] = open(path, 'w', encoding='utf-8')
+    write_line(header)
+
+
+def stop_transcript():
+    if _transcript["file"] is not None:
+        _transcript["file"].close()
+        _transcript["file"] = None
+
+
+def write_line(entry):
+    # One line per input, written straight away so a crash (or 'quit') doesn't lose the end
+    _transcript["file"].write(json.dumps(entry, ensure_ascii=False) + "\n")
+    _transcript["file"].flush()
+
+
+def record_input(kind, text, turn):
+    # kind is "command" or "answer"
+    if _transcript["file"] is not None:
+        write_line({"turn": turn, kind: text})
+
+
+def read_transcript(path):
+    # (header, inputs) from a transcript file
+    with open(path, encoding='utf-8') as f:
+        header = json.loads(f.readline())
+        if header.get("version") != TRANSCRIPT_VERSION:
+            raise ValueError(f"{path} is a version {header.get('version')} transcript, this game reads version {TRANSCRIPT_VERSION}")
+        inputs = [json.loads(line) for line in f if line.strip()]
+
+    return header, inputs
+
+
+atexit.register(stop_transcript)
@@ -1,22 +1,26 @@
 # turns.py
 
-import random
 from datetime import datetime
 
 from actions import handle_immediate_or_queued_task, start_next_queued_task_for_character
 from commands import handle_reset_command
-from command_utils import handle_read_command,  get_task_by_worker, remove_task_by_id
-from constants import TASK_ASSIGNED, TASK_EXAMINING, TASK_CHARGING, TASK_EATING, ALL_TASKS
-from endgame import check_endgame, handle_game_over_loop
+from command_utils import handle_read_command,  get_task_by_worker, remove_task_by_id, task_turns_remaining, due_tasks, find_resource
+from constants import TASK_ASSIGNED, TASK_EXAMINING, TASK_CHARGING, TASK_EATING, ALL_TASKS, COMMAND_ALIASES, IDLE_CHARGE_USAGE, INITIAL_GAMESTATE
+from endgame import announce_game_over, check_endgame, mgc_threshold
+from game_random import game_rng, text_rng
 from lore.lore_ingame import get_message, handle_help_command
 from lore.lore_story import get_story_message
 import lore.user_interface as ui_runtime
-from lore.user_interface import msg_warn, msg_story, msg_error, msg_info, get_input
+from lore.user_interface import msg_warn, msg_story, msg_error, msg_info, get_input, flush_log
+from persistence import checkpoint
 from planting import update_crop_growth
 from resources import decrease_droid_charge
-from status import handle_list_command
+from status import handle_forecast_command, handle_list_command
 from tasks import advance_tasks
-from utils import is_command_enabled, load_config, process_hunger_status, check_shield_state, save_config, update_screen, get_best_match
+from timelines import drains_charge, hunger_needs_check, quiet_turns
+from transcript import record_input
+from utils import (is_command_enabled, load_config, process_hunger_status, check_shield_state, save_config, update_screen, get_best_match,
+                   get_charge_band)
 
 
 def process_turn(command, task_package):
@@ -24,7 +28,7 @@ def process_turn(command, task_package):
     if not tokens:
         return False, task_package
 
-    action = tokens[0]
+    action = COMMAND_ALIASES.get(tokens[0], tokens[0])
     qualifier = tokens[1] if len(tokens) > 1 else None
     dock_a_turn = False
 
@@ -32,12 +36,12 @@ def process_turn(command, task_package):
     gamestate = task_package["gamestate"]
 
     # Restrict commands if game is over
-    if gamestate.get("game_over", False) and action not in ["status", "help", "reset", "quit"]:
+    if gamestate["game_over"] and action not in ["status", "help", "reset", "quit"]:
         msg_story(get_story_message("endgame", "restart"), turns_elapsed)
         return True, task_package
 
     # Unknown command
-    if action not in gamestate:
+    if action not in gamestate and action not in INITIAL_GAMESTATE:
         msg_error(get_message("error", "unknown_command", command=action), turns_elapsed)
         return False, task_package
 
@@ -50,6 +54,10 @@ def process_turn(command, task_package):
     if action == "next":
         dock_a_turn = True
 
+    elif action == "wait":
+        # This plays its own turns, so it doesn't dock another one - the caller just saves and redraws once at the end
+        task_package = fast_forward(task_package)
+
     elif action == "read":
         awaiting_input, task_package = handle_read_command(task_package, turns_elapsed, qualifier)
         if awaiting_input:
@@ -68,12 +76,17 @@ def process_turn(command, task_package):
     elif action == "list":
         handle_list_command(qualifier, task_package)
 
+    elif action == "forecast":
+        handle_forecast_command(qualifier, task_package)
+
     elif action == "help":
         handle_help_command(task_package, qualifier=qualifier, gamestate=gamestate)
 
     elif action == "quit":
         msg_story(get_message("quit", "final"), turns_elapsed)
         msg_story(f"Session ended: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", turns_elapsed)
+        save_config(task_package)
+        checkpoint(force=True)
         exit(0)
 
     elif action == "reset":
@@ -107,7 +120,7 @@ def print_day_message(turns_elapsed, droids):
         lore = get_story_message("daymessage", "generic")
 
     if isinstance(lore, list):
-        message = random.choice(lore)
+        message = text_rng.choice(lore)
     else:
         message = lore
 
@@ -145,9 +158,10 @@ def progress_outpost(task_package):
 
     # --- Human hunger ---
     for name, stats in task_package["humans"].items():
-        if stats.get("state") != "Deceased":
+        if stats["state"] != "Deceased":
             stats["hunger"] += 1
-            task_package = process_hunger_status(name, task_package)
+            if hunger_needs_check(stats):
+                task_package = process_hunger_status(name, task_package)
 
     # --- Droid charge ---
     task_package = decrease_droid_charge(task_package)
@@ -165,7 +179,10 @@ def progress_outpost(task_package):
 
 def process_user_input(command, resuming=False):
     task_package = load_config()
-    turn_suspended = task_package["gamestate"].get("turn_suspended", False)
+    turn_suspended = task_package["gamestate"]["turn_suspended"]
+
+    if not resuming:
+        record_input("command", command, task_package["counters"]["turns"])
 
     # If this is a brand-new turn, process the command first
     if not resuming and not turn_suspended:
@@ -174,6 +191,8 @@ def process_user_input(command, resuming=False):
         # Invalid command / non-turn command: just save and return
         if not count_as_turn:
             save_config(task_package)
+            checkpoint()
+            flush_log()
             update_screen(task_package)
             return task_package
 
@@ -187,6 +206,18 @@ def process_user_input(command, resuming=False):
     return task_package
 
 
+def answer_pending_question(answer, callback, context):
+    # Hand the player's answer to the question that was waiting for it (see set_pending_question),
+    # then carry on with the turn if the answer completed a command
+    task_package = load_config()
+    record_input("answer", answer, task_package["counters"]["turns"])
+
+    task_package = callback(answer, context)
+    if task_package is not None:
+        task_package = resume_turn_processing(task_package)
+    return task_package
+
+
 def resume_turn_processing(task_package):
     # Continue processing a turn after a command has already been accepted,
     # or after a GUI question/answer has resolved.
@@ -195,6 +226,8 @@ def resume_turn_processing(task_package):
     if awaiting_input:
         task_package["gamestate"]["turn_suspended"] = True
         save_config(task_package)
+        checkpoint()
+        flush_log()
         return task_package
 
     task_package["gamestate"]["turn_suspended"] = False
@@ -203,28 +236,118 @@ def resume_turn_processing(task_package):
     return task_package
 
 
-def complete_turn(task_package):
-    # Progress the outpost
+def end_turn(task_package):
+    # Progress the outpost and check for the endgame, without saving anything
     task_package = progress_outpost(task_package)
-    tasks = task_package["tasks"]
-    
-    for tid, task in tasks.items():
-        task["duration"] -= 1
 
     # Check for endgame
     game_over, end_msg, task_package = check_endgame(task_package)
 
     if game_over:
-        task_package = handle_game_over_loop(end_msg)
+        announce_game_over(end_msg, task_package)
 
-    # Save and update always
     task_package["gamestate"]["turn_suspended"] = False
+    return task_package
+
+
+def complete_turn(task_package):
+    task_package = end_turn(task_package)
+
+    # Save and update always. This is the end of the turn, so it's also a checkpoint.
     save_config(task_package)
+    checkpoint()
+    flush_log(task_package["counters"]["turns"])
     update_screen(task_package)
 
     return task_package
 
 
+def get_watched_state(task_package):
+    # The things that stop a 'wait': hunger states, droid charge bands and which crops have matured
+    return (
+        tuple(human["state"] for human in task_package["humans"].values()),
+        tuple(get_charge_band(droid["charge"]) for droid in task_package["droids"].values()),
+        tuple(crop_id for crop_id, crop in task_package["crops"].items() if crop.get("mature", False)),
+    )
+
+
+def fast_forward(task_package):
+    # Plays whole turns in memory, as if 'next' had been typed each time, until something happens
+    # the player will want to see: a task finishing, a hunger state or charge band changing, a crop
+    # maturing, a new day, a question for the player, or the end of the game.
+    # Nothing is saved or redrawn along the way - the caller does that once at the end.
+    turns_start = task_package["counters"]["turns"]
+
+    while True:
+        task_package = play_quiet_turns(task_package, quiet_turns(task_package))
+
+        watched = get_watched_state(task_package)
+        task_finishing = bool(due_tasks(task_package["tasks"], task_package["counters"]["turns"]))
+
+        awaiting_input, task_package = advance_tasks(task_package)
+        if awaiting_input:
+            # Stop mid-turn for the answer, as 'next' would
+            task_package["gamestate"]["turn_suspended"] = True
+            return task_package
+
+        task_package = end_turn(task_package)
+        turns_elapsed = task_package["counters"]["turns"]
+
+        if (task_finishing or task_package["gamestate"]["game_over"] or turns_elapsed % 10 == 0
+                or get_watched_state(task_package) != watched):
+            break
+
+    turns_waited = task_package["counters"]["turns"] - turns_start
+    if turns_waited == 1:
+        msg_info(get_message("wait", "one_turn"), task_package["counters"]["turns"])
+    elif turns_waited > 1:
+        msg_info(get_message("wait", "turns", turns=turns_waited), task_package["counters"]["turns"])
+
+    return task_package
+
+
+def play_quiet_turns(task_package, quiet):
+    # Plays up to quiet turns on which nothing happens but hunger, charge and crops counting along
+    # (see timelines.quiet_turns) in one go, leaving the outpost as end_turn would have turn by turn.
+    # Each turn's MGC roll is still made, in order; if the MGC would arrive, that turn is left for
+    # end_turn to play in full.
+    counters = task_package["counters"]
+    rng = game_rng(task_package)
+    played = 0
+    while played < quiet:
+        turn = counters["turns"] + played + 1
+        threshold = mgc_threshold(turn)
+        if threshold > 0:
+            state = rng.getstate()
+        if threshold >= rng.randint(1, 100):
+            rng.setstate(state)
+            break
+        played += 1
+
+    if not played:
+        return task_package
+
+    counters["turns"] += played
+
+    for stats in task_package["humans"].values():
+        if stats["state"] != "Deceased":
+            stats["hunger"] += played
+
+    for stats in task_package["droids"].values():
+        if drains_charge(stats):
+            stats["charge"] = max(0, stats["charge"] - played * IDLE_CHARGE_USAGE)
+
+    hydro = find_resource(task_package["resources"], "HydroponicsRoom")
+    if hydro and hydro.get("powered", True):
+        for crop in task_package["crops"].values():
+            if not crop.get("mature", False):
+                crop["turns_remaining"] -= played
+
+    task_package = check_shield_state(task_package)
+    task_package["gamestate"]["turn_suspended"] = False
+    return task_package
+
+
 def handle_replace_command(qualifier, task_package):
     # Handles the 'replace' command for characters. 
     # Which means (other than eating or charging), stop what you're doing and do this now
@@ -282,9 +405,9 @@ def resume_replace_command(answer, context):
         task_type = task["type"]
         if task_type in (TASK_EXAMINING, TASK_ASSIGNED):
             item_name = task["item_name"]
-            task_now_doing = f"{task_type} {item_name} ({task['duration']} turns remaining)"
+            task_now_doing = f"{task_type} {item_name} ({task_turns_remaining(task, turns_elapsed)} turns remaining)"
         else:
-            task_now_doing = f"{task_type} ({task['duration']} turns remaining)"
+            task_now_doing = f"{task_type} ({task_turns_remaining(task, turns_elapsed)} turns remaining)"
 
     else:
         msg_error(get_message("replace", "is_idle", name=character), turns_elapsed)
@@ -435,9 +558,9 @@ def resume_cancel_command(answer, context):
         current_task_type = task["type"]
         if current_task_type in (TASK_EXAMINING, TASK_ASSIGNED):
             item_name = task.get("item_name", "")
-            current_task_desc = f"{current_task_type} {item_name} ({task['duration']} turns remaining)"
+            current_task_desc = f"{current_task_type} {item_name} ({task_turns_remaining(task, turns_elapsed)} turns remaining)"
         else:
-            current_task_desc = f"{current_task_type} ({task['duration']} turns remaining)"
+            current_task_desc = f"{current_task_type} ({task_turns_remaining(task, turns_elapsed)} turns remaining)"
 
     queue_desc = []
     for slot in queued_slots:
@@ -1,9 +1,11 @@
 # user_interface.py
 
-import random, os
+import atexit, gzip, json, os, shutil
 
-from constants import LOG_FILE
+from constants import (EVENT_LOG_FILE, LOG_FILE, LOG_FLUSH_BYTES, LOG_ROTATE_BYTES, LOG_ROTATE_TURNS, LOG_GENERATIONS,
+                       LOG_COMPRESS, LOG_MAX_TOTAL_BYTES)
 from datetime import datetime
+from game_random import text_rng
 from typing import Optional
 
 ACTIVE_UI = None
@@ -106,11 +108,11 @@ def get_input(category, code, turns_elapsed=0, end=None, **kwargs):
 
     log_entry = log_questions.get(category, {}).get(code)
     if isinstance(log_entry, list):
-        log_entry = random.choice(log_entry)
+        log_entry = text_rng.choice(log_entry)
 
     prompt_entry = prompt_questions.get(category, {}).get(code)
     if isinstance(prompt_entry, list):
-        prompt_entry = random.choice(prompt_entry)
+        prompt_entry = text_rng.choice(prompt_entry)
 
     if isinstance(log_entry, str):
         log_text = log_entry.format(**kwargs)
@@ -250,21 +252,189 @@ def normalise_command(command_str):
     return expanded
 
 
+# The log file stays open between writes, and lines are buffered until the end of the turn
+# (or until LOG_FLUSH_BYTES have built up), rather than opening the file for every line.
+# "written" is the size of the log file, for rotation. With "enabled" off, nothing is logged at all.
+_log = {"file": None, "buffer": [], "size": 0, "written": 0, "enabled": True}
+
+
+def set_log_to_file(enabled):
+    # Turn the log file on or off (the GUI and the event log still get every message)
+    if not enabled:
+        close_log()
+    _log["enabled"] = enabled
+
+
 def write_to_log(log_entry, end=None):
-    # Writes a ling to the log file
+    # Adds a line to the log buffer, writing the buffer out if it has grown large
+    if not _log["enabled"]:
+        return
+
+    _log["buffer"].append(log_entry)
+    _log["size"] += len(log_entry)
+
+    if _log["size"] >= LOG_FLUSH_BYTES:
+        flush_log()
+
+
+def flush_log(turn=None):
+    # Writes any buffered lines to the log file, and starts a new log if this one is due to be
+    # rotated. At the end of a turn, pass the turn number so that can happen every LOG_ROTATE_TURNS turns.
+    write_log_buffer()
+
+    if LOG_ROTATE_BYTES and _log["written"] >= LOG_ROTATE_BYTES:
+        rotate_log()
+    elif LOG_ROTATE_TURNS and turn and turn % LOG_ROTATE_TURNS == 0 and _log["written"]:
+        rotate_log()
+
+
+def write_log_buffer():
+    # Writes the buffered lines out, opening the log file if needed
+    if _log["buffer"]:
+        if _log["file"] is None:
+            # Determine if file exists
+            file_exists = os.path.exists(LOG_FILE)
+
+            # Open in append mode, and keep it open
+            _log["file"] = open(LOG_FILE, 'a', encoding='utf-8')
+            _log["written"] = os.path.getsize(LOG_FILE)
+
+            # If it's a brand-new log file, add a header timestamp
+            if not file_exists:
+                header = ("==============================================\n"
+                          f"🕓 Log started on {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
+                          "==============================================\n\n")
+                _log["file"].write(header)
+                _log["written"] += len(header.encode('utf-8'))
+
+        text = "".join(_log["buffer"])
+        _log["file"].write(text)
+        _log["file"].flush()
+        _log["written"] += len(text.encode('utf-8'))
+        _log["buffer"].clear()
+        _log["size"] = 0
+
+    if _events["file"] is not None:
+        _events["file"].flush()
+
+
+def close_log():
+    # Writes out the buffer and closes the log file (the next line written starts it again,
+    # with a new header if the file has been moved away)
+    write_log_buffer()
+    if _log["file"] is not None:
+        _log["file"].close()
+        _log["file"] = None
+
+
+def old_logs():
+    # The rotated logs that exist, as (generation, path), newest first
+    folder = os.path.dirname(LOG_FILE) or "."
+    prefix = os.path.basename(LOG_FILE) + "."
+    found = []
+    for entry in os.listdir(folder):
+        if entry.startswith(prefix):
+            generation = entry[len(prefix):].removesuffix(".gz")
+            if generation.isdigit():
+                found.append((int(generation), os.path.join(folder, entry)))
+    return sorted(found)
+
+
+def rotate_log():
+    # Closes the current log and moves it to outpost_log.txt.1 (compressed if LOG_COMPRESS), shifting
+    # the older ones along. Anything past LOG_GENERATIONS or LOG_MAX_TOTAL_BYTES is deleted.
+    close_log()
+    _log["written"] = 0
+    if not _log["enabled"] or not os.path.exists(LOG_FILE):
+        return
+
+    # Shift the old logs along, oldest first so nothing is overwritten
+    for generation, path in reversed(old_logs()):
+        if generation >= LOG_GENERATIONS:
+            os.remove(path)
+        else:
+            os.replace(path, path.replace(f"{LOG_FILE}.{generation}", f"{LOG_FILE}.{generation + 1}", 1))
+
+    if LOG_GENERATIONS < 1:
+        os.remove(LOG_FILE)
+        return
+
+    newest = f"{LOG_FILE}.1"
+    if LOG_COMPRESS:
+        with open(LOG_FILE, 'rb') as source, gzip.open(newest + ".gz", 'wb') as target:
+            shutil.copyfileobj(source, target)
+        os.remove(LOG_FILE)
+    else:
+        os.replace(LOG_FILE, newest)
+
+    # Keep the total size down, dropping the oldest logs first
+    if LOG_MAX_TOTAL_BYTES:
+        kept = old_logs()
+        total = sum(os.path.getsize(path) for _, path in kept)
+        while kept and total > LOG_MAX_TOTAL_BYTES:
+            _, path = kept.pop()
+            total -= os.path.getsize(path)
+            os.remove(path)
+
+
+atexit.register(close_log)
+
+
+# --- Event log --------------------------------------------------------------
+# A structured copy of the log for analysis: one JSON object per logged message, with the
+# message code and values it was made from. Off unless enable_event_log() is called, and
+# then get_message() tags the messages it returns so emit() can tell where they came from.
+
+_events = {"file": None}
 
-    # Determine if file exists
-    file_exists = os.path.exists(LOG_FILE)
 
-    # Open in append mode
-    with open(LOG_FILE, 'a', encoding='utf-8') as log_file:
-        # If it's a brand-new log file, add a header timestamp
-        if not file_exists:
-            log_file.write("==============================================\n")
-            log_file.write(f"🕓 Log started on {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-            log_file.write("==============================================\n\n")
+class Message(str):
+    # A message from get_message(), still carrying its category, code and values
+    def __new__(cls, text, category, code, params):
+        message = super().__new__(cls, text)
+        message.category = category
+        message.code = code
+        message.params = params
+        return message
 
-        log_file.write(log_entry)
+
+def event_log_enabled():
+    return _events["file"] is not None
+
+
+def enable_event_log(path=EVENT_LOG_FILE):
+    # Starts appending events to path
+    disable_event_log()
+    _events["file"] = open(path, 'a', encoding='utf-8')
+
+
+def disable_event_log():
+    if _events["file"] is not None:
+        _events["file"].close()
+        _events["file"] = None
+
+
+def tag_message(text, category, code, params):
+    # Wraps a message so its code and values reach the event log
+    return Message(text, category, code, params)
+
+
+def write_event(message, turn, day, domain, tone):
+    # Writes one event line. Messages that didn't come straight from get_message() have no code.
+    event = {
+        "turn": turn,
+        "day": day,
+        "domain": domain,
+        "tone": tone,
+        "category": getattr(message, "category", None),
+        "code": getattr(message, "code", None),
+        "params": getattr(message, "params", {}),
+        "message": str(message),
+    }
+    _events["file"].write(json.dumps(event, ensure_ascii=False, default=str) + "\n")
+
+
+atexit.register(disable_event_log)
 
 
 # user_interface.py
@@ -358,6 +528,9 @@ def emit(
         else:
             write_to_log(log_line + "\n")
 
+        if _events["file"] is not None:
+            write_event(message, turn, day, domain, tone)
+
     if ACTIVE_UI is not None:
         ACTIVE_UI.append_log(display_line)
 
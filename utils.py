@@ -1,24 +1,23 @@
 # utils.py
 
-import json
-import os
-import random
 import difflib
 
-from command_utils import clear_task_for_character, get_pronouns, get_task_by_worker, remove_task_by_id
-from constants import (NAMES, INITIAL_GAMESTATE, CONFIG_FILE, LOG_FILE, LOG_FILE_OLD, FEMALE, MALE, GENDERS, HUNGER, LOW_CHARGE_FLAG, IDLE_CHARGE_USAGE,
+from command_utils import clear_task_for_character, find_resource, get_pronouns, get_task_by_worker, remove_task_by_id
+from constants import (NAMES, INITIAL_GAMESTATE, SAVE_KEYS, FEMALE, MALE, GENDERS, HUNGER, LOW_CHARGE_FLAG, IDLE_CHARGE_USAGE,
     NUM_HUMANS, NUM_DROIDS, HUNGER_WARNING, TASK_ASSIGNED, TASK_PLANTING, TASK_EATING, TASK_EXPLORING, TASK_MINING, TASK_CHARGING, COMMAND_MAP)
+from game_random import game_rng, make_game_random, new_game_random
 from lore.lore_ingame import get_message
 from lore.lore_story import print_orders
 import lore.user_interface as ui_runtime
-from lore.user_interface import get_input, msg_resource, msg_food, msg_error, msg_info, msg_power, log_and_display
-from OutpostUI import get_top_bar_data
-from status import display_character_summary, get_state_panel_text
+from lore.user_interface import get_input, msg_resource, msg_food, msg_error, msg_info, msg_power, log_and_display, rotate_log
+from persistence import checkpoint, get_live_package, read_saved_data, set_live_package, use_slot
+from status import display_character_summary, get_state_panel_text, get_top_bar_data
+from tracking import TaskPackage
 
 
 def update_screen(task_package):
     #Update the screen with changes based on what happened
-    if ui_runtime.UI_MODE == "gui" and ui_runtime.ACTIVE_UI is not None:
+    if ui_runtime.UI_MODE == "gui" and ui_runtime.ACTIVE_UI is not None and getattr(ui_runtime.ACTIVE_UI, "draws_screen", True):
         top = get_top_bar_data(task_package)
         ui_runtime.ACTIVE_UI.set_top_stats(**top)
 
@@ -27,7 +26,9 @@ def update_screen(task_package):
 
 
 def is_command_enabled(command, gamestate):
-    return gamestate.get(command, False)
+    # Commands added since a game was saved start as they would in a new game, so a new command
+    # doesn't need a save migration
+    return gamestate.get(command, INITIAL_GAMESTATE.get(command, False))
 
 
 def increment_counter(package, key):
@@ -57,24 +58,32 @@ def build_task_package(**kwargs):
             "crop": 0, 
             "explore": 0, 
             "found_nil": 0, 
+            "found_items": 0,
             },
     }
     
     default_package.update(kwargs)
-    return default_package
+    task_package = TaskPackage(default_package)
 
+    # The game's own generator travels with it (see game_random)
+    task_package.rng = make_game_random(task_package["rng"])
+    return task_package
 
-def initialise_outpost(first_time):
-    # Create a brand-new Outpost state.
-    # NOTE: resources starts as an EMPTY LIST – nothing is discovered yet.
-
-    name_pool = random.sample(NAMES, 8)
 
-    empty_queue = {
-        "1": {"task": "", "item": ""},
-        "2": {"task": "", "item": ""},
-        "3": {"task": "", "item": ""}
-    }
+def initialise_outpost(first_time, seed=None):
+    # Create a brand-new Outpost state, seeding its rng with seed (or a fresh one).
+    # NOTE: resources starts as an EMPTY LIST – nothing is discovered yet.
+    rng_section = new_game_random(seed)
+    rng = make_game_random(rng_section)
+    name_pool = rng.sample(NAMES, 8)
+    rng_section["draws"] = rng.draws
+
+    def empty_queue():
+        return {
+            "1": {"task": "", "item": ""},
+            "2": {"task": "", "item": ""},
+            "3": {"task": "", "item": ""}
+        }
 
     humans = {
         name_pool[i]: {
@@ -84,7 +93,7 @@ def initialise_outpost(first_time):
             "generated": False,
             "item": "",
             "examine_needed": "",
-            "queue": empty_queue.copy()
+            "queue": empty_queue()
         } for i in range(NUM_HUMANS)
     }
 
@@ -97,7 +106,7 @@ def initialise_outpost(first_time):
             "item": "",
             "examine_needed": "",
             "first_charge": True,
-            "queue": empty_queue.copy()
+            "queue": empty_queue()
         } for i in range(NUM_DROIDS)
     }
 
@@ -115,11 +124,13 @@ def initialise_outpost(first_time):
             "shield_connected": False,
             "shield_active": False
         },
-        tasks={}
+        tasks={},
+        rng=rng_section
     )
 
     # Save after initialising
     save_config(task_package)
+    checkpoint(force=True)
 
     if first_time:
         print_orders(task_package["gamestate"])
@@ -128,42 +139,31 @@ def initialise_outpost(first_time):
     return task_package
 
 
-def save_config(task_package):
-    try:
-        with open(CONFIG_FILE, "r") as f:
-            data = json.load(f)
-    except (FileNotFoundError, json.JSONDecodeError):
-        data = {}
-
-    # Copy only keys we care about from task_package
-    keys_to_save = [
-        "crops", "droids", "gamestate", "humans", "item", "resources",  "shieldstate", "tasks", "task_data", "counters"
-    ]
-
-    for key in keys_to_save:
-        if key in task_package:
-            data[key] = task_package[key]
-
-    with open(CONFIG_FILE, "w") as f:
-        json.dump(data, f, indent=4)
-
-
-def load_config():
-    if os.path.exists(CONFIG_FILE):
-        with open(CONFIG_FILE, 'r') as f:
-            data = json.load(f)
-
-        return build_task_package(
-            crops=data.get("crops", {}),
-            droids=data.get("droids", {}),
-            gamestate=data.get("gamestate", INITIAL_GAMESTATE.copy()),
-            humans=data.get("humans", {}),
-            resources=data.get("resources", []),
-            shieldstate=data.get("shieldstate", {}),
-            tasks=data.get("tasks", {}),
-            task_data=data.get("task_data", {}),
-            counters=data.get("counters", {"turns": 0, "task": 0, "crop": 0, "explore": 0, "found_nil": 0,}),
-        )
+def save_config(task_package, slot=None):
+    # The live package is authoritative, so saving only adopts it and marks it as changed.
+    # It reaches the disk at the next checkpoint (end of turn, quit, reset or exit).
+    # Giving a slot moves the live game to that save slot (otherwise it stays where it is).
+    use_slot(slot)
+    set_live_package(task_package)
+
+
+def load_config(slot=None):
+    # Keep using the live game if we have one, rather than re-reading the file every command.
+    # Giving a slot switches to that save slot first (a new game starts if it's empty).
+    use_slot(slot)
+    task_package = get_live_package()
+    if task_package is not None:
+        return task_package
+
+    data = read_saved_data()
+    if data is not None:
+        # Saves are migrated to the current schema as they're read, so every section is there
+        task_package = build_task_package(**{key: data[key] for key in SAVE_KEYS})
+        set_live_package(task_package)
+
+        # If the save had to be upgraded or repaired, this writes it back straight away
+        checkpoint()
+        return task_package
 
     else:
         first_time = True
@@ -178,12 +178,12 @@ def reset_config(task_package, context):
     # Resets the config file as per the user's request
     msg_info(get_message("reset", "start"), 0, end='')
 
-    # Rename current log file if it exists
-    if os.path.exists(LOG_FILE):
-        os.replace(LOG_FILE, LOG_FILE_OLD)
+    # Move the current log aside, with the older ones
+    rotate_log()
 
+    # The new outpost's seed comes from the old game, so a replay of the same commands resets the same way
     first_time = False
-    task_package = initialise_outpost(first_time)
+    task_package = initialise_outpost(first_time, seed=game_rng(task_package).getrandbits(64))
 
     # Update the gui screen (if using) and save to config file
     if task_package:
@@ -205,6 +205,15 @@ def get_best_match(name, candidates, cutoff=0.75):
     return None
 
 
+def get_charge_band(charge):
+    # "flat", "low" (close enough to flat to get a warning) or "okay"
+    if charge <= 0:
+        return "flat"
+    if charge <= LOW_CHARGE_FLAG * IDLE_CHARGE_USAGE:
+        return "low"
+    return "okay"
+
+
 def process_hunger_status(name, task_package, warn=True):
     # Check if a human is advancing in hunger
     human = task_package["humans"][name]
@@ -294,7 +303,7 @@ def process_hunger_status(name, task_package, warn=True):
 
     # --- PROBABILISTIC TRANSITION (lower bound only) ---
     if hunger >= low and hunger < high:
-        if random.random() < 0.5:
+        if game_rng(task_package).random() < 0.5:
             human["state"] = new_band
             pronouns = get_pronouns(name, True)
             if warn:
@@ -330,11 +339,13 @@ def interrupt_task_if_starving(name, human, task_package):
              turns_elapsed, tone="warn")
 
     if task_type == TASK_PLANTING.lower():
-        hydro = next((r for r in resources if r["name"] == "HydroponicsRoom"), None)
+        hydro = find_resource(resources, "HydroponicsRoom")
             # Free the bed
         bed = {}
         for b in hydro["beds"]:
-            if b["reserved_by"] == name:
+            # Only the beds still waiting on this planting (planted beds keep their planter)
+            if b["reserved"] and b.get("reserved_by") == name:
+                b["reserved"] = False
                 b["occupied"] = False
                 b["crop_id"] = None
                 b["name"] = ""
@@ -413,10 +424,10 @@ def check_shield_state(task_package):
     turns_elapsed = task_package["counters"]["turns"]
 
     # Find the shield and check if it exists
-    shield = next((r for r in resources if r["name"] == "CloakingShield"), None)
+    shield = find_resource(resources, "CloakingShield")
 
     if shield:
-        power_supply = next((r for r in resources if r["name"] == "PowerSupply"), None)
+        power_supply = find_resource(resources, "PowerSupply")
         if power_supply is not None and power_supply["amount"] <= 0:
             msg_power(get_message("shield", "no_power"), turns_elapsed, tone="warn")
             s = shieldstate